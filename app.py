@@ -1,16 +1,40 @@
-from flask import Flask, request, render_template, jsonify, session, redirect, url_for
-from langchain_groq import ChatGroq
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.messages import HumanMessage, AIMessage
-import pdfplumber
+from flask import Flask, Response, g, request, render_template, jsonify, session, redirect, url_for
+import asyncio
+import contextvars
+import io
 import json
 import os
+import queue
 import re
+import threading
+import time
+import uuid
 from werkzeug.utils import secure_filename
 from dotenv import load_dotenv
 from datetime import datetime
 import traceback
 
+from batch_executor import run_parallel_parse, run_bounded_llm, run_bounded_llm_async
+from config import Config
+from job_queue import JobQueue, JobWorkerPool, TERMINAL_STATES
+from llm_cache import LLMResponseCache
+from llm_gateway import LLMUnavailable, create_groq_gateway
+from metrics import MetricsRegistry, call_with_stages
+from candidate_index import CandidateIndex
+from job_catalog import JobCatalog, OpeningSet
+from contact_extractor import extract_contact
+from parse_cache import ParseCache, content_digest
+from parser_sandbox import SANDBOX_SUPPORTED, ParserSandbox, in_worker
+from prompt_builder import estimate_tokens, jd_context, resume_context
+from ranking import LiveRanking, top_k_rows
+from result_store import create_result_store
+from semantic import SemanticPool, TermMatrix, hash_terms, pair_similarity, similarity_scores
+from skill_matcher import SkillMatcher
+from startup import LazyPrompt
+from taxonomy import TaxonomyStore
+from triage import FULL, SHORT, TEMPLATE, assign_tiers, summarize_tiers
+from upload_buffer import UploadBuffer
+
 load_dotenv()
 
 app = Flask(__name__)
@@ -21,128 +45,510 @@ app.config['UPLOAD_FOLDER'] = 'uploads'
 # Ensure upload folder exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
-# Load skill taxonomy
-with open('skills.json', 'r') as f:
-    SKILLS_TAXONOMY = json.load(f)
+# Load skill taxonomy: skills.json + aliases compiled once per version
+# (matcher, skill ids, ranking vocabulary) and reloaded when either file changes
+TAXONOMY = TaxonomyStore(
+    Config.TAXONOMY_PATH, Config.TAXONOMY_ALIASES_PATH, check_interval=Config.TAXONOMY_RELOAD_INTERVAL
+)
+
+# Parsed resumes keyed by file content + taxonomy version
+PARSE_CACHE = ParseCache(
+    TAXONOMY.version,
+    max_bytes=Config.PARSE_CACHE_MAX_BYTES,
+    disk_path=os.path.join(app.config['UPLOAD_FOLDER'], 'parse_cache.sqlite3') if Config.PARSE_CACHE_DISK else None
+)
 
-# Initialize Groq LLM
+# Initialize Groq LLM behind the gateway (deadlines, retries, circuit breaker, quota);
+# the ChatGroq client itself is created on the first call
 groq_api_key = os.getenv('GROQ_API_KEY')
-llm = ChatGroq(
-    model="llama-3.1-8b-instant",
-    temperature=0.3,
-    groq_api_key=groq_api_key
+LLM_GATEWAY = create_groq_gateway(
+    groq_api_key,
+    Config.GROQ_MODEL,
+    0.3,
+    base_url=Config.GROQ_API_BASE,
+    timeout=Config.LLM_TIMEOUT,
+    pool_size=Config.LLM_POOL_CONNECTIONS,
+    failure_threshold=Config.LLM_BREAKER_THRESHOLD,
+    reset_timeout=Config.LLM_BREAKER_RESET,
+    rate_limit=Config.RATELIMIT_GROQ if Config.RATELIMIT_ENABLED else None,
+    deadline=Config.LLM_DEADLINE,
+    max_retries=Config.LLM_MAX_RETRIES,
+    backoff=Config.LLM_RETRY_BACKOFF,
+    backoff_max=Config.LLM_RETRY_BACKOFF_MAX
 )
+llm = LLM_GATEWAY
+
+# Every parsed resume lands here so new JDs can be ranked without re-parsing
+CANDIDATE_INDEX = CandidateIndex(
+    os.path.join(app.config['UPLOAD_FOLDER'], 'index'), TAXONOMY.current().vocabulary, TAXONOMY.version
+)
+
+# Open roles for /match-jobs, each JD parsed once when it is added
+JOB_CATALOG = JobCatalog(
+    os.path.join(app.config['UPLOAD_FOLDER'], 'openings.sqlite3'), TAXONOMY.current().vocabulary, TAXONOMY.version
+)
+
+@TAXONOMY.on_reload
+def _taxonomy_reloaded(compiled, previous):
+    """Skills extracted with the old taxonomy must not be served again"""
+    PARSE_CACHE.set_version(compiled.version)
+    CANDIDATE_INDEX.set_taxonomy(compiled.vocabulary, compiled.version)
+    JOB_CATALOG.set_taxonomy(compiled.vocabulary, compiled.version)
+    rebuild_candidate_index()
+    rebuild_job_catalog()
+
+# Stage histograms, counters and cache gauges served at /metrics
+METRICS = MetricsRegistry(enabled=Config.METRICS_ENABLED)
+METRICS.describe('stage_seconds', 'Time spent in each pipeline stage')
+METRICS.describe('http_request_seconds', 'Request handling time up to the first response byte')
+METRICS.describe('llm_seconds', 'Latency of LLM calls that reached Groq (cache misses)')
+METRICS.describe('llm_tokens_total', 'Tokens reported by Groq for uncached LLM calls')
+METRICS.describe('llm_prompt_tokens_total', 'Estimated tokens of the analysis prompts built, by prompt')
+METRICS.describe('errors_total', 'Errors caught and handled, by stage')
+METRICS.describe('http_requests_total', 'Requests served, by route and status')
+METRICS.describe('chat_stream_ttft_seconds', 'Streamed chat: time to the first token, by whether it was cached')
+METRICS.describe('chat_stream_seconds', 'Streamed chat: time to the last token, by whether it was cached')
+
+def _record_llm_usage(response, seconds):
+    """LLM_CACHE hook: latency and token usage of each call that went upstream"""
+    METRICS.observe('llm_seconds', seconds)
+    usage = getattr(response, 'usage_metadata', None) or {}
+    if not usage:
+        token_usage = (getattr(response, 'response_metadata', None) or {}).get('token_usage') or {}
+        usage = {'input_tokens': token_usage.get('prompt_tokens', 0),
+                 'output_tokens': token_usage.get('completion_tokens', 0)}
+    METRICS.inc('llm_tokens_total', usage.get('input_tokens', 0), direction='input')
+    METRICS.inc('llm_tokens_total', usage.get('output_tokens', 0), direction='output')
+
+# Analyses live server-side; the session cookie only carries an id
+RESULT_STORE = create_result_store(Config.SESSION_TYPE, app.config['UPLOAD_FOLDER'])
+
+# Identical prompts (same resume + JD, same chat question) reuse one completion
+LLM_CACHE = LLMResponseCache(
+    ttl=Config.LLM_CACHE_TTL, max_entries=Config.LLM_CACHE_MAX_ENTRIES, on_upstream=_record_llm_usage
+)
+
+@METRICS.collector
+def _cache_metrics():
+    parse, llm_stats = PARSE_CACHE.stats(), LLM_CACHE.stats()
+    return [
+        ('parse_cache_hits_total', 'counter', {'tier': 'memory'}, parse['hits_memory']),
+        ('parse_cache_hits_total', 'counter', {'tier': 'disk'}, parse['hits_disk']),
+        ('parse_cache_misses_total', 'counter', {}, parse['misses']),
+        ('parse_cache_hit_ratio', 'gauge', {}, parse['hit_rate']),
+        ('parse_cache_memory_bytes', 'gauge', {}, parse['memory_bytes']),
+        ('llm_cache_hits_total', 'counter', {}, llm_stats['hits']),
+        ('llm_cache_coalesced_total', 'counter', {}, llm_stats['coalesced']),
+        ('llm_cache_misses_total', 'counter', {}, llm_stats['misses']),
+        ('llm_cache_hit_ratio', 'gauge', {}, llm_stats['hit_rate']),
+        ('llm_upstream_errors_total', 'counter', {}, llm_stats['upstream_errors']),
+        ('llm_cache_rejected_total', 'counter', {}, llm_stats['rejected']),
+        ('llm_cache_entries', 'gauge', {}, llm_stats['entries'])
+    ] + _gateway_metrics() + _sandbox_metrics()
+
+def _sandbox_metrics():
+    sandbox = _pdf_sandbox if _pdf_sandbox_pid == os.getpid() else None
+    if sandbox is None:
+        return []
+    stats = sandbox.stats()
+    return [
+        ('parser_sandbox_documents_total', 'counter', {}, stats['documents']),
+        ('parser_sandbox_failures_total', 'counter', {'reason': 'timeout'}, stats['timeouts']),
+        ('parser_sandbox_failures_total', 'counter', {'reason': 'memory'}, stats['memory']),
+        ('parser_sandbox_failures_total', 'counter', {'reason': 'crashed'}, stats['crashed']),
+        ('parser_sandbox_failures_total', 'counter', {'reason': 'error'}, stats['errors']),
+        ('parser_sandbox_recycled_total', 'counter', {}, stats['recycled']),
+        ('parser_sandbox_workers', 'gauge', {}, stats['workers'])
+    ]
+
+def _gateway_metrics():
+    gateway = LLM_GATEWAY.stats()
+    return [
+        ('llm_attempts_total', 'counter', {}, gateway['calls']),
+        ('llm_attempt_failures_total', 'counter', {}, gateway['failures']),
+        ('llm_retries_total', 'counter', {}, gateway['retries']),
+        ('llm_rejected_total', 'counter', {'reason': 'circuit_open'}, gateway['rejected']),
+        ('llm_rejected_total', 'counter', {'reason': 'rate_limit'}, gateway['rate_limited']),
+        ('llm_circuit_open', 'gauge', {}, int(gateway['circuit'] != 'closed')),
+        ('llm_circuit_opened_total', 'counter', {}, gateway['circuit_opened'])
+    ]
 
 # ============================================================================
 # RESUME PARSING FUNCTIONS
 # ============================================================================
+#
+# A "source" is a file path, a bytes-like buffer (bytes, bytearray,
+# memoryview) or a seekable binary stream such as a werkzeug upload stream.
+# Buffers and streams carry no extension, so callers pass the display
+# filename to pick the parser.
+
+_EMPTY_PARSE_INFO = {'pages_read': 0, 'truncated': False, 'truncated_reason': None}
+
+def _source_ext(source, filename=None):
+    """Lower-case extension from the display filename or a path source"""
+    name = filename or (source if isinstance(source, str) else getattr(source, 'name', None))
+    return os.path.splitext(name)[1].lower() if isinstance(name, str) else ''
+
+def _pdf_input(source):
+    """What pdfplumber.open accepts: a path or a seekable stream"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    if not isinstance(source, str):
+        source.seek(0)
+    return source
+
+def _read_text(source, limit=None):
+    """Read up to limit characters of UTF-8 text (newlines normalized as open() does)"""
+    if isinstance(source, str):
+        with open(source, 'r', encoding='utf-8') as f:
+            return f.read(limit) if limit else f.read()
+    if not isinstance(source, (bytes, bytearray, memoryview)):
+        source.seek(0)
+        source = source.read()
+    with io.TextIOWrapper(io.BytesIO(source), encoding='utf-8') as f:
+        return f.read(limit) if limit else f.read()
+
+def iter_pdf_pages(file_path, max_pages=None):
+    """Yield (page_number, page_text) one page at a time.
+
+    Each page's parsed objects are released as soon as its text is read, so
+    memory stays flat regardless of document length. One page beyond
+    max_pages is opened (but not extracted) so callers can tell whether the
+    document was cut short.
+    """
+    import pdfplumber  # deferred: startup.py
+
+    pages = range(1, max_pages + 2) if max_pages else None
+    with pdfplumber.open(_pdf_input(file_path), pages=pages) as pdf:
+        for page in pdf.pages:
+            if max_pages and page.page_number > max_pages:
+                yield page.page_number, None
+                return
+            try:
+                yield page.page_number, page.extract_text() or ""
+            finally:
+                page.close()
+
+def extract_pdf_text(file_path, max_pages=None, max_chars=None, time_budget=None):
+    """Extract PDF text within page, character and time budgets.
+
+    Returns (text, parse_info) where parse_info records how many pages were
+    read and why extraction stopped early, if it did.
+    """
+    max_pages = Config.PDF_MAX_PAGES if max_pages is None else max_pages
+    max_chars = Config.PARSE_MAX_CHARS if max_chars is None else max_chars
+    time_budget = Config.PDF_TIME_BUDGET if time_budget is None else time_budget
+
+    parts = []
+    char_count = 0
+    pages_read = 0
+    truncated_reason = None
+    deadline = time.monotonic() + time_budget if time_budget else None
+
+    for page_number, page_text in iter_pdf_pages(file_path, max_pages=max_pages):
+        if page_text is None:
+            truncated_reason = 'max_pages'
+            break
+        pages_read += 1
+        if max_chars and char_count + len(page_text) > max_chars:
+            parts.append(page_text[:max_chars - char_count])
+            char_count = max_chars
+            truncated_reason = 'max_chars'
+            break
+        parts.append(page_text)
+        char_count += len(page_text) + 1
+        if deadline and time.monotonic() > deadline:
+            truncated_reason = 'time_budget'
+            break
+
+    parse_info = {
+        'pages_read': pages_read,
+        'truncated': truncated_reason is not None,
+        'truncated_reason': truncated_reason
+    }
+    return "\n".join(parts), parse_info
 
-def parse_pdf(file_path):
+# PDFs are parsed in sandbox worker processes (parser_sandbox.py), one
+# sandbox per web worker. Batches send whole documents to it instead of the
+# process pool, so a sandbox is never started inside another worker process.
+_pdf_sandbox = None
+_pdf_sandbox_pid = None
+_pdf_sandbox_lock = threading.Lock()
+
+def _sandbox_worker_init():
+    """First thing in every sandbox worker: the locks parsing takes may
+    have been held by another thread at the fork, and a taxonomy reload
+    in a worker must not rebuild the parent's indexes"""
+    for component in (TAXONOMY, METRICS, PARSE_CACHE, LLM_CACHE):
+        component.after_fork()
+
+def create_pdf_sandbox(workers):
+    """A parser sandbox of `workers` processes, or None when sandboxing is
+    off, unsupported or this process is itself a sandbox worker"""
+    if Config.PARSER_SANDBOX_WORKERS <= 0 or not SANDBOX_SUPPORTED or in_worker():
+        return None
+    return ParserSandbox(
+        workers=workers,
+        timeout=Config.PARSER_SANDBOX_TIMEOUT,
+        memory_limit=Config.PARSER_SANDBOX_MEMORY_MB * 1024 * 1024,
+        max_documents=Config.PARSER_SANDBOX_MAX_DOCUMENTS,
+        preload=('pdfplumber',),
+        initializer=_sandbox_worker_init,
+        queue_timeout=Config.PARSER_SANDBOX_QUEUE_TIMEOUT
+    )
+
+def get_pdf_sandbox():
+    """This process's parser sandbox, sized for batch parsing too, or None to parse in-process"""
+    global _pdf_sandbox, _pdf_sandbox_pid
+    if in_worker():  # already sandboxed; and _pdf_sandbox_lock may be held from before the fork
+        return None
+    with _pdf_sandbox_lock:
+        if _pdf_sandbox_pid != os.getpid():  # not created yet, or inherited across a fork
+            _pdf_sandbox = create_pdf_sandbox(max(Config.PARSER_SANDBOX_WORKERS, Config.BATCH_PARSE_WORKERS))
+            _pdf_sandbox_pid = os.getpid()
+        return _pdf_sandbox
+
+def _sandbox_source(source):
+    """A path or bytes: what can be sent to a sandbox worker"""
+    if isinstance(source, str):
+        return source
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    source.seek(0)
+    return source.read()
+
+def parse_pdf(source):
     """Extract text from PDF using pdfplumber"""
-    try:
-        text = ""
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                text += page.extract_text() or ""
-        return text
-    except Exception as e:
-        print(f"PDF parsing error: {e}")
-        return ""
+    return parse_pdf_with_info(source)[0]
+
+@METRICS.timed('parse_pdf')
+def parse_pdf_with_info(source):
+    """Extract text from PDF, returning (text, parse_info).
+
+    If extraction fails (in the sandbox: also a timeout, the memory cap or a
+    crashed worker) the text is empty and parse_info['error'] holds
+    {'type', 'message'}.
+    """
+    sandbox = get_pdf_sandbox()
+    if sandbox is None:
+        try:
+            return extract_pdf_text(source)
+        except Exception as e:
+            outcome = {'ok': False, 'error': {'type': 'error', 'message': str(e)}}
+    else:
+        outcome = sandbox.run(extract_pdf_text, _sandbox_source(source))
+        if outcome['ok']:
+            return outcome['value']
+    error = outcome['error']
+    print(f"PDF parsing error ({error['type']}): {error['message']}")
+    METRICS.inc('errors_total', stage='parse_pdf')
+    return "", dict(_EMPTY_PARSE_INFO, error=error)
 
-def parse_txt(file_path):
+def parse_txt(source):
     """Extract text from TXT file"""
+    return parse_txt_with_info(source)[0]
+
+@METRICS.timed('parse_txt')
+def parse_txt_with_info(source):
+    """Extract text from TXT file, returning (text, parse_info)"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        text = _read_text(source, Config.PARSE_MAX_CHARS + 1 if Config.PARSE_MAX_CHARS else None)
     except Exception as e:
         print(f"TXT parsing error: {e}")
-        return ""
+        METRICS.inc('errors_total', stage='parse_txt')
+        text = ""
+    truncated = bool(Config.PARSE_MAX_CHARS) and len(text) > Config.PARSE_MAX_CHARS
+    if truncated:
+        text = text[:Config.PARSE_MAX_CHARS]
+    return text, {'pages_read': 1 if text else 0, 'truncated': truncated, 'truncated_reason': 'max_chars' if truncated else None}
 
 def extract_contact_info(text):
-    """Extract contact information from resume text"""
-    contact = {}
-    
-    # Extract email
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    emails = re.findall(email_pattern, text)
-    contact['email'] = emails[0] if emails else ""
-    
-    # Extract phone
-    phone_pattern = r'[\+\(]?[1-9][0-9 .\-\(\)]{8,}[0-9]'
-    phones = re.findall(phone_pattern, text)
-    contact['phone'] = phones[0] if phones else ""
-    
-    # Extract LinkedIn
-    linkedin_pattern = r'linkedin\.com/in/[\w-]+'
-    linkedin = re.findall(linkedin_pattern, text, re.IGNORECASE)
-    contact['linkedin'] = linkedin[0] if linkedin else ""
-    
-    # Extract GitHub
-    github_pattern = r'github\.com/[\w-]+'
-    github = re.findall(github_pattern, text, re.IGNORECASE)
-    contact['github'] = github[0] if github else ""
-    
-    # Extract name (first line typically)
-    lines = [line.strip() for line in text.split('\n') if line.strip()]
-    contact['name'] = lines[0] if lines else "Candidate"
-    
-    return contact
+    """Extract contact information from the resume header (and footer)"""
+    return extract_contact(text, Config.CONTACT_HEAD_CHARS, Config.CONTACT_TAIL_CHARS)
 
-def extract_skills_from_text(text, skills_db):
-    """Extract skills mentioned in resume text"""
-    text_lower = text.lower()
-    found_skills = {}
-    
-    for category, skills_list in skills_db.items():
-        found_skills[category] = []
-        for skill in skills_list:
-            # Check for exact match and variations
-            skill_lower = skill.lower()
-            if skill_lower in text_lower:
-                found_skills[category].append(skill)
-    
-    return found_skills
+@METRICS.timed('extract_skills_from_text')
+def extract_skills_from_text(text, skills_db=None):
+    """Extract skills mentioned in resume text (single pass, word-boundary aware).
 
-def parse_resume(file_path):
-    """Main resume parsing function"""
+    Uses the live compiled taxonomy (aliases included) unless a custom
+    {category: [skills]} dict is given.
+    """
+    if skills_db is None:
+        return TAXONOMY.current().extract(text)
+    return SkillMatcher(skills_db).extract(text)
+
+def parse_resume(source, filename=None):
+    """Main resume parsing function.
+
+    source is a path, bytes-like buffer or stream; filename (the upload's
+    name) decides the file type when source is not a path.
+    """
     # Determine file type and parse
-    if file_path.endswith('.pdf'):
-        text = parse_pdf(file_path)
-    elif file_path.endswith('.txt'):
-        text = parse_txt(file_path)
+    extension = _source_ext(source, filename)
+    if extension == '.pdf':
+        text, parse_info = parse_pdf_with_info(source)
+    elif extension == '.txt':
+        text, parse_info = parse_txt_with_info(source)
     else:
-        text = ""
+        text, parse_info = "", dict(_EMPTY_PARSE_INFO)
     
     # Extract structured information
+    taxonomy = TAXONOMY.current()
     contact = extract_contact_info(text)
-    skills = extract_skills_from_text(text, SKILLS_TAXONOMY)
+    with METRICS.stage('extract_skills_from_text'):
+        skills = taxonomy.extract(text)
     
     return {
         'contact': contact,
         'raw_text': text,
         'skills': skills,
-        'text_length': len(text)
+        'text_length': len(text),
+        'parse_info': parse_info,
+        'taxonomy_version': taxonomy.version
     }
 
+def _is_cacheable(resume_data):
+    """Results cut short by the time budget depend on load, so don't cache
+    them, nor failed extractions (a timeout may pass on retry); nor results
+    a parse worker produced with a different taxonomy version than the
+    cache key (one side reloaded first)"""
+    parse_info = resume_data.get('parse_info', {})
+    return (parse_info.get('truncated_reason') != 'time_budget' and not parse_info.get('error')
+            and resume_data.get('taxonomy_version') == PARSE_CACHE.version)
+
+def _cache_key(source, filename=None):
+    """(content hash, parse cache key) for an uploaded file"""
+    digest = content_digest(source)
+    return digest, PARSE_CACHE.key_for_digest(digest, _source_ext(source, filename))
+
+def parse_resume_cached(source, filename=None):
+    """parse_resume with a content-addressed cache in front of it.
+
+    The result carries 'content_hash' so callers can index the candidate.
+    """
+    digest, key = _cache_key(source, filename)
+    resume_data = PARSE_CACHE.get(key)
+    if resume_data is None:
+        resume_data = parse_resume(source, filename)
+        if _is_cacheable(resume_data):
+            PARSE_CACHE.put(key, resume_data)
+    resume_data['content_hash'] = digest
+    return resume_data
+
+def parse_resumes_cached(sources, filenames=None, on_complete=None, cancelled=None):
+    """Parse many resumes, sending only cache misses to the parser sandbox
+    (or, with the sandbox off, the process pool).
+
+    sources must be paths or bytes (streams cannot be sent to another
+    process). Returns one {'ok', 'value'|'error'} dict per source, in input
+    order. on_complete(index, outcome) is called as each one is ready,
+    cache hits first. Setting the threading.Event cancelled stops parsing
+    the rest.
+    """
+    filenames = filenames or [None] * len(sources)
+    keys = [_cache_key(source, filename) for source, filename in zip(sources, filenames)]
+    outcomes = [None] * len(sources)
+    misses = []
+    for i, (digest, key) in enumerate(keys):
+        cached = PARSE_CACHE.get(key)
+        if cached is not None:
+            cached['content_hash'] = digest
+            outcomes[i] = {'ok': True, 'value': cached}
+            if on_complete is not None:
+                on_complete(i, outcomes[i])
+        else:
+            misses.append(i)
+
+    def finish(position, outcome):
+        i = misses[position]
+        if outcome['ok']:
+            # Parse stages were timed in the worker process
+            value, stages, pid = outcome['value']
+            METRICS.absorb(stages, pid)
+            outcome = {'ok': True, 'value': value}
+            if _is_cacheable(outcome['value']):
+                PARSE_CACHE.put(keys[i][1], outcome['value'])
+            outcome['value']['content_hash'] = keys[i][0]
+        outcomes[i] = outcome
+        if on_complete is not None:
+            on_complete(i, outcome)
+
+    run_parallel_parse(call_with_stages, [(parse_resume, sources[i], filenames[i]) for i in misses],
+                       on_complete=finish, cancelled=cancelled, sandbox=get_pdf_sandbox())
+    return outcomes
+
+def index_candidate(resume_data, filename=None):
+    """Add a parsed resume to the candidate index (best effort)"""
+    if not Config.CANDIDATE_INDEX_AUTO_ADD or not resume_data.get('content_hash'):
+        return None
+    try:
+        expire_candidates()
+        return CANDIDATE_INDEX.add(resume_data['content_hash'], resume_data, filename=filename)
+    except Exception as e:
+        print(f"Candidate index error: {e}")
+        return None
+
+def expire_candidates():
+    """Erase candidates older than CANDIDATE_INDEX_RETENTION_DAYS"""
+    if Config.CANDIDATE_INDEX_RETENTION_DAYS > 0:
+        CANDIDATE_INDEX.purge(time.time() - Config.CANDIDATE_INDEX_RETENTION_DAYS * 86400)
+
+_index_rebuild = threading.Lock()
+_catalog_rebuild = threading.Lock()
+
+def _rebuild_in_background(store, running, name):
+    """Re-extract a stale store in a background thread; returns at once,
+    and does nothing while its rebuild (holding `running`) is under way"""
+    if not store.is_stale or not running.acquire(blocking=False):
+        return
+
+    def run():
+        try:
+            store.rebuild(extract_skills_from_text)
+        except Exception as e:
+            print(f"{name} rebuild error: {e}")
+            traceback.print_exc()
+        finally:
+            running.release()
+
+    threading.Thread(target=run, name=f"{name.lower().replace(' ', '-')}-rebuild", daemon=True).start()
+
+def rebuild_candidate_index():
+    _rebuild_in_background(CANDIDATE_INDEX, _index_rebuild, 'Candidate index')
+
+def rebuild_job_catalog():
+    _rebuild_in_background(JOB_CATALOG, _catalog_rebuild, 'Job catalog')
+
+def _rebuilding(what):
+    """503 telling the client to retry while a rebuild runs"""
+    response = jsonify({'error': f'The {what} is being rebuilt for the updated skill taxonomy, '
+                                 'please try again shortly'})
+    response.headers['Retry-After'] = '5'
+    return response, 503
+
 # ============================================================================
 # JOB DESCRIPTION PARSING
 # ============================================================================
 
-def parse_job_description(file_path=None, text=None):
-    """Parse job description from file or text"""
-    if file_path:
-        if file_path.endswith('.pdf'):
+def parse_job_description(file_path=None, text=None, filename=None):
+    """Parse job description from file or text.
+
+    file_path may also be a bytes-like buffer or stream, with filename
+    giving its type.
+    """
+    if file_path is not None:
+        extension = _source_ext(file_path, filename)
+        if extension == '.pdf':
             jd_text = parse_pdf(file_path)
-        elif file_path.endswith('.txt'):
+        elif extension == '.txt':
             jd_text = parse_txt(file_path)
         else:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                jd_text = f.read()
+            jd_text = _read_text(file_path)
     else:
         jd_text = text or ""
     
     # Extract required skills from JD
-    jd_skills = extract_skills_from_text(jd_text, SKILLS_TAXONOMY)
+    jd_skills = extract_skills_from_text(jd_text)
     
     # Extract job title (simple heuristic)
     lines = [line.strip() for line in jd_text.split('\n') if line.strip()]
@@ -158,6 +564,7 @@ def parse_job_description(file_path=None, text=None):
 # ATS SKILL MATCHING ENGINE
 # ============================================================================
 
+@METRICS.timed('calculate_skill_match')
 def calculate_skill_match(resume_skills, jd_skills):
     """Calculate detailed skill matching between resume and JD"""
     
@@ -172,16 +579,16 @@ def calculate_skill_match(resume_skills, jd_skills):
     total_points = 0
     earned_points = 0
     
-    for category in SKILLS_TAXONOMY.keys():
-        resume_cat_skills = set(resume_skills.get(category, []))
-        jd_cat_skills = set(jd_skills.get(category, []))
-        
+    for category in TAXONOMY.current().categories:
+        jd_cat_skills = jd_skills.get(category)
         if not jd_cat_skills:
             continue
+        resume_cat_skills = set(resume_skills.get(category, ()))
         
-        # Calculate matches
-        matched = resume_cat_skills & jd_cat_skills
-        missing = jd_cat_skills - resume_cat_skills
+        # Calculate matches (in JD order, so prompts built from them are stable)
+        jd_cat_skills = dict.fromkeys(jd_cat_skills)
+        matched = [skill for skill in jd_cat_skills if skill in resume_cat_skills]
+        missing = [skill for skill in jd_cat_skills if skill not in resume_cat_skills]
         
         # Scoring
         category_total = len(jd_cat_skills) * 10
@@ -215,21 +622,34 @@ def calculate_skill_match(resume_skills, jd_skills):
     
     return results
 
+def semantic_scores(resumes, jd_data):
+    """Lexical-semantic similarity (0-100) of each parsed resume's text to the JD.
+
+    Hashed TF-IDF cosine (semantic.py): offline, no tokens spent, and cheap
+    enough to rank a whole batch before any LLM call. IDF is fitted on the
+    resumes scored together, so scores are relative to that pool.
+    """
+    with METRICS.stage('semantic_score'):
+        pool = SemanticPool(TermMatrix.from_texts([resume_data['raw_text'] for resume_data in resumes]))
+        return similarity_scores(pool, TermMatrix.from_texts([jd_data['text']]))[0]
+
+def single_semantic_score(resume_data, jd_data):
+    """semantic_score for a resume scored on its own, with IDF from the
+    candidate index; None while the index is too small for IDF to mean much"""
+    with METRICS.stage('semantic_score'):
+        idf = CANDIDATE_INDEX.idf(Config.SEMANTIC_MIN_POOL)
+        if idf is None:
+            return None
+        return pair_similarity(idf, hash_terms(resume_data['raw_text']), hash_terms(jd_data['text']))
+
 # ============================================================================
 # AI SEMANTIC ANALYSIS
 # ============================================================================
 
-def analyze_with_ai(resume_data, jd_data, match_results):
-    """Perform semantic analysis using Groq LLM"""
-    
-    # Prepare context
-    matched_skills_text = ", ".join([s['skill'] for s in match_results['matched_flat'][:15]])
-    missing_skills_text = ", ".join([s['skill'] for s in match_results['missing_flat'][:15]])
-    
-    # Create prompt using ChatPromptTemplate (Python 3.13 compatible)
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", "You are an expert HR recruiter and career strategist analyzing a candidate's fit for a role."),
-        ("human", """JOB DESCRIPTION:
+# Full-evaluation prompt, built on first use (Python 3.13 compatible)
+ANALYSIS_PROMPT = LazyPrompt([
+    ("system", "You are an expert HR recruiter and career strategist analyzing a candidate's fit for a role."),
+    ("human", """JOB DESCRIPTION:
 {job_description}
 
 RESUME SUMMARY:
@@ -268,79 +688,600 @@ PROVIDE COMPREHENSIVE EVALUATION IN JSON FORMAT:
 }}
 
 Return ONLY valid JSON, no other text.""")
-    ])
-    
+])
+
+def _skill_names(text):
+    """Canonical names of the taxonomy skills a passage mentions"""
+    return {match['skill'] for match in TAXONOMY.current().matcher.find_matches(text)}
+
+def _jd_skill_names(jd_data):
+    return [skill for skills in jd_data['skills'].values() for skill in skills]
+
+def _prompt_resume(resume_data, jd_data, budget, legacy_chars):
+    """Resume text for a prompt: the passages most relevant to the JD's
+    skills within budget tokens (0 = the first legacy_chars characters)"""
+    if not budget:
+        return resume_data['raw_text'][:legacy_chars]
+    return resume_context(resume_data['raw_text'], budget, _skill_names, _jd_skill_names(jd_data))['text']
+
+def _prompt_jd(jd_data):
+    """JD text for the analysis prompt. It is the same for every candidate,
+    so it is built once per parsed JD and kept on it."""
+    if not Config.PROMPT_JD_TOKENS:
+        return jd_data['text'][:2000]
+    context = jd_data.get('prompt_context')
+    if context is None:
+        context = jd_data['prompt_context'] = jd_context(
+            jd_data['text'], Config.PROMPT_JD_TOKENS, _skill_names, _jd_skill_names(jd_data)
+        )['text']
+    return context
+
+def _count_prompt_tokens(messages, prompt):
+    """Estimated size of a built prompt, also counted in /metrics"""
+    tokens = sum(estimate_tokens(message.content) for message in messages)
+    METRICS.inc('llm_prompt_tokens_total', tokens, prompt=prompt)
+    return tokens
+
+def _analysis_messages(resume_data, jd_data, match_results):
+    """Fill ANALYSIS_PROMPT for one candidate"""
+    matched_skills_text = ", ".join([s['skill'] for s in match_results['matched_flat'][:15]])
+    missing_skills_text = ", ".join([s['skill'] for s in match_results['missing_flat'][:15]])
+    return ANALYSIS_PROMPT.format_messages(
+        resume=_prompt_resume(resume_data, jd_data, Config.PROMPT_RESUME_TOKENS, 2000),
+        job_description=_prompt_jd(jd_data),
+        ats_score=match_results['overall_score'],
+        matched_skills=matched_skills_text,
+        missing_skills=missing_skills_text
+    )
+
+def _json_reply(response):
+    """LLM_CACHE validator: only replies whose JSON object parses are cached,
+    so a malformed one is retried rather than served as a fallback for the TTL"""
+    json_match = re.search(r'\{.*\}', response.content, re.DOTALL)
     try:
-        # Prepare inputs
-        resume_summary = resume_data['raw_text'][:2000]  # Limit length
-        jd_summary = jd_data['text'][:2000]
-        
-        # Format messages
-        messages = prompt.format_messages(
-            resume=resume_summary,
-            job_description=jd_summary,
-            ats_score=match_results['overall_score'],
-            matched_skills=matched_skills_text,
-            missing_skills=missing_skills_text
-        )
-        
-        # Get AI response
-        response = llm.invoke(messages)
-        response_text = response.content
-        
-        # Try to extract JSON
-        json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-        if json_match:
-            ai_analysis = json.loads(json_match.group())
-        else:
-            # Fallback if JSON parsing fails
-            ai_analysis = {
-                "overall_fit": "Unable to generate detailed analysis. Please review ATS scores.",
-                "strengths": ["Strong technical foundation", "Relevant experience", "Good educational background"],
-                "weaknesses": ["Some skill gaps identified", "Additional certifications recommended"],
-                "red_flags": "",
-                "recommendation": "Moderate Fit",
-                "confidence": "Medium",
-                "learning_plan_30": "Focus on missing critical skills",
-                "learning_plan_60": "Build portfolio projects",
-                "learning_plan_90": "Gain advanced certifications",
-                "resume_tips": "Optimize keywords for ATS"
-            }
-        
-        # Calculate role-fit score (0-5 stars)
-        if ai_analysis['recommendation'] == 'Strong Fit':
-            role_fit_score = 4.5
-        elif ai_analysis['recommendation'] == 'Moderate Fit':
-            role_fit_score = 3.5
-        else:
-            role_fit_score = 2.0
-        
-        ai_analysis['role_fit_score'] = role_fit_score
-        
-        return ai_analysis
-        
-    except Exception as e:
-        print(f"AI Analysis Error: {e}")
-        traceback.print_exc()
-        # Return fallback analysis
-        return {
-            "overall_fit": "Analysis completed. Review detailed scores below.",
-            "strengths": ["Technical skills present", "Relevant experience", "Educational background"],
-            "weaknesses": ["Some gaps in required skills", "Additional training recommended"],
+        return json_match is not None and isinstance(json.loads(json_match.group()), dict)
+    except ValueError:
+        return False
+
+def _parse_analysis(response_text):
+    """The JSON evaluation in an LLM reply, plus the role-fit score"""
+    json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
+    if json_match:
+        ai_analysis = json.loads(json_match.group())
+    else:
+        # Fallback if JSON parsing fails
+        ai_analysis = {
+            "overall_fit": "Unable to generate detailed analysis. Please review ATS scores.",
+            "strengths": ["Strong technical foundation", "Relevant experience", "Good educational background"],
+            "weaknesses": ["Some skill gaps identified", "Additional certifications recommended"],
             "red_flags": "",
             "recommendation": "Moderate Fit",
             "confidence": "Medium",
-            "role_fit_score": 3.0,
-            "learning_plan_30": "Focus on top priority skills from missing list",
-            "learning_plan_60": "Complete relevant certifications",
-            "learning_plan_90": "Build real-world project portfolio",
-            "resume_tips": "Add more quantifiable achievements and keywords"
+            "learning_plan_30": "Focus on missing critical skills",
+            "learning_plan_60": "Build portfolio projects",
+            "learning_plan_90": "Gain advanced certifications",
+            "resume_tips": "Optimize keywords for ATS"
         }
 
+    # Calculate role-fit score (0-5 stars)
+    ai_analysis['role_fit_score'] = _role_fit_score(ai_analysis['recommendation'])
+    return ai_analysis
+
+def _failed_analysis(e):
+    """Fallback analysis when the LLM call or its reply fails"""
+    print(f"AI Analysis Error: {e}")
+    if not isinstance(e, LLMUnavailable):
+        traceback.print_exc()
+    METRICS.inc('errors_total', stage='analyze_with_ai')
+    return {
+        "overall_fit": "Analysis completed. Review detailed scores below.",
+        "strengths": ["Technical skills present", "Relevant experience", "Educational background"],
+        "weaknesses": ["Some gaps in required skills", "Additional training recommended"],
+        "red_flags": "",
+        "recommendation": "Moderate Fit",
+        "confidence": "Medium",
+        "role_fit_score": 3.0,
+        "learning_plan_30": "Focus on top priority skills from missing list",
+        "learning_plan_60": "Complete relevant certifications",
+        "learning_plan_90": "Build real-world project portfolio",
+        "resume_tips": "Add more quantifiable achievements and keywords"
+    }
+
+@METRICS.timed('analyze_with_ai')
+def analyze_with_ai(resume_data, jd_data, match_results):
+    """Perform semantic analysis using Groq LLM"""
+    messages = _analysis_messages(resume_data, jd_data, match_results)
+    try:
+        response = LLM_CACHE.invoke(llm, messages, valid=_json_reply)
+        ai_analysis = _parse_analysis(response.content)
+    except Exception as e:
+        ai_analysis = _failed_analysis(e)
+    ai_analysis['prompt_tokens'] = _count_prompt_tokens(messages, 'analysis')
+    return ai_analysis
+
+async def aanalyze_with_ai(resume_data, jd_data, match_results):
+    """analyze_with_ai for the async path: awaits Groq instead of holding a thread"""
+    with METRICS.stage('analyze_with_ai'):
+        messages = _analysis_messages(resume_data, jd_data, match_results)
+        try:
+            response = await LLM_CACHE.ainvoke(llm, messages, valid=_json_reply)
+            ai_analysis = _parse_analysis(response.content)
+        except Exception as e:
+            ai_analysis = _failed_analysis(e)
+        ai_analysis['prompt_tokens'] = _count_prompt_tokens(messages, 'analysis')
+        return ai_analysis
+
+def _role_fit_score(recommendation):
+    """Map the AI recommendation to a 0-5 star role-fit score"""
+    if recommendation == 'Strong Fit':
+        return 4.5
+    elif recommendation == 'Moderate Fit':
+        return 3.5
+    return 2.0
+
+def templated_analysis(match_results):
+    """Deterministic analysis for candidates triaged out of the LLM stage"""
+    matched = [s['skill'] for s in match_results['matched_flat']]
+    missing = [s['skill'] for s in match_results['missing_flat']]
+    total = len(matched) + len(missing)
+    overall_fit = (
+        f"ATS match of {match_results['overall_score']}%: {len(matched)} of {total} required skills found."
+        if total else "No required skills could be identified in the job description."
+    )
+    if missing:
+        overall_fit += f" Key gaps: {', '.join(missing[:5])}."
+    return {
+        "overall_fit": overall_fit,
+        "strengths": [f"Has {skill}" for skill in matched[:5]],
+        "weaknesses": [f"Missing {skill}" for skill in missing[:5]],
+        "red_flags": "",
+        "recommendation": "Weak Fit",
+        "confidence": "Low",
+        "role_fit_score": _role_fit_score("Weak Fit"),
+        "learning_plan_30": "Focus on top priority skills from missing list",
+        "learning_plan_60": "Complete relevant certifications",
+        "learning_plan_90": "Build real-world project portfolio",
+        "resume_tips": "Add the job's required skills where you genuinely have them"
+    }
+
+SHORT_ANALYSIS_PROMPT = LazyPrompt([
+    ("system", "You are an expert HR recruiter screening candidates quickly."),
+    ("human", """ROLE: {job_title}
+ATS Score: {ats_score}/100
+Matched Skills: {matched_skills}
+Missing Skills: {missing_skills}
+RESUME EXCERPT:
+{resume}
+
+Reply in JSON: {{"overall_fit": "one sentence", "recommendation": "Strong Fit, Moderate Fit, or Weak Fit"}}
+Return ONLY valid JSON, no other text.""")
+])
+
+def _short_messages(resume_data, jd_data, match_results):
+    return SHORT_ANALYSIS_PROMPT.format_messages(
+        job_title=jd_data['title'],
+        ats_score=match_results['overall_score'],
+        matched_skills=", ".join([s['skill'] for s in match_results['matched_flat'][:8]]),
+        missing_skills=", ".join([s['skill'] for s in match_results['missing_flat'][:8]]),
+        resume=_prompt_resume(resume_data, jd_data, Config.PROMPT_SHORT_RESUME_TOKENS, 500)
+    )
+
+def _apply_verdict(ai_analysis, response_text):
+    """Merge the short prompt's two-field verdict into a templated analysis"""
+    json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
+    if json_match:
+        verdict = json.loads(json_match.group())
+        ai_analysis['overall_fit'] = verdict.get('overall_fit') or ai_analysis['overall_fit']
+        ai_analysis['recommendation'] = verdict.get('recommendation', ai_analysis['recommendation'])
+        ai_analysis['confidence'] = "Medium"
+        ai_analysis['role_fit_score'] = _role_fit_score(ai_analysis['recommendation'])
+    return ai_analysis
+
+@METRICS.timed('analyze_with_ai_short')
+def analyze_with_ai_short(resume_data, jd_data, match_results):
+    """Screening-grade LLM verdict for low-scoring batch candidates.
+
+    Sends a fraction of analyze_with_ai's prompt and asks for two fields;
+    the remaining fields come from templated_analysis.
+    """
+    ai_analysis = templated_analysis(match_results)
+    messages = _short_messages(resume_data, jd_data, match_results)
+    try:
+        response = LLM_CACHE.invoke(llm, messages, valid=_json_reply)
+        _apply_verdict(ai_analysis, response.content)
+    except Exception as e:
+        print(f"AI Screening Error: {e}")
+        METRICS.inc('errors_total', stage='analyze_with_ai_short')
+    ai_analysis['prompt_tokens'] = _count_prompt_tokens(messages, 'short')
+    return ai_analysis
+
+async def aanalyze_with_ai_short(resume_data, jd_data, match_results):
+    ai_analysis = templated_analysis(match_results)
+    with METRICS.stage('analyze_with_ai_short'):
+        messages = _short_messages(resume_data, jd_data, match_results)
+        try:
+            response = await LLM_CACHE.ainvoke(llm, messages, valid=_json_reply)
+            _apply_verdict(ai_analysis, response.content)
+        except Exception as e:
+            print(f"AI Screening Error: {e}")
+            METRICS.inc('errors_total', stage='analyze_with_ai_short')
+        ai_analysis['prompt_tokens'] = _count_prompt_tokens(messages, 'short')
+    return ai_analysis
+
+def analyze_for_tier(tier, resume_data, jd_data, match_results):
+    """Run the analysis a triage tier calls for"""
+    if tier == FULL:
+        return analyze_with_ai(resume_data, jd_data, match_results)
+    if tier == SHORT:
+        return analyze_with_ai_short(resume_data, jd_data, match_results)
+    return templated_analysis(match_results)
+
+async def aanalyze_for_tier(tier, resume_data, jd_data, match_results):
+    if tier == FULL:
+        return await aanalyze_with_ai(resume_data, jd_data, match_results)
+    if tier == SHORT:
+        return await aanalyze_with_ai_short(resume_data, jd_data, match_results)
+    return templated_analysis(match_results)
+
+# ============================================================================
+# ANALYSIS PIPELINES (shared by the request handlers and the job worker)
+# ============================================================================
+
+def _remove_files(paths):
+    """Best-effort cleanup of uploaded files"""
+    for path in paths:
+        if not path:
+            continue
+        try:
+            os.remove(path)
+        except Exception:
+            pass
+
+def load_job_description(jd_source=None, jd_text='', jd_filename=None):
+    """Parse the JD from an upload (path, buffer or stream) if there is one,
+    else from pasted text"""
+    if jd_source is not None:
+        return parse_job_description(file_path=jd_source, filename=jd_filename)
+    return parse_job_description(text=jd_text)
+
+def _parse_and_match(resume, jd_data, filename=None):
+    """Everything before the LLM call for one resume: (resume_data, match_results)"""
+    resume_data = parse_resume_cached(resume, filename)
+    index_candidate(resume_data, filename)
+    return resume_data, calculate_skill_match(resume_data['skills'], jd_data['skills'])
+
+def run_single_analysis(resume, jd_data, filename=None):
+    """Parse, match and AI-analyze one resume (path, buffer or stream);
+    returns the complete analysis"""
+    resume_data, match_results = _parse_and_match(resume, jd_data, filename)
+    ai_analysis = analyze_with_ai(resume_data, jd_data, match_results)
+    return _single_result(resume_data, jd_data, match_results, ai_analysis)
+
+async def arun_single_analysis(resume, jd_data, filename=None):
+    """run_single_analysis for the async path: parsing, matching, indexing
+    and scoring run on a worker thread and the LLM call is awaited, so the
+    event loop keeps serving"""
+    resume_data, match_results = await asyncio.to_thread(_parse_and_match, resume, jd_data, filename)
+    ai_analysis = await aanalyze_with_ai(resume_data, jd_data, match_results)
+    return await asyncio.to_thread(_single_result, resume_data, jd_data, match_results, ai_analysis)
+
+def _single_result(resume_data, jd_data, match_results, ai_analysis):
+    return {
+        'candidate_name': resume_data['contact']['name'],
+        'candidate_email': resume_data['contact']['email'],
+        'candidate_phone': resume_data['contact']['phone'],
+        'candidate_linkedin': resume_data['contact']['linkedin'],
+        'candidate_github': resume_data['contact']['github'],
+        'job_title': jd_data['title'],
+        'ats_score': match_results['overall_score'],
+        'semantic_score': single_semantic_score(resume_data, jd_data),
+        'role_fit_score': ai_analysis['role_fit_score'],
+        'category_scores': match_results['category_scores'],
+        'matched_skills': [s['skill'] for s in match_results['matched_flat']],
+        'missing_skills': [s['skill'] for s in match_results['missing_flat']],
+        'matched_skills_detailed': match_results['matched_flat'],
+        'missing_skills_detailed': match_results['missing_flat'],
+        'ai_analysis': ai_analysis,
+        'resume_parse_info': resume_data.get('parse_info'),
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+def run_multi_analysis(saved, jd_data, on_result=None, on_error=None, keep_results=True, cancelled=None):
+    """Analyze many saved resumes against one parsed JD.
+
+    saved is a list of (display filename, path or bytes). on_result(entry,
+    completed, total) is called as each candidate finishes and
+    on_error(error) as each file fails. Returns (batch_results, errors,
+    triage) with results in input order; triage counts how many candidates
+    got each analysis tier. Streaming callers pass keep_results=False so
+    finished entries (and the parsed resume behind each) are handed to
+    on_result and not retained, and a threading.Event cancelled that stops
+    further parsing and LLM calls once the client has gone.
+    """
+    parsed = parse_resumes_cached([source for _, source in saved], [filename for filename, _ in saved],
+                                  cancelled=cancelled)
+    if cancelled is not None and cancelled.is_set():
+        return [], [], summarize_tiers([])
+    candidates, errors, tiers = _triage_batch(saved, parsed, jd_data, on_error)
+    del parsed
+
+    entries = [None] * len(candidates)
+    completed = 0
+    total = len(candidates)
+
+    def analyze(index):
+        _, resume_data, match_results = candidates[index]
+        return analyze_for_tier(tiers[index], resume_data, jd_data, match_results)
+
+    def collect(index, outcome):
+        nonlocal completed
+        if cancelled is not None and cancelled.is_set():
+            return
+        completed += 1
+        entry = _batch_outcome(candidates[index], jd_data, tiers[index], outcome, errors)
+        if entry is None:
+            if on_error is not None:
+                on_error(errors[-1])
+        else:
+            if keep_results:
+                entries[index] = entry
+            if on_result is not None:
+                on_result(entry, completed, total)
+        if not keep_results:
+            candidates[index] = None
+
+    # LLM calls are I/O-bound; run them concurrently under LLM_MAX_CONCURRENCY
+    run_bounded_llm(analyze, [(i,) for i in range(total)], on_complete=collect, cancelled=cancelled)
+
+    batch_results = [entry for entry in entries if entry is not None]
+    return batch_results, errors, summarize_tiers(tiers)
+
+async def arun_multi_analysis(saved, jd_data):
+    """run_multi_analysis for the async path; returns the same
+    (batch_results, errors, triage). Parsing, indexing, matching and
+    semantic scoring run on a worker thread."""
+    parsed = await asyncio.to_thread(
+        parse_resumes_cached, [source for _, source in saved], [filename for filename, _ in saved]
+    )
+    candidates, errors, tiers = await asyncio.to_thread(_triage_batch, saved, parsed, jd_data)
+
+    outcomes = await run_bounded_llm_async(
+        aanalyze_for_tier,
+        [(tier, resume_data, jd_data, match_results)
+         for tier, (_, resume_data, match_results) in zip(tiers, candidates)]
+    )
+    entries = (_batch_outcome(candidate, jd_data, tier, outcome, errors)
+               for candidate, tier, outcome in zip(candidates, tiers, outcomes))
+    return [entry for entry in entries if entry is not None], errors, summarize_tiers(tiers)
+
+def _triage_batch(saved, parsed, jd_data, on_error=None):
+    """Match every parsed resume against the JD and pick each one's
+    analysis tier; returns (candidates, errors, tiers)"""
+    # Deterministic matching is cheap, so it stays in-process
+    candidates = []
+    errors = []
+    for (resume_filename, _), outcome in zip(saved, parsed):
+        if not outcome['ok']:
+            print(f"Error processing {resume_filename}: {outcome['error']}")
+            errors.append({'filename': resume_filename, 'error': outcome['error']})
+            if on_error is not None:
+                on_error(errors[-1])
+            continue
+        resume_data = outcome['value']
+        index_candidate(resume_data, resume_filename)
+        match_results = calculate_skill_match(resume_data['skills'], jd_data['skills'])
+        candidates.append((resume_filename, resume_data, match_results))
+
+    if candidates:
+        semantic = semantic_scores([resume_data for _, resume_data, _ in candidates], jd_data)
+        for (_, _, match_results), score in zip(candidates, semantic):
+            match_results['semantic_score'] = float(score)
+
+    # Only candidates that clear the threshold (or lead the batch) get the full
+    # LLM evaluation; the triage score is the ATS score, optionally blended
+    # with the semantic score
+    weight = Config.SEMANTIC_TRIAGE_WEIGHT
+    tiers = assign_tiers(
+        [(1 - weight) * match_results['overall_score'] + weight * match_results['semantic_score']
+         for _, _, match_results in candidates],
+        Config.TRIAGE_MIN_SCORE, Config.TRIAGE_TOP_N, Config.TRIAGE_MODE
+    )
+    return candidates, errors, tiers
+
+def _batch_outcome(candidate, jd_data, tier, outcome, errors):
+    """The result row for one candidate's analysis outcome, or None after
+    appending its error to errors"""
+    if outcome['ok']:
+        return _batch_entry(candidate, jd_data, outcome['value'], tier)
+    print(f"Error analyzing {candidate[0]}: {outcome['error']}")
+    errors.append({'filename': candidate[0], 'error': outcome['error']})
+    return None
+
+def _batch_entry(candidate, jd_data, ai_analysis, tier):
+    """One batch result row"""
+    resume_filename, resume_data, match_results = candidate
+    return {
+        'filename': resume_filename,
+        'candidate_name': resume_data['contact']['name'],
+        'candidate_email': resume_data['contact']['email'],
+        'job_title': jd_data['title'],
+        'ats_score': match_results['overall_score'],
+        'semantic_score': match_results['semantic_score'],
+        'role_fit_score': ai_analysis['role_fit_score'],
+        'matched_skills_count': len(match_results['matched_flat']),
+        'missing_skills_count': len(match_results['missing_flat']),
+        'top_matched_skills': [s['skill'] for s in match_results['matched_flat'][:8]],
+        'top_missing_skills': [s['skill'] for s in match_results['missing_flat'][:8]],
+        'summary': ai_analysis.get('overall_fit', ''),
+        'analysis_tier': tier,
+        'resume_truncated': resume_data.get('parse_info', {}).get('truncated', False),
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+def run_job_matching(parsed, openings, k, llm_top):
+    """Rank every opening for every parsed resume (N resumes x M jobs).
+
+    parsed is a list of (display filename, resume_data) and openings an
+    OpeningSet. The whole (N, M) score matrix comes from one batched pass;
+    only each candidate's k best roles are matched in detail, and only the
+    llm_top best of those get an LLM evaluation (the rest a templated
+    summary). Returns (candidates, scores), candidates in input order.
+    """
+    with METRICS.stage('match_jobs'):
+        scores = openings.score([resume_data['skills'] for _, resume_data in parsed])
+    with METRICS.stage('semantic_score'):
+        semantic = similarity_scores(
+            openings.semantic, TermMatrix.from_texts([resume_data['raw_text'] for _, resume_data in parsed])
+        )
+
+    candidates = []
+    llm_pairs = []  # (candidate, rank, resume_data, jd_data, match_results)
+    for i, (resume_filename, resume_data) in enumerate(parsed):
+        matches = []
+        for rank, j in enumerate(top_k_rows(scores[i], k)):
+            jd_data = openings.jobs[j]
+            match_results = calculate_skill_match(resume_data['skills'], jd_data['skills'])
+            match_results['semantic_score'] = float(semantic[i, j])
+            if rank < llm_top:
+                llm_pairs.append((i, rank, resume_data, jd_data, match_results))
+            matches.append(_job_match_entry(jd_data, match_results, templated_analysis(match_results), TEMPLATE))
+        candidates.append({
+            'filename': resume_filename,
+            'candidate_name': resume_data['contact']['name'],
+            'candidate_email': resume_data['contact']['email'],
+            'matches': matches
+        })
+
+    # LLM calls are I/O-bound; run them concurrently under LLM_MAX_CONCURRENCY
+    outcomes = run_bounded_llm(analyze_with_ai, [pair[2:] for pair in llm_pairs])
+    for (i, rank, _, jd_data, match_results), outcome in zip(llm_pairs, outcomes):
+        if outcome['ok']:
+            candidates[i]['matches'][rank] = _job_match_entry(jd_data, match_results, outcome['value'], FULL)
+    return candidates, scores
+
+def _job_match_entry(jd_data, match_results, ai_analysis, tier):
+    """One role in a candidate's /match-jobs ranking"""
+    entry = {
+        'job_id': jd_data['job_id'],
+        'job_title': jd_data['title'],
+        'ats_score': match_results['overall_score'],
+        'semantic_score': match_results['semantic_score'],
+        'role_fit_score': ai_analysis['role_fit_score'],
+        'category_scores': match_results['category_scores'],
+        'matched_skills': [s['skill'] for s in match_results['matched_flat']],
+        'missing_skills': [s['skill'] for s in match_results['missing_flat']],
+        'summary': ai_analysis.get('overall_fit', ''),
+        'analysis_tier': tier
+    }
+    if tier == FULL:
+        entry['ai_analysis'] = ai_analysis
+    return entry
+
+def _analyze_job(payload, report):
+    jd_data = load_job_description(payload.get('jd_path'), payload.get('jd_text', ''))
+    return run_single_analysis(payload['resume_path'], jd_data, payload.get('resume_filename'))
+
+def _analyze_multi_job(payload, report):
+    jd_data = load_job_description(payload.get('jd_path'), payload.get('jd_text', ''))
+
+    def on_result(entry, completed, total):
+        report([entry], completed, total)
+
+    saved = [tuple(item) for item in payload['resumes']]
+    batch_results, errors, triage = run_multi_analysis(saved, jd_data, on_result=on_result)
+    return {'count': len(batch_results), 'results': batch_results, 'errors': errors, 'triage': triage}
+
+def _cleanup_job_files(job):
+    payload = job['payload']
+    paths = [payload.get('resume_path'), payload.get('jd_path')]
+    paths += [path for _, path in payload.get('resumes', [])]
+    _remove_files(paths)
+
+JOB_QUEUE = JobQueue(
+    os.path.join(app.config['UPLOAD_FOLDER'], 'jobs.sqlite3'),
+    lease_seconds=Config.JOB_LEASE_SECONDS,
+    retention_seconds=Config.JOB_RETENTION_SECONDS
+)
+JOB_WORKERS = JobWorkerPool(
+    JOB_QUEUE,
+    {'analyze': _analyze_job, 'analyze-multi': _analyze_multi_job},
+    workers=Config.JOB_WORKERS,
+    poll_interval=Config.JOB_POLL_INTERVAL,
+    on_finish=_cleanup_job_files
+)
+
 # ============================================================================
 # FLASK ROUTES
 # ============================================================================
 
+_result_writes = 0
+
+def save_result(name, value):
+    """Store a result server-side under this browser session's id"""
+    global _result_writes
+    if 'sid' not in session:
+        session['sid'] = uuid.uuid4().hex
+    RESULT_STORE.set(f"{session['sid']}:{name}", value, Config.PERMANENT_SESSION_LIFETIME)
+
+    # Expired results are dropped lazily on read; sweep the rest now and then
+    _result_writes += 1
+    if _result_writes % 200 == 0:
+        RESULT_STORE.purge_expired()
+
+def load_result(name):
+    """Fetch a result stored by save_result, or None if missing/expired"""
+    sid = session.get('sid')
+    if not sid:
+        return None
+    return RESULT_STORE.get(f"{sid}:{name}")
+
+def _save_upload(file):
+    """Save an upload under a unique name; returns (display filename, path).
+
+    Only background jobs need this: their payload must outlive the request
+    and may be picked up by another process.
+    """
+    filename = secure_filename(file.filename)
+    file_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{uuid.uuid4().hex}_{filename}")
+    file.save(file_path)
+    return filename, file_path
+
+def _buffer_uploads(files):
+    """Read uploads into memory (oversized ones spill to a temp file)"""
+    return [UploadBuffer.from_upload(f, Config.UPLOAD_MEMORY_LIMIT) for f in files if f and f.filename]
+
+def _close_uploads(buffers):
+    for buffer in buffers:
+        buffer.close()
+
+def _int_param(values, name, default, low, high):
+    """values[name] as an int clamped to [low, high]; None if it is not an integer"""
+    try:
+        return max(low, min(int(values.get(name, default)), high))
+    except (TypeError, ValueError):
+        return None
+
+def _jd_upload(jd_file):
+    """(stream, filename) for an uploaded JD file, or (None, None)"""
+    if jd_file and jd_file.filename:
+        return jd_file.stream, secure_filename(jd_file.filename)
+    return None, None
+
+def _jd_form():
+    """load_job_description() arguments from the request's JD upload or pasted text"""
+    jd_source, jd_filename = _jd_upload(request.files.get('jd_file'))
+    return jd_source, request.form.get('jd_text', ''), jd_filename
+
+def _single_response(complete_analysis):
+    """Store a single analysis for the results page and chatbot, and return it"""
+    save_result('analysis', complete_analysis)
+    return jsonify(complete_analysis)
+
+def _multi_response(batch_results, errors, triage):
+    """Store batch results for the results page, and return them"""
+    save_result('batch_results', batch_results)
+    return jsonify({'count': len(batch_results), 'results': batch_results, 'errors': errors, 'triage': triage})
+
 @app.route('/')
 def index():
     """Home page with upload interface"""
@@ -350,71 +1291,16 @@ def index():
 def analyze():
     """Main analysis endpoint"""
     try:
-        # Get uploaded files
         resume_file = request.files.get('resume')
-        jd_file = request.files.get('jd_file')
-        jd_text = request.form.get('jd_text', '')
-        
         if not resume_file:
             return jsonify({'error': 'No resume uploaded'}), 400
-        
-        # Save resume file
-        resume_filename = secure_filename(resume_file.filename)
-        resume_path = os.path.join(app.config['UPLOAD_FOLDER'], resume_filename)
-        resume_file.save(resume_path)
-        
-        # Parse resume
-        resume_data = parse_resume(resume_path)
-        
-        # Parse job description
-        if jd_file:
-            jd_filename = secure_filename(jd_file.filename)
-            jd_path = os.path.join(app.config['UPLOAD_FOLDER'], jd_filename)
-            jd_file.save(jd_path)
-            jd_data = parse_job_description(file_path=jd_path)
-        else:
-            jd_data = parse_job_description(text=jd_text)
-        
-        # Perform ATS matching
-        match_results = calculate_skill_match(resume_data['skills'], jd_data['skills'])
-        
-        # Perform AI analysis
-        ai_analysis = analyze_with_ai(resume_data, jd_data, match_results)
-        
-        # Prepare complete analysis for session
-        complete_analysis = {
-            'candidate_name': resume_data['contact']['name'],
-            'candidate_email': resume_data['contact']['email'],
-            'candidate_phone': resume_data['contact']['phone'],
-            'candidate_linkedin': resume_data['contact']['linkedin'],
-            'candidate_github': resume_data['contact']['github'],
-            'job_title': jd_data['title'],
-            'ats_score': match_results['overall_score'],
-            'role_fit_score': ai_analysis['role_fit_score'],
-            'category_scores': match_results['category_scores'],
-            'matched_skills': [s['skill'] for s in match_results['matched_flat']],
-            'missing_skills': [s['skill'] for s in match_results['missing_flat']],
-            'matched_skills_detailed': match_results['matched_flat'],
-            'missing_skills_detailed': match_results['missing_flat'],
-            'ai_analysis': ai_analysis,
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }
-        
-        # Store in session for chatbot
-        session['analysis'] = complete_analysis
-        
-        # Clean up uploaded files
-        try:
-            os.remove(resume_path)
-        except Exception:
-            pass
-        if jd_file:
-            try:
-                os.remove(jd_path)
-            except Exception:
-                pass
-        
-        return jsonify(complete_analysis)
+
+        # Parse straight from the upload streams; nothing is written to disk
+        jd_data = load_job_description(*_jd_form())
+        complete_analysis = run_single_analysis(
+            resume_file.stream, jd_data, secure_filename(resume_file.filename)
+        )
+        return _single_response(complete_analysis)
         
     except Exception as e:
         print(f"Analysis Error: {e}")
@@ -427,78 +1313,341 @@ def analyze_multi():
     """Analyze multiple resumes against one job description (batch UI)."""
     try:
         resume_files = request.files.getlist('resumes')
-        jd_file = request.files.get('jd_file')
-        jd_text = request.form.get('jd_text', '')
-
         if not resume_files:
             return jsonify({'error': 'No resumes uploaded'}), 400
 
-        # Parse job description once
-        if jd_file and jd_file.filename:
-            jd_filename = secure_filename(jd_file.filename)
-            jd_path = os.path.join(app.config['UPLOAD_FOLDER'], jd_filename)
-            jd_file.save(jd_path)
-            jd_data = parse_job_description(file_path=jd_path)
-        else:
-            jd_data = parse_job_description(text=jd_text)
+        # Buffer every upload first so the whole batch can be parsed in parallel
+        buffers = _buffer_uploads(resume_files)
+        try:
+            # Parse job description once
+            jd_data = load_job_description(*_jd_form())
+            batch_results, errors, triage = run_multi_analysis([(b.filename, b.source) for b in buffers], jd_data)
+        finally:
+            _close_uploads(buffers)
+        return _multi_response(batch_results, errors, triage)
 
-        batch_results = []
-        for resume_file in resume_files:
-            if not resume_file or not resume_file.filename:
-                continue
+    except Exception as e:
+        print(f"Batch UI Analysis Error: {e}")
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
 
-            resume_filename = secure_filename(resume_file.filename)
-            resume_path = os.path.join(app.config['UPLOAD_FOLDER'], resume_filename)
-            resume_file.save(resume_path)
 
+# ----------------------------------------------------------------------------
+# Asynchronous jobs: submit returns immediately, clients poll or stream status
+# ----------------------------------------------------------------------------
+
+def _sse(event, payload):
+    """Format one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+def _job_links(job_id):
+    return {
+        'job_id': job_id,
+        'status_url': url_for('job_status', job_id=job_id),
+        'events_url': url_for('job_events', job_id=job_id)
+    }
+
+@app.before_request
+def _start_job_workers():
+    JOB_WORKERS.start()
+
+@app.before_request
+def _start_request_timing():
+    g.request_started = time.perf_counter()
+    g.request_stages = METRICS.begin_request()
+
+@app.after_request
+def _add_server_timing(response):
+    """Per-stage timings for this request as a Server-Timing header, plus
+    the request histogram (streamed bodies: time to first byte)"""
+    started = g.pop('request_started', None)
+    if started is None:
+        return response
+    stages = METRICS.end_request(g.pop('request_stages', None))
+    total = time.perf_counter() - started
+    if Config.METRICS_ENABLED:
+        response.headers['Server-Timing'] = METRICS.server_timing(stages, total)
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        METRICS.observe('http_request_seconds', total, endpoint=endpoint, method=request.method)
+        METRICS.inc('http_requests_total', endpoint=endpoint, method=request.method, status=response.status_code)
+    return response
+
+@app.route('/jobs/analyze', methods=['POST'])
+def submit_analyze_job():
+    """Queue a single-resume analysis; same form fields as /analyze"""
+    resume_file = request.files.get('resume')
+    jd_file = request.files.get('jd_file')
+    jd_text = request.form.get('jd_text', '')
+
+    if not resume_file or not resume_file.filename:
+        return jsonify({'error': 'No resume uploaded'}), 400
+
+    resume_filename, resume_path = _save_upload(resume_file)
+    jd_path = _save_upload(jd_file)[1] if jd_file and jd_file.filename else None
+
+    job_id = JOB_QUEUE.submit('analyze', {
+        'resume_filename': resume_filename,
+        'resume_path': resume_path,
+        'jd_path': jd_path,
+        'jd_text': jd_text
+    }, total=1)
+    JOB_WORKERS.notify()
+    return jsonify(_job_links(job_id)), 202
+
+@app.route('/jobs/analyze-multi', methods=['POST'])
+def submit_analyze_multi_job():
+    """Queue a batch analysis; same form fields as /analyze-multi"""
+    resume_files = [f for f in request.files.getlist('resumes') if f and f.filename]
+    jd_file = request.files.get('jd_file')
+    jd_text = request.form.get('jd_text', '')
+
+    if not resume_files:
+        return jsonify({'error': 'No resumes uploaded'}), 400
+
+    jd_path = _save_upload(jd_file)[1] if jd_file and jd_file.filename else None
+    saved = [_save_upload(f) for f in resume_files]
+
+    job_id = JOB_QUEUE.submit('analyze-multi', {
+        'resumes': saved,
+        'jd_path': jd_path,
+        'jd_text': jd_text
+    }, total=len(saved))
+    JOB_WORKERS.notify()
+    return jsonify(_job_links(job_id)), 202
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    """Job status, progress and partial results; stores finished results for this session"""
+    job = JOB_QUEUE.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+
+    # Make the finished analysis available to /results and /chat
+    if job['status'] == 'done':
+        if job['kind'] == 'analyze':
+            save_result('analysis', job['result'])
+        elif job['kind'] == 'analyze-multi':
+            save_result('batch_results', job['result']['results'])
+
+    return jsonify(job)
+
+@app.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    """Server-sent events stream of job updates until the job finishes"""
+    if JOB_QUEUE.get(job_id) is None:
+        return jsonify({'error': 'Job not found'}), 404
+
+    def stream():
+        last_update = None
+        sent = 0
+        while True:
+            job = JOB_QUEUE.get(job_id, partials_from=sent)
+            if job is None:
+                return
+            if job['updated'] != last_update:
+                last_update = job['updated']
+                if job['kind'] == 'analyze-multi':
+                    # Send each batch result once as a 'result' event rather
+                    # than repeating the growing list in every update
+                    for entry in job.pop('partial_results'):
+                        yield _sse('result', entry)
+                        sent += 1
+                    if job['result']:
+                        job['result'] = {k: v for k, v in job['result'].items() if k != 'results'}
+                yield _sse(job['status'], job)
+            if job['status'] in TERMINAL_STATES:
+                return
+            time.sleep(Config.JOB_POLL_INTERVAL)
+
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.cli.command('worker')
+def run_worker():
+    """Process queued analysis jobs without serving HTTP (flask --app app worker)"""
+    JOB_WORKERS.workers = max(1, JOB_WORKERS.workers)
+    JOB_WORKERS.start()
+    print(f"Job worker running with {JOB_WORKERS.workers} thread(s)")
+    while True:
+        time.sleep(3600)
+
+
+# ----------------------------------------------------------------------------
+# Streaming batch results: each candidate is sent as soon as it finishes
+# ----------------------------------------------------------------------------
+
+def _ndjson(event, payload):
+    """Format one NDJSON line"""
+    return json.dumps({'event': event, 'data': payload}) + "\n"
+
+def _ranking_row(entry):
+    """Compact row for top-k snapshots"""
+    return {key: entry.get(key) for key in ('filename', 'candidate_name', 'name', 'ats_score', 'role_fit_score')
+            if key in entry}
+
+def _stream_events(produce):
+    """Stream what produce(emit) emits as SSE, or NDJSON for ?format=ndjson
+    or an Accept: application/x-ndjson header.
+
+    produce(emit, cancelled) runs in a background thread so the response
+    starts before the batch finishes; events are forwarded as they arrive
+    and not retained. cancelled is a threading.Event set when the client
+    disconnects.
+    """
+    ndjson = (request.args.get('format') == 'ndjson'
+              or 'application/x-ndjson' in request.headers.get('Accept', ''))
+    encode = _ndjson if ndjson else _sse
+    # Bounded, so a slow client holds the producer back instead of letting
+    # events pile up in memory
+    events = queue.Queue(maxsize=max(1, Config.STREAM_BUFFER_EVENTS))
+    cancelled = threading.Event()
+
+    def put(item):
+        while not cancelled.is_set():
             try:
-                resume_data = parse_resume(resume_path)
-                match_results = calculate_skill_match(resume_data['skills'], jd_data['skills'])
-                ai_analysis = analyze_with_ai(resume_data, jd_data, match_results)
-
-                batch_results.append({
-                    'filename': resume_filename,
-                    'candidate_name': resume_data['contact']['name'],
-                    'candidate_email': resume_data['contact']['email'],
-                    'job_title': jd_data['title'],
-                    'ats_score': match_results['overall_score'],
-                    'role_fit_score': ai_analysis['role_fit_score'],
-                    'matched_skills_count': len(match_results['matched_flat']),
-                    'missing_skills_count': len(match_results['missing_flat']),
-                    'top_matched_skills': [s['skill'] for s in match_results['matched_flat'][:8]],
-                    'top_missing_skills': [s['skill'] for s in match_results['missing_flat'][:8]],
-                    'summary': ai_analysis.get('overall_fit', ''),
-                    'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                })
-            finally:
-                # Clean up each resume
-                try:
-                    os.remove(resume_path)
-                except Exception:
-                    pass
-
-        # Clean up JD file
-        if jd_file and jd_file.filename:
-            try:
-                os.remove(jd_path)
-            except Exception:
-                pass
+                events.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def run():
+        try:
+            produce(lambda event, payload: put((event, payload)), cancelled)
+        except Exception as e:
+            print(f"Stream Error: {e}")
+            traceback.print_exc()
+            put(('error', {'error': str(e)}))
+        finally:
+            put(None)
+
+    threading.Thread(target=contextvars.copy_context().run, args=(run,), name='batch-stream', daemon=True).start()
+
+    def stream():
+        try:
+            while True:
+                item = events.get()
+                if item is None:
+                    return
+                yield encode(*item)
+        except GeneratorExit:
+            # The client disconnected: stop parsing and analysing for it
+            cancelled.set()
+            raise
+
+    return Response(stream(), mimetype='application/x-ndjson' if ndjson else 'text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def _live_ranking(emit, key):
+    """(LiveRanking, push) where push(entry, completed, total) records a
+    result and emits a re-ranked 'ranking' snapshot every
+    STREAM_SNAPSHOT_EVERY results"""
+    ranking = LiveRanking(Config.STREAM_TOP_K, key=key)
 
-        # Store in session for results page
-        session['batch_results'] = batch_results
+    def push(entry, completed, total):
+        ranking.push(_ranking_row(entry))
+        if completed % Config.STREAM_SNAPSHOT_EVERY == 0 and completed < total:
+            emit('ranking', {'completed': completed, 'total': total, 'top': ranking.snapshot()})
 
-        return jsonify({'count': len(batch_results), 'results': batch_results})
+    return ranking, push
 
+@app.route('/analyze-multi/stream', methods=['POST'])
+def analyze_multi_stream():
+    """/analyze-multi as a stream: a 'result' event per candidate as it
+    finishes, periodic 'ranking' top-k snapshots, then 'done'"""
+    resume_files = request.files.getlist('resumes')
+    jd_file = request.files.get('jd_file')
+    jd_text = request.form.get('jd_text', '')
+
+    if not resume_files:
+        return jsonify({'error': 'No resumes uploaded'}), 400
+
+    buffers = _buffer_uploads(resume_files)
+    try:
+        jd_source, jd_filename = _jd_upload(jd_file)
+        jd_data = load_job_description(jd_source, jd_text, jd_filename)
     except Exception as e:
-        print(f"Batch UI Analysis Error: {e}")
+        _close_uploads(buffers)
+        print(f"Batch Stream Error: {e}")
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
+    def produce(emit, cancelled):
+        ranking, push = _live_ranking(emit, key=lambda row: (row['ats_score'], row['role_fit_score']))
+
+        def on_result(entry, completed, total):
+            emit('result', dict(entry, completed=completed, total=total))
+            push(entry, completed, total)
+
+        try:
+            _, errors, triage = run_multi_analysis(
+                [(b.filename, b.source) for b in buffers], jd_data,
+                on_result=on_result, on_error=lambda error: emit('file_error', error), keep_results=False,
+                cancelled=cancelled
+            )
+        finally:
+            _close_uploads(buffers)
+        emit('done', {'count': ranking.count, 'error_count': len(errors), 'triage': triage, 'top': ranking.snapshot()})
+
+    return _stream_events(produce)
+
+@app.route('/batch/stream', methods=['POST'])
+def batch_analyze_stream():
+    """/batch as a stream: each candidate is sent as soon as it is parsed and
+    scored, with periodic 'ranking' top-k snapshots, then 'done'. With the
+    batch still arriving, semantic_score uses the candidate index's IDF, as
+    /analyze does, rather than /batch's IDF over the whole batch."""
+    files = request.files.getlist('resumes')
+    jd_text = request.form.get('jd_text', '')
+
+    if not files:
+        return jsonify({'error': 'No resumes uploaded'}), 400
+
+    jd_data = parse_job_description(text=jd_text)
+    buffers = _buffer_uploads(files)
+
+    def produce(emit, cancelled):
+        ranking, push = _live_ranking(emit, key=lambda row: row['ats_score'])
+        total = len(buffers)
+        completed = 0
+        error_count = 0
+
+        def on_parsed(i, outcome):
+            nonlocal completed, error_count
+            completed += 1
+            filename = buffers[i].filename
+            if not outcome['ok']:
+                error_count += 1
+                emit('file_error', {'filename': filename, 'error': outcome['error']})
+                return
+            resume_data = outcome['value']
+            index_candidate(resume_data, filename)
+            # The batch's pool is not known yet: score against the candidate
+            # index's IDF, as a single analysis is (None while it is small)
+            entry = dict(_batch_candidate(resume_data, jd_data, single_semantic_score(resume_data, jd_data)),
+                         filename=filename)
+            emit('result', dict(entry, completed=completed, total=total))
+            push(entry, completed, total)
+
+        try:
+            parse_resumes_cached([b.source for b in buffers], [b.filename for b in buffers], on_complete=on_parsed,
+                                 cancelled=cancelled)
+        finally:
+            _close_uploads(buffers)
+        emit('done', {'count': ranking.count, 'error_count': error_count, 'top': ranking.snapshot()})
+
+    return _stream_events(produce)
+
 
 @app.route('/results-batch')
 def results_batch():
-    """Batch results page"""
-    results = session.get('batch_results')
+    """Batch results page; with ?job=<id> the table fills in live as the job runs"""
+    job_id = request.args.get('job')
+    if job_id:
+        if JOB_QUEUE.get(job_id) is None:
+            return redirect(url_for('index'))
+        return render_template('results_batch.html', results=[], job=_job_links(job_id))
+
+    results = load_result('batch_results')
     if not results:
         return redirect(url_for('index'))
     return render_template('results_batch.html', results=results)
@@ -506,29 +1655,15 @@ def results_batch():
 @app.route('/results')
 def results():
     """Results page with visualizations"""
-    analysis = session.get('analysis')
+    analysis = load_result('analysis')
     if not analysis:
         return redirect(url_for('index'))
     
     return render_template('results.html', analysis=analysis)
 
-@app.route('/chat', methods=['POST'])
-def chat():
-    """Chatbot endpoint - Direct LLM invocation (Python 3.13 compatible)"""
-    try:
-        data = request.json
-        user_message = data.get('message', '')
-        
-        analysis = session.get('analysis')
-        if not analysis:
-            return jsonify({'error': 'No analysis found'}), 400
-        
-        # Mark chatbot as initialized
-        if 'chatbot_initialized' not in session:
-            session['chatbot_initialized'] = True
-        
-        # Build prompt directly (no deprecated chains/memory)
-        chatbot_prompt = f"""You are ResumeIQ Pro's friendly in-app assistant.
+def build_chat_prompt(user_message, analysis):
+    """Chatbot prompt grounded in the stored analysis"""
+    return f"""You are ResumeIQ Pro's friendly in-app assistant.
 
 Goal: Help the user understand the resume analysis and next steps. Speak like a helpful product coach (not a generic LLM).
 Style rules:
@@ -552,16 +1687,113 @@ Analysis context:
 
 Answer now."""
 
-        # Direct LLM invocation (Python 3.13 safe)
-        response = llm.invoke(chatbot_prompt)
+@app.route('/chat', methods=['POST'])
+def chat():
+    """Chatbot endpoint - Direct LLM invocation (Python 3.13 compatible)"""
+    try:
+        chatbot_prompt = _chat_prompt()
+        if chatbot_prompt is None:
+            return jsonify({'error': 'No analysis found'}), 400
+
+        # Direct LLM invocation (Python 3.13 safe), cached per prompt
+        with METRICS.stage('chat'):
+            response = LLM_CACHE.invoke(llm, chatbot_prompt)
         bot_message = response.content
         
         return jsonify({'response': bot_message})
         
     except Exception as e:
-        print(f"Chat Error: {e}")
-        traceback.print_exc()
-        return jsonify({'error': 'Failed to get response'}), 500
+        return _chat_error(e)
+
+def _chat_prompt():
+    """Prompt for this request's chat message about the stored analysis, or
+    None if there is no analysis yet"""
+    analysis = load_result('analysis')
+    if not analysis:
+        return None
+
+    # Mark chatbot as initialized (streaming callers: before the body starts)
+    if 'chatbot_initialized' not in session:
+        session['chatbot_initialized'] = True
+
+    # Build prompt directly (no deprecated chains/memory)
+    return build_chat_prompt((request.json or {}).get('message', ''), analysis)
+
+def _chat_error(e):
+    """Error response for a failed chat turn (503 while the LLM is unavailable)"""
+    print(f"Chat Error: {e}")
+    METRICS.inc('errors_total', stage='chat')
+    if isinstance(e, LLMUnavailable):
+        return jsonify({'error': 'The AI assistant is temporarily unavailable, please try again shortly'}), 503
+    traceback.print_exc()
+    return jsonify({'error': 'Failed to get response'}), 500
+
+@app.route('/chat/stream', methods=['POST'])
+def chat_stream():
+    """Chatbot endpoint that relays tokens as server-sent events as they arrive"""
+    chatbot_prompt = _chat_prompt()
+    if chatbot_prompt is None:
+        return jsonify({'error': 'No analysis found'}), 400
+    chat_llm = llm
+
+    def stream():
+        start = time.perf_counter()
+        first_token_at = None
+        cached = None
+        try:
+            cached = LLM_CACHE.peek(chat_llm, chatbot_prompt)
+            if cached is not None:
+                chunks = [cached.content]
+            else:
+                chunks = (chunk.content for chunk in chat_llm.stream(chatbot_prompt))
+
+            parts = []
+            for text in chunks:
+                if not text:
+                    continue
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
+                parts.append(text)
+                yield _sse('token', {'text': text})
+
+            if cached is None:
+                from langchain_core.messages import AIMessage  # loaded by the stream call already
+                LLM_CACHE.store(chat_llm, chatbot_prompt, AIMessage(content=''.join(parts)))
+
+            total = time.perf_counter() - start
+            ttft = (first_token_at or time.perf_counter()) - start
+            METRICS.observe('chat_stream_ttft_seconds', ttft, cached=cached is not None)
+            METRICS.observe('chat_stream_seconds', total, cached=cached is not None)
+            yield _sse('done', {
+                'ttft_ms': round(ttft * 1000, 1),
+                'total_ms': round(total * 1000, 1),
+                'cached': cached is not None
+            })
+        except LLMUnavailable as e:
+            print(f"Chat Stream Error: {e}")
+            METRICS.inc('errors_total', stage='chat_stream')
+            yield _sse('error', {'error': 'The AI assistant is temporarily unavailable, please try again shortly'})
+        except Exception as e:
+            print(f"Chat Stream Error: {e}")
+            traceback.print_exc()
+            METRICS.inc('errors_total', stage='chat_stream')
+            yield _sse('error', {'error': 'Failed to get response'})
+
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def _batch_candidate(resume_data, jd_data, semantic_score):
+    """One /batch result row (deterministic ATS match and semantic score only)"""
+    match_results = calculate_skill_match(resume_data['skills'], jd_data['skills'])
+    return {
+        'name': resume_data['contact']['name'],
+        'email': resume_data['contact']['email'],
+        'ats_score': match_results['overall_score'],
+        'semantic_score': None if semantic_score is None else float(semantic_score),
+        'matched_count': len(match_results['matched_flat']),
+        'missing_count': len(match_results['missing_flat']),
+        'top_skills': [s['skill'] for s in match_results['matched_flat'][:3]]
+    }
 
 @app.route('/batch', methods=['POST'])
 def batch_analyze():
@@ -576,36 +1808,27 @@ def batch_analyze():
         # Parse JD once
         jd_data = parse_job_description(text=jd_text)
         
-        results = []
-        
-        for file in files:
-            try:
-                # Save and parse resume
-                filename = secure_filename(file.filename)
-                file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-                file.save(file_path)
-                
-                resume_data = parse_resume(file_path)
-                match_results = calculate_skill_match(resume_data['skills'], jd_data['skills'])
-                
-                results.append({
-                    'name': resume_data['contact']['name'],
-                    'email': resume_data['contact']['email'],
-                    'ats_score': match_results['overall_score'],
-                    'matched_count': len(match_results['matched_flat']),
-                    'missing_count': len(match_results['missing_flat']),
-                    'top_skills': [s['skill'] for s in match_results['matched_flat'][:3]]
-                })
-                
-                try:
-                    os.remove(file_path)
-                except Exception:
-                    pass
-                
-            except Exception as e:
-                print(f"Error processing {filename}: {e}")
+        # Buffer all uploads, then parse them in parallel
+        buffers = _buffer_uploads(files)
+        try:
+            parsed = parse_resumes_cached([b.source for b in buffers], [b.filename for b in buffers])
+        finally:
+            _close_uploads(buffers)
+
+        resumes = []
+
+        for filename, outcome in zip([b.filename for b in buffers], parsed):
+            if not outcome['ok']:
+                print(f"Error processing {filename}: {outcome['error']}")
                 continue
-        
+
+            resume_data = outcome['value']
+            index_candidate(resume_data, filename)
+            resumes.append(resume_data)
+
+        semantic = semantic_scores(resumes, jd_data) if resumes else []
+        results = [_batch_candidate(resume_data, jd_data, score) for resume_data, score in zip(resumes, semantic)]
+
         # Sort by ATS score
         results.sort(key=lambda x: x['ats_score'], reverse=True)
         
@@ -616,5 +1839,223 @@ def batch_analyze():
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
+# ----------------------------------------------------------------------------
+# Candidate index: rank the stored talent pool against a new JD
+# ----------------------------------------------------------------------------
+
+@app.route('/candidates', methods=['POST'])
+def add_candidates():
+    """Parse resumes and add them to the candidate index"""
+    try:
+        files = [f for f in request.files.getlist('resumes') if f and f.filename]
+        if not files:
+            return jsonify({'error': 'No resumes uploaded'}), 400
+
+        buffers = _buffer_uploads(files)
+        try:
+            parsed = parse_resumes_cached([b.source for b in buffers], [b.filename for b in buffers])
+        finally:
+            _close_uploads(buffers)
+
+        expire_candidates()
+        added = []
+        errors = []
+        for filename, outcome in zip([b.filename for b in buffers], parsed):
+            if not outcome['ok']:
+                errors.append({'filename': filename, 'error': outcome['error']})
+                continue
+            resume_data = outcome['value']
+            row = CANDIDATE_INDEX.add(resume_data['content_hash'], resume_data, filename=filename)
+            added.append({'candidate_id': row, 'filename': filename, 'name': resume_data['contact']['name']})
+
+        return jsonify({'added': added, 'errors': errors, 'total_candidates': CANDIDATE_INDEX.count()})
+
+    except Exception as e:
+        print(f"Candidate Index Error: {e}")
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/candidates/<int:candidate_id>', methods=['DELETE'])
+def remove_candidate(candidate_id):
+    """Remove a candidate from the index"""
+    if not CANDIDATE_INDEX.remove(candidate_id):
+        return jsonify({'error': 'Candidate not found'}), 404
+    return jsonify({'removed': candidate_id, 'total_candidates': CANDIDATE_INDEX.count()})
+
+@app.route('/search', methods=['POST'])
+def search_candidates():
+    """Rank every indexed candidate against a JD without re-parsing any resume"""
+    try:
+        jd_file = request.files.get('jd_file')
+        jd_text = request.form.get('jd_text') or (request.get_json(silent=True) or {}).get('jd_text', '')
+        k = _int_param(request.values, 'k', 20, 1, 500)
+        if k is None:
+            return jsonify({'error': 'k must be an integer'}), 400
+        rank_by = request.values.get('rank_by', 'ats')
+        if rank_by not in ('ats', 'semantic'):
+            return jsonify({'error': "rank_by must be 'ats' or 'semantic'"}), 400
+
+        jd_source, jd_filename = _jd_upload(jd_file)
+        jd_data = load_job_description(jd_source, jd_text, jd_filename)
+
+        # Rows encoded with an older taxonomy must be re-extracted first;
+        # that runs in the background rather than inside this request
+        if CANDIDATE_INDEX.is_stale:
+            rebuild_candidate_index()
+            return _rebuilding('candidate index')
+
+        expire_candidates()
+        results = CANDIDATE_INDEX.search(jd_data['skills'], k=k, jd_text=jd_data['text'], rank_by=rank_by)
+        return jsonify({
+            'job_title': jd_data['title'],
+            'total_candidates': CANDIDATE_INDEX.count(),
+            'results': results
+        })
+
+    except Exception as e:
+        print(f"Search Error: {e}")
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
+# ----------------------------------------------------------------------------
+# Job openings: rank the open roles for one or many candidates
+# ----------------------------------------------------------------------------
+
+def _parse_openings(jobs):
+    """Parsed JDs, each with a job_id, for [{'id', 'title' (optional), 'text'}]"""
+    openings = []
+    for position, job in enumerate(jobs):
+        jd_data = parse_job_description(text=job.get('text', ''))
+        jd_data['job_id'] = str(job.get('id', position))
+        if job.get('title'):
+            jd_data['title'] = job['title']
+        openings.append(jd_data)
+    return openings
+
+@app.route('/openings', methods=['GET'])
+def list_openings():
+    """Job openings in the catalog"""
+    return jsonify({'openings': JOB_CATALOG.list(), 'total_jobs': JOB_CATALOG.count()})
+
+@app.route('/openings', methods=['POST'])
+def add_openings():
+    """Add or replace job openings: a JSON {'jobs': [{'id', 'title', 'text'}]}
+    body or 'jobs' form field, and/or JD files ('jd_files', id = file name)"""
+    try:
+        payload = request.get_json(silent=True) or {}
+        jobs = payload.get('jobs') or json.loads(request.form.get('jobs') or '[]')
+        openings = _parse_openings(jobs)
+        for jd_file in request.files.getlist('jd_files'):
+            jd_source, jd_filename = _jd_upload(jd_file)
+            if jd_source is None:
+                continue
+            jd_data = load_job_description(jd_source, jd_filename=jd_filename)
+            jd_data['job_id'] = os.path.splitext(jd_filename)[0]
+            openings.append(jd_data)
+        if not openings:
+            return jsonify({'error': 'No job openings given'}), 400
+
+        for jd_data in openings:
+            JOB_CATALOG.put(jd_data['job_id'], jd_data)
+        return jsonify({
+            'added': [{'job_id': jd_data['job_id'], 'title': jd_data['title']} for jd_data in openings],
+            'total_jobs': JOB_CATALOG.count()
+        })
+
+    except Exception as e:
+        print(f"Openings Error: {e}")
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/openings/<job_id>', methods=['DELETE'])
+def remove_opening(job_id):
+    """Remove a job opening from the catalog"""
+    if not JOB_CATALOG.remove(job_id):
+        return jsonify({'error': 'Job opening not found'}), 404
+    return jsonify({'removed': job_id, 'total_jobs': JOB_CATALOG.count()})
+
+@app.route('/match-jobs', methods=['POST'])
+def match_jobs():
+    """Rank job openings for one or more resumes (N resumes x M jobs).
+
+    Matches against the catalog (/openings) unless the request sends its
+    own openings as a 'jobs' JSON form field. Form fields: k (roles per
+    candidate), llm_top (how many of them get an LLM evaluation) and
+    include_matrix (also return every candidate's score for every job).
+    """
+    try:
+        files = [f for f in request.files.getlist('resumes') + request.files.getlist('resume') if f and f.filename]
+        if not files:
+            return jsonify({'error': 'No resumes uploaded'}), 400
+        k = _int_param(request.form, 'k', Config.MATCH_JOBS_TOP_K, 1, 50)
+        if k is None:
+            return jsonify({'error': 'k must be an integer'}), 400
+        llm_top = _int_param(request.form, 'llm_top', Config.MATCH_JOBS_LLM_TOP, 0, k)
+        if llm_top is None:
+            return jsonify({'error': 'llm_top must be an integer'}), 400
+
+        if request.form.get('jobs'):
+            openings = OpeningSet(TAXONOMY.current().vocabulary, _parse_openings(json.loads(request.form['jobs'])))
+        else:
+            # Openings parsed with an older taxonomy must be re-extracted
+            # first; that runs in the background rather than inside this request
+            if JOB_CATALOG.is_stale:
+                rebuild_job_catalog()
+                return _rebuilding('job catalog')
+            openings = JOB_CATALOG.snapshot()
+        if not len(openings):
+            return jsonify({'error': 'No job openings: add them via /openings or send a jobs field'}), 400
+
+        buffers = _buffer_uploads(files)
+        try:
+            outcomes = parse_resumes_cached([b.source for b in buffers], [b.filename for b in buffers])
+        finally:
+            _close_uploads(buffers)
+
+        parsed = []
+        errors = []
+        for filename, outcome in zip([b.filename for b in buffers], outcomes):
+            if not outcome['ok']:
+                print(f"Error processing {filename}: {outcome['error']}")
+                errors.append({'filename': filename, 'error': outcome['error']})
+                continue
+            index_candidate(outcome['value'], filename)
+            parsed.append((filename, outcome['value']))
+
+        candidates, scores = run_job_matching(parsed, openings, k, llm_top)
+        response = {
+            'total_jobs': len(openings),
+            'count': len(candidates),
+            'candidates': candidates,
+            'errors': errors,
+            'llm_calls': sum(m['analysis_tier'] == FULL for c in candidates for m in c['matches'])
+        }
+        if request.form.get('include_matrix', '').lower() == 'true':
+            response['job_ids'] = [jd_data['job_id'] for jd_data in openings.jobs]
+            response['scores'] = scores.tolist()
+        return jsonify(response)
+
+    except Exception as e:
+        print(f"Job Matching Error: {e}")
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/cache-stats')
+def cache_stats():
+    """Hit/miss metrics for the server-side caches"""
+    TAXONOMY.current()
+    return jsonify({
+        'parse_cache': PARSE_CACHE.stats(),
+        'llm_cache': LLM_CACHE.stats(),
+        'llm_gateway': LLM_GATEWAY.stats(),
+        'taxonomy': TAXONOMY.stats()
+    })
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus scrape endpoint (text exposition format)"""
+    TAXONOMY.current()
+    return Response(METRICS.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -0,0 +1,247 @@
+"""ASGI entry point: the Flask app with async views for the LLM-bound endpoints
+
+    gunicorn -k asgi -w 2 asgi:application
+
+POST /analyze, /analyze-multi and /chat run as coroutines on the worker's
+event loop: multipart parsing, upload buffering, resume parsing and
+result-store reads and writes go to threads (and the parser sandbox for
+batches) and Groq is awaited through LLMResponseCache.ainvoke, so one
+worker process keeps many analyses in flight while they wait on the LLM.
+These views run inside a normal Flask request context, so sessions,
+before/after_request hooks (metrics, Server-Timing) and the result store
+behave exactly as in the sync views.
+
+Request bodies are read here and turned into a WSGI environ by asgiref's
+WSGI adapter. Every other route is the unchanged WSGI app, run on a
+thread pool (ASGI_WSGI_THREADS) with its body relayed chunk by chunk, so
+SSE and NDJSON streams keep streaming. asgiref's WsgiToAsgi is not used
+for that part: it runs every request on one shared thread, so a single
+open stream would hold up every other route, and it never closes the
+response, so a stream would not notice its client leaving.
+"""
+import asyncio
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.wsgi import WsgiToAsgiInstance
+from flask import jsonify, request
+from werkzeug.utils import secure_filename
+
+from app import (
+    LLM_CACHE, METRICS, _buffer_uploads, _chat_error, _chat_prompt, _close_uploads, _jd_form, _multi_response,
+    _single_response, app, arun_multi_analysis, arun_single_analysis, llm, load_job_description
+)
+from config import Config
+
+_wsgi_pool = ThreadPoolExecutor(max_workers=Config.ASGI_WSGI_THREADS, thread_name_prefix='wsgi')
+
+
+# ----------------------------------------------------------------------------
+# Async views (same request/response contract as their sync twins in app.py)
+# ----------------------------------------------------------------------------
+# Flask's request context lives in contextvars, which asyncio.to_thread
+# copies, so request and session work the same inside those threads.
+
+def _parse_form():
+    """request.files, parsing the multipart body first: a blocking read that
+    spools large files to disk. request.form and files are cached after it."""
+    return request.files
+
+
+async def analyze():
+    """Main analysis endpoint"""
+    try:
+        files = await asyncio.to_thread(_parse_form)
+        resume_file = files.get('resume')
+        if not resume_file:
+            return jsonify({'error': 'No resume uploaded'}), 400
+
+        jd_data = await asyncio.to_thread(load_job_description, *_jd_form())
+        complete_analysis = await arun_single_analysis(
+            resume_file.stream, jd_data, secure_filename(resume_file.filename)
+        )
+        return await asyncio.to_thread(_single_response, complete_analysis)
+
+    except Exception as e:
+        print(f"Analysis Error: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+async def analyze_multi():
+    """Analyze multiple resumes against one job description (batch UI)"""
+    try:
+        files = await asyncio.to_thread(_parse_form)
+        resume_files = files.getlist('resumes')
+        if not resume_files:
+            return jsonify({'error': 'No resumes uploaded'}), 400
+
+        buffers = await asyncio.to_thread(_buffer_uploads, resume_files)
+        try:
+            jd_data = await asyncio.to_thread(load_job_description, *_jd_form())
+            batch_results, errors, triage = await arun_multi_analysis(
+                [(b.filename, b.source) for b in buffers], jd_data
+            )
+        finally:
+            await asyncio.to_thread(_close_uploads, buffers)
+        return await asyncio.to_thread(_multi_response, batch_results, errors, triage)
+
+    except Exception as e:
+        print(f"Batch UI Analysis Error: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+async def chat():
+    """Chatbot endpoint"""
+    try:
+        chatbot_prompt = await asyncio.to_thread(_chat_prompt)
+        if chatbot_prompt is None:
+            return jsonify({'error': 'No analysis found'}), 400
+
+        with METRICS.stage('chat'):
+            response = await LLM_CACHE.ainvoke(llm, chatbot_prompt)
+
+        return jsonify({'response': response.content})
+
+    except Exception as e:
+        return _chat_error(e)
+
+
+ASYNC_VIEWS = {
+    ('POST', '/analyze'): analyze,
+    ('POST', '/analyze-multi'): analyze_multi,
+    ('POST', '/chat'): chat,
+}
+
+
+# ----------------------------------------------------------------------------
+# ASGI plumbing
+# ----------------------------------------------------------------------------
+
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        return await _lifespan(receive, send)
+    if scope['type'] != 'http':
+        return
+
+    body = await _read_body(receive)
+    if body is None:  # client left before sending the whole request
+        return
+    try:
+        try:
+            environ = _environ(scope, body)
+        except ValueError as e:  # asgiref refuses floods of duplicate headers
+            await send({'type': 'http.response.start', 'status': 400,
+                        'headers': [(b'content-type', b'text/plain; charset=utf-8')]})
+            await send({'type': 'http.response.body', 'body': str(e).encode('utf-8')})
+            return
+        view = ASYNC_VIEWS.get((scope['method'], environ['PATH_INFO']))
+        if view is None:
+            await _run_wsgi(environ, send)
+        else:
+            await _run_async_view(view, environ, send)
+    finally:
+        body.close()
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            _wsgi_pool.shutdown(wait=False)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def _read_body(receive):
+    """Request body, spilled to a temp file past UPLOAD_MEMORY_LIMIT, or None
+    if the client disconnected first (a truncated body is never dispatched).
+    Reading stops one byte past MAX_CONTENT_LENGTH; Flask then answers 413."""
+    body = tempfile.SpooledTemporaryFile(max_size=Config.UPLOAD_MEMORY_LIMIT, prefix='resumeiq-')
+    limit = app.config.get('MAX_CONTENT_LENGTH')
+    size = 0
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            body.close()
+            return None
+        chunk = message.get('body', b'')
+        body.write(chunk)
+        size += len(chunk)
+        if not message.get('more_body') or (limit and size > limit):
+            break
+    body.seek(0)
+    return body
+
+
+def _environ(scope, body):
+    """WSGI environ for an ASGI HTTP scope (asgiref's translation)"""
+    adapter = WsgiToAsgiInstance(app)
+    adapter.scope = scope
+    return adapter.build_environ(scope, body)
+
+
+def _headers(header_items):
+    return [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in header_items]
+
+
+async def _run_async_view(view, environ, send):
+    """Dispatch a coroutine view the way Flask's full_dispatch_request does"""
+    with app.request_context(environ):
+        try:
+            try:
+                rv = app.preprocess_request()
+                if rv is None:
+                    rv = await view()
+            except Exception as e:
+                rv = app.handle_user_exception(e)
+            response = app.finalize_request(rv)
+        except Exception as e:
+            response = app.handle_exception(e)
+        body = response.get_data()
+
+    await send({'type': 'http.response.start', 'status': response.status_code,
+                'headers': _headers(response.headers.items())})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def _run_wsgi(environ, send):
+    """Run the WSGI app on the thread pool and relay its output as it is produced"""
+    loop = asyncio.get_running_loop()
+    messages = asyncio.Queue()
+    disconnected = threading.Event()
+
+    def put(message):
+        loop.call_soon_threadsafe(messages.put_nowait, message)
+
+    def start_response(status, headers, exc_info=None):
+        put({'type': 'http.response.start', 'status': int(status.split(' ', 1)[0]), 'headers': _headers(headers)})
+        return lambda data: put({'type': 'http.response.body', 'body': data, 'more_body': True})
+
+    def run():
+        try:
+            result = app(environ, start_response)
+            try:
+                for chunk in result:
+                    if disconnected.is_set():
+                        break
+                    if chunk:
+                        put({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            finally:
+                if hasattr(result, 'close'):
+                    result.close()
+        finally:
+            put(None)
+
+    worker = loop.run_in_executor(_wsgi_pool, run)
+    try:
+        while (message := await messages.get()) is not None:
+            await send(message)
+        await send({'type': 'http.response.body', 'body': b''})
+    finally:
+        # Client gone (or done): let a streaming body stop at its next chunk
+        disconnected.set()
+    await worker
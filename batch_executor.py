@@ -0,0 +1,206 @@
+"""Parallel execution helpers for the multi-resume endpoints"""
+import asyncio
+import contextvars
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from config import Config
+
+_process_pool = None
+_sandbox_threads = None
+_llm_pool = None
+_llm_semaphores = weakref.WeakKeyDictionary()  # event loop -> asyncio.Semaphore
+_pool_lock = threading.Lock()
+
+
+def get_process_pool():
+    """Lazily create the shared process pool used for CPU-bound parsing"""
+    global _process_pool
+    if Config.BATCH_PARSE_WORKERS <= 0:
+        return None
+    with _pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(max_workers=Config.BATCH_PARSE_WORKERS)
+        return _process_pool
+
+
+def get_sandbox_threads(size):
+    """Lazily create the shared threads that hand documents to a parser sandbox of `size` workers"""
+    global _sandbox_threads
+    with _pool_lock:
+        if _sandbox_threads is None:
+            _sandbox_threads = ThreadPoolExecutor(max_workers=size, thread_name_prefix='sandbox')
+        return _sandbox_threads
+
+
+def get_llm_pool():
+    """Lazily create the shared thread pool that caps concurrent LLM calls"""
+    global _llm_pool
+    with _pool_lock:
+        if _llm_pool is None:
+            _llm_pool = ThreadPoolExecutor(
+                max_workers=max(1, Config.LLM_MAX_CONCURRENCY),
+                thread_name_prefix='llm'
+            )
+        return _llm_pool
+
+
+def _reset_process_pool():
+    """Drop a broken pool so the next batch starts with fresh workers"""
+    global _process_pool
+    with _pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+            _process_pool = None
+
+
+def _outcome(future):
+    try:
+        return {'ok': True, 'value': future.result()}
+    except BrokenProcessPool as e:
+        _reset_process_pool()
+        return {'ok': False, 'error': f"Worker crashed: {e}"}
+    except Exception as e:
+        return {'ok': False, 'error': str(e)}
+
+
+def _in_sandbox(sandbox, fn, args):
+    """fn(*args) in a sandbox worker, raising its failure for _outcome"""
+    outcome = sandbox.run(fn, *args)
+    if not outcome['ok']:
+        raise RuntimeError(outcome['error']['message'])
+    return outcome['value']
+
+
+def _cancelled():
+    return {'ok': False, 'error': 'Cancelled'}
+
+
+def _run_inline(fn, args_list, on_complete=None, cancelled=None):
+    outcomes = []
+    for args in args_list:
+        if cancelled is not None and cancelled.is_set():
+            outcomes.append(_cancelled())
+        else:
+            try:
+                outcomes.append({'ok': True, 'value': fn(*args)})
+            except Exception as e:
+                outcomes.append({'ok': False, 'error': str(e)})
+        if on_complete is not None:
+            on_complete(len(outcomes) - 1, outcomes[-1])
+    return outcomes
+
+
+def run_parallel_parse(fn, args_list, on_complete=None, cancelled=None, sandbox=None):
+    """Run fn(*args) for every args tuple in the process pool.
+
+    Returns one {'ok', 'value'|'error'} dict per input, in input order, so a
+    failure in one file never affects the others. fn must be a module-level
+    (picklable) function such as parse_resume. on_complete(index, outcome)
+    is called as each file finishes, as in run_bounded_llm. Once the
+    threading.Event cancelled is set, calls not yet started are skipped
+    and reported as cancelled.
+
+    Given a parser_sandbox.ParserSandbox, fn runs in its workers instead of
+    the process pool, with the sandbox's timeout and memory cap per call.
+    """
+    if len(args_list) <= 1:
+        return _run_inline(fn, args_list, on_complete, cancelled)
+
+    if sandbox is not None:
+        threads = get_sandbox_threads(sandbox.size)
+        return _collect([threads.submit(_in_sandbox, sandbox, fn, args) for args in args_list],
+                        on_complete, cancelled)
+
+    pool = get_process_pool()
+    if pool is None:
+        return _run_inline(fn, args_list, on_complete, cancelled)
+
+    try:
+        futures = [pool.submit(fn, *args) for args in args_list]
+    except BrokenProcessPool:
+        _reset_process_pool()
+        return _run_inline(fn, args_list, on_complete, cancelled)
+    return _collect(futures, on_complete, cancelled)
+
+
+def run_bounded_llm(fn, args_list, on_complete=None, cancelled=None):
+    """Run fn(*args) concurrently, at most LLM_MAX_CONCURRENCY at a time.
+
+    Used for I/O-bound LLM calls. Results come back in input order with the
+    same {'ok', 'value'|'error'} shape as run_parallel_parse. If given,
+    on_complete(index, outcome) is called in the caller's thread as each
+    call finishes, in completion order. cancelled works as in
+    run_parallel_parse.
+    """
+    if len(args_list) <= 1:
+        return _run_inline(fn, args_list, on_complete, cancelled)
+
+    pool = get_llm_pool()
+    # Each call runs in a copy of the caller's context, so per-request state
+    # such as the Server-Timing stage totals follows it into the pool
+    futures = [pool.submit(contextvars.copy_context().run, fn, *args) for args in args_list]
+    return _collect(futures, on_complete, cancelled)
+
+
+async def run_bounded_llm_async(fn, args_list):
+    """Async run_bounded_llm: awaits coroutine fn(*args) for every args tuple,
+    at most LLM_MAX_CONCURRENCY at a time per event loop (shared by every
+    request the loop is serving). Same outcome list shape and order."""
+    semaphore = _llm_semaphore()
+
+    async def run(args):
+        async with semaphore:
+            try:
+                return {'ok': True, 'value': await fn(*args)}
+            except Exception as e:
+                return {'ok': False, 'error': str(e)}
+
+    return await asyncio.gather(*(run(args) for args in args_list))
+
+
+def _llm_semaphore():
+    loop = asyncio.get_running_loop()
+    semaphore = _llm_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _llm_semaphores[loop] = asyncio.Semaphore(max(1, Config.LLM_MAX_CONCURRENCY))
+    return semaphore
+
+
+def _collect(futures, on_complete=None, cancelled=None):
+    """Outcomes in input order, reporting each to on_complete as it finishes"""
+    if on_complete is None and cancelled is None:
+        return [_outcome(future) for future in futures]
+    index = {future: i for i, future in enumerate(futures)}
+    outcomes = [None] * len(futures)
+    for future in as_completed(futures):
+        outcomes[index[future]] = _outcome(future)
+        if on_complete is not None:
+            on_complete(index[future], outcomes[index[future]])
+        if cancelled is not None and cancelled.is_set():
+            break
+    # Cancelled: drop what has not started and stop waiting for the rest
+    for future, i in index.items():
+        if outcomes[i] is None:
+            future.cancel()
+            outcomes[i] = _cancelled()
+            if on_complete is not None:
+                on_complete(i, outcomes[i])
+    return outcomes
+
+
+def shutdown_pools():
+    """Shut down the shared pools (they are recreated on next use)"""
+    global _process_pool, _sandbox_threads, _llm_pool
+    with _pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=True)
+            _process_pool = None
+        if _sandbox_threads is not None:
+            _sandbox_threads.shutdown(wait=True)
+            _sandbox_threads = None
+        if _llm_pool is not None:
+            _llm_pool.shutdown(wait=True)
+            _llm_pool = None
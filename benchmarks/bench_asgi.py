@@ -0,0 +1,83 @@
+"""Load test: sync gunicorn deployment vs the ASGI entry point, one worker each
+
+Starts a fake Groq with fixed latency, then for each deployment boots a
+single gunicorn worker and fires POST /analyze (unique TXT resumes, LLM
+cache off) from concurrent clients. Reports requests/sec and latency
+percentiles. Sync and gthread workers hold a worker slot for the whole
+Groq round trip; the ASGI worker awaits it and keeps many in flight.
+
+Usage: python benchmarks/bench_asgi.py [requests] [concurrency] [llm_latency_s]
+"""
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import httpx  # noqa: E402
+
+from corpus import resume_lines  # noqa: E402
+from fake_groq import FakeGroq  # noqa: E402
+from harness import gunicorn, percentile  # noqa: E402
+
+JD = "Senior backend engineer: Python, AWS, Docker, Kubernetes, SQL, React"
+DEPLOYMENTS = [
+    ('sync', ['-k', 'sync', 'app:app']),
+    ('gthread x8', ['-k', 'gthread', '--threads', '8', 'app:app']),
+    ('asgi', ['-k', 'asgi', 'asgi:application']),
+]
+
+
+def load(url, resumes, concurrency):
+    def one(resume):
+        start = time.perf_counter()
+        try:
+            response = httpx.post(
+                f'{url}/analyze', timeout=120,
+                files={'resume': ('resume.txt', resume.encode('utf-8'))}, data={'jd_text': JD}
+            )
+            ok = response.status_code == 200
+        except httpx.HTTPError:
+            ok = False
+        return ok, time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, resumes))
+    wall = time.perf_counter() - start
+    latencies = sorted(seconds for _, seconds in results)
+    return sum(ok for ok, _ in results), wall, latencies
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    latency = float(sys.argv[3]) if len(sys.argv) > 3 else 0.5
+
+    rng = random.Random(18)
+    words = ["python", "aws", "docker", "sql", "react", "kubernetes", "go", "java"]
+    resumes = ["\n".join(resume_lines(rng, words, lines=30)) for _ in range(requests)]
+
+    server = FakeGroq(latency=latency).start()
+    try:
+        print(f"{requests} x POST /analyze, {concurrency} concurrent clients, "
+              f"fake LLM ~{latency:g}s, 1 gunicorn worker\n")
+        print(f"{'worker':<11} | {'ok':>9} | {'req/s':>7} | {'p50 s':>6} | {'p99 s':>6} | {'max s':>6}")
+        print("-" * 60)
+        env = {'GROQ_API_KEY': 'fake', 'GROQ_API_BASE': server.url, 'LLM_CACHE_MAX_ENTRIES': '0'}
+        for name, args in DEPLOYMENTS:
+            with gunicorn(args, env) as app_server:
+                load(app_server.url, resumes[:concurrency], concurrency)  # warm up imports, pools, connections
+                ok, wall, latencies = load(app_server.url, resumes, concurrency)
+            print(f"{name:<11} | {ok:>4}/{requests:<4} | {requests / wall:>7.1f} | "
+                  f"{percentile(latencies, 0.5):>6.2f} | {percentile(latencies, 0.99):>6.2f} | {latencies[-1]:>6.2f}")
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
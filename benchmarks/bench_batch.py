@@ -0,0 +1,113 @@
+"""Benchmark: /analyze-multi throughput, sequential vs parallel batch executor
+
+Runs the real Flask route through the test client with a local fake LLM that
+sleeps to simulate Groq latency.
+
+Usage: python benchmarks/bench_batch.py [resume_count] [llm_latency_seconds]
+"""
+import io
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+os.environ.setdefault('GROQ_API_KEY', 'benchmark-fake-key')
+
+import app as resumeiq  # noqa: E402
+import batch_executor  # noqa: E402
+from config import Config  # noqa: E402
+
+FAKE_ANALYSIS = json.dumps({
+    "overall_fit": "Solid match for the core stack.",
+    "strengths": ["Python", "AWS"],
+    "weaknesses": ["Kubernetes"],
+    "red_flags": "",
+    "recommendation": "Moderate Fit",
+    "confidence": "Medium",
+    "learning_plan_30": "-",
+    "learning_plan_60": "-",
+    "learning_plan_90": "-",
+    "resume_tips": "-"
+})
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.content = content
+
+
+class FakeLLM:
+    """Stand-in for ChatGroq that only sleeps, so results isolate our overhead"""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = 0
+
+    def invoke(self, messages):
+        self.calls += 1
+        time.sleep(self.latency)
+        return FakeResponse(FAKE_ANALYSIS)
+
+
+def make_resume(rng, skills, size=60 * 1024):
+    words = []
+    chosen = rng.sample(skills, 25)
+    while sum(len(w) + 1 for w in words) < size:
+        words.append(rng.choice(chosen) if rng.random() < 0.05 else rng.choice(["led", "built", "team", "delivery"]))
+    return "Jane Candidate\njane@example.com\n" + " ".join(words)
+
+
+def run(client, resumes, jd_text):
+    data = {
+        'jd_text': jd_text,
+        'resumes': [(io.BytesIO(body.encode()), f"resume_{i}.txt") for i, body in enumerate(resumes)]
+    }
+    start = time.perf_counter()
+    response = client.post('/analyze-multi', data=data, content_type='multipart/form-data')
+    elapsed = time.perf_counter() - start
+    assert response.status_code == 200, response.get_data(as_text=True)
+    assert response.get_json()['count'] == len(resumes)
+    return elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.2
+
+    rng = random.Random(7)
+    skills = [s for skills_list in resumeiq.TAXONOMY.current().skills.values() for s in skills_list]
+    resumes = [make_resume(rng, skills) for _ in range(count)]
+    jd_text = "Senior Engineer\n" + ", ".join(rng.sample(skills, 30))
+
+    fake = FakeLLM(latency)
+    resumeiq.llm = fake
+    client = resumeiq.app.test_client()
+    # Every resume gets the full analysis; bench_triage.py covers triage
+    Config.TRIAGE_MODE = 'off'
+
+    settings = [
+        ("sequential", 0, 1),
+        ("parallel", Config.BATCH_PARSE_WORKERS or 4, Config.LLM_MAX_CONCURRENCY),
+        ("parallel x2 llm", Config.BATCH_PARSE_WORKERS or 4, Config.LLM_MAX_CONCURRENCY * 2),
+    ]
+    print(f"{count} resumes, fake LLM latency {latency * 1000:.0f} ms\n")
+    print(f"{'mode':<16} | {'workers':>7} | {'llm cap':>7} | {'seconds':>8} | {'resumes/s':>9}")
+    print("-" * 60)
+    for name, workers, llm_cap in settings:
+        batch_executor.shutdown_pools()
+        resumeiq.PARSE_CACHE.clear()
+        resumeiq.LLM_CACHE.clear()
+        Config.BATCH_PARSE_WORKERS = workers
+        Config.LLM_MAX_CONCURRENCY = llm_cap
+        elapsed = run(client, resumes, jd_text)
+        print(f"{name:<16} | {workers:>7} | {llm_cap:>7} | {elapsed:>8.2f} | {count / elapsed:>9.1f}")
+
+    batch_executor.shutdown_pools()
+
+
+if __name__ == '__main__':
+    main()
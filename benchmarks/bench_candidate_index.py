@@ -0,0 +1,75 @@
+"""Benchmark: persistent CandidateIndex add throughput, cold open and search latency
+
+Usage: python benchmarks/bench_candidate_index.py [pool sizes...]
+"""
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+os.environ.setdefault('GROQ_API_KEY', 'benchmark-fake-key')
+
+from app import TAXONOMY, calculate_skill_match  # noqa: E402
+from candidate_index import CandidateIndex  # noqa: E402
+from ranking import SkillVocabulary  # noqa: E402
+
+SKILLS_TAXONOMY = TAXONOMY.current().skills
+
+
+def random_skills(rng, low, high):
+    skills = {category: [] for category in SKILLS_TAXONOMY}
+    pairs = [(c, s) for c, skills_list in SKILLS_TAXONOMY.items() for s in skills_list]
+    for category, skill in rng.sample(pairs, rng.randint(low, high)):
+        skills[category].append(skill)
+    return skills
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000]
+    rng = random.Random(5)
+    vocab = SkillVocabulary(SKILLS_TAXONOMY)
+    jd_skills = random_skills(rng, 20, 35)
+
+    print(f"{'candidates':>10} | {'add/s':>7} | {'cold open ms':>12} | {'first search ms':>15} | {'warm search ms':>14}")
+    print("-" * 72)
+    for size in sizes:
+        directory = tempfile.mkdtemp(prefix='bench-index-')
+        try:
+            index = CandidateIndex(directory, vocab, 'bench')
+            candidates = [random_skills(rng, 5, 40) for _ in range(size)]
+
+            start = time.perf_counter()
+            for i, skills in enumerate(candidates):
+                resume = {'skills': skills, 'contact': {'name': f'Candidate {i}'}, 'raw_text': ''}
+                index.add(f'hash-{i}', resume, filename=f'{i}.txt')
+            adds = size / (time.perf_counter() - start)
+
+            # A fresh instance stands in for a newly started worker
+            start = time.perf_counter()
+            reopened = CandidateIndex(directory, vocab, 'bench')
+            cold_open = time.perf_counter() - start
+
+            start = time.perf_counter()
+            results = reopened.search(jd_skills, k=20)
+            first = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in range(10):
+                reopened.search(jd_skills, k=20)
+            warm = (time.perf_counter() - start) / 10
+
+            best = max(calculate_skill_match(skills, jd_skills)['overall_score'] for skills in candidates)
+            assert results[0]['ats_score'] == best
+
+            print(f"{size:>10} | {adds:>7.0f} | {cold_open * 1000:>12.1f} | {first * 1000:>15.1f} | {warm * 1000:>14.1f}")
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
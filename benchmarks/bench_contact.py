@@ -0,0 +1,121 @@
+"""Benchmark: precompiled, header-bounded contact extraction vs the legacy findall version
+
+Times realistic resumes of growing size and adversarial inputs that make
+unbounded patterns backtrack (long address-like runs, digit/space tables,
+dotted domains without a TLD). Each adversarial input is run at n and 2n
+characters; a ratio near 2x is linear, near 4x is quadratic. First checks
+the phone number formats below are extracted whole.
+
+Usage: python benchmarks/bench_contact.py
+"""
+import os
+import random
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from contact_extractor import extract_contact  # noqa: E402
+from corpus import resume_lines  # noqa: E402
+
+SIZES = [10 * 1024, 100 * 1024, 1024 * 1024]
+ADVERSARIAL = {
+    'address run, no @': lambda n: "a" * n,
+    'dotted domain, no TLD': lambda n: "x@" + "a-" * (n // 2),
+    'digit/space table': lambda n: "1 " * (n // 2) + "x",
+    'dates and separators': lambda n: "2019 - 2021 | " * (n // 14),
+    'blank lines': lambda n: " \n" * (n // 2) + "Name",
+}
+# Written as they appear in resumes -> what extract_contact returns
+PHONE_FORMATS = {
+    '+1 (555) 123-4567': '+1 (555) 123-4567',
+    '(555) 123-4567': '(555) 123-4567',
+    '555.123.4567': '555.123.4567',
+    '1-800-555-0199': '1-800-555-0199',
+    '(+1) 555 123 4567': '(+1) 555 123 4567',
+    '+44 20 7946 0958': '+44 20 7946 0958',
+    '+44 (0) 20 7946 0958': '+44 (0) 20 7946 0958',
+    '+33 1 23 45 67 89': '+33 1 23 45 67 89',
+    '+33123456789': '+33123456789',
+    '+353 1 234 5678': '+353 1 234 5678',
+    '+61 4 1234 5678': '+61 4 1234 5678',
+    '+7 495 123-45-67': '+7 495 123-45-67',
+    '+91 98765 43210': '+91 98765 43210',
+    'Experience 2019-2021': '',
+}
+
+
+def check_phone_formats():
+    for written, expected in PHONE_FORMATS.items():
+        found = extract_contact(f"Jane Doe\njane@example.com | {written} | Paris")['phone']
+        assert found == expected, (written, found)
+
+
+def legacy_extract(text):
+    """The original extract_contact_info: four uncompiled findalls over the whole text"""
+    contact = {}
+    emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
+    contact['email'] = emails[0] if emails else ""
+    phones = re.findall(r'[\+\(]?[1-9][0-9 .\-\(\)]{8,}[0-9]', text)
+    contact['phone'] = phones[0] if phones else ""
+    linkedin = re.findall(r'linkedin\.com/in/[\w-]+', text, re.IGNORECASE)
+    contact['linkedin'] = linkedin[0] if linkedin else ""
+    github = re.findall(r'github\.com/[\w-]+', text, re.IGNORECASE)
+    contact['github'] = github[0] if github else ""
+    lines = [line.strip() for line in text.split('\n') if line.strip()]
+    contact['name'] = lines[0] if lines else "Candidate"
+    return contact
+
+
+def best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def make_resume(rng, size):
+    words = ["python", "aws", "docker", "sql", "react", "kubernetes"]
+    header = "Jane Doe\njane.doe@example.com | +1 (555) 123-4567 | linkedin.com/in/jane-doe\n"
+    body = []
+    length = len(header)
+    while length < size:
+        line = " ".join(resume_lines(rng, words, lines=1)[3:])
+        body.append(line)
+        length += len(line) + 1
+    return (header + "\n".join(body))[:size]
+
+
+def main():
+    check_phone_formats()
+    rng = random.Random(23)
+    print(f"{'resume':>8} | {'legacy ms':>9} | {'new ms':>7} | {'speedup':>7}")
+    print("-" * 42)
+    for size in SIZES:
+        text = make_resume(rng, size)
+        assert extract_contact(text)['email'] == legacy_extract(text)['email']
+        legacy = best_of(lambda: legacy_extract(text), 5)
+        new = best_of(lambda: extract_contact(text), 5)
+        print(f"{size // 1024:>6}KB | {legacy * 1000:>9.2f} | {new * 1000:>7.3f} | {legacy / new:>6.0f}x")
+
+    # The bounded window would hide any pathology, so time the patterns on
+    # the whole adversarial text as well (head_chars = len(text))
+    n = 8000
+    print(f"\nAdversarial input, {n} vs {2 * n} chars (whole text scanned)\n")
+    print(f"{'input':<22} | {'legacy ms':>9} | {'x2 growth':>9} | {'new ms':>7} | {'x2 growth':>9}")
+    print("-" * 68)
+    for name, make in ADVERSARIAL.items():
+        small, large = make(n), make(2 * n)
+        legacy = [best_of(lambda: legacy_extract(text), 3) for text in (small, large)]
+        new = [best_of(lambda: extract_contact(text, len(text), 0), 3) for text in (small, large)]
+        print(f"{name:<22} | {legacy[0] * 1000:>9.2f} | {legacy[1] / legacy[0]:>8.1f}x | "
+              f"{new[0] * 1000:>7.2f} | {new[1] / new[0]:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
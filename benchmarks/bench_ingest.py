@@ -0,0 +1,98 @@
+"""Benchmark: bulk ingestion of a ZIP of resumes with ingest.py
+
+Builds a ZIP of synthetic resumes (TXT with a share of 2-page PDFs) and
+ingests it into JSONL, CSV and SQLite, in-process and with a process pool,
+reporting resumes/s. Then interrupts a CLI run with Ctrl-C part way
+through, reruns the same command and checks that every resume is in the
+output exactly once.
+
+Usage: python benchmarks/bench_ingest.py [resumes] [pdf share]
+"""
+import csv
+import json
+import os
+import random
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+os.environ.setdefault('GROQ_API_KEY', 'benchmark-fake-key')
+
+from corpus import make_jd, make_resume_pdf, make_resume_txt, taxonomy_skills  # noqa: E402
+from ingest import ingest  # noqa: E402
+import app as resumeiq  # noqa: E402
+
+
+def build_archive(path, count, pdf_share, rng, skills):
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for i in range(count):
+            if rng.random() < pdf_share:
+                zf.writestr(f'batch/{i:05d}.pdf', make_resume_pdf(rng, skills))
+            else:
+                zf.writestr(f'batch/{i:05d}.txt', make_resume_txt(rng, skills))
+        zf.writestr('__MACOSX/batch/._00000.txt', b'')
+
+
+def output_sources(path):
+    if path.endswith('.jsonl'):
+        with open(path, encoding='utf-8') as f:
+            return [json.loads(line)['source'] for line in f]
+    with open(path, encoding='utf-8', newline='') as f:
+        return [row['source'] for row in csv.DictReader(f)]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    pdf_share = float(sys.argv[2]) if len(sys.argv) > 2 else 0.1
+    rng = random.Random(24)
+    skills = taxonomy_skills(resumeiq.TAXONOMY.current().skills)
+    directory = tempfile.mkdtemp(prefix='bench-ingest-')
+    try:
+        archive = os.path.join(directory, 'resumes.zip')
+        build_archive(archive, count, pdf_share, rng, skills)
+        jd_data = resumeiq.parse_job_description(text=make_jd(rng, skills))
+        print(f"{count} resumes ({pdf_share:.0%} PDF), ZIP of {os.path.getsize(archive) / 1e6:.1f} MB\n")
+
+        workers = max(2, resumeiq.Config.BATCH_PARSE_WORKERS)
+        print(f"{'output':<8} | {'workers':>7} | {'seconds':>7} | {'resumes/s':>9} | {'errors':>6}")
+        print("-" * 50)
+        for fmt, pool in (('jsonl', 0), ('jsonl', workers), ('csv', workers), ('sqlite3', workers)):
+            output = os.path.join(directory, f'out-{pool}.{fmt}')
+            stats = ingest([archive], output, jd_data, workers=pool, restart=True, progress=None)
+            print(f"{fmt:<8} | {pool:>7} | {stats['seconds']:>7.2f} | {stats['per_second']:>9.1f} | "
+                  f"{stats['errors']:>6}")
+
+        output = os.path.join(directory, 'resumed.csv')
+        command = [sys.executable, 'ingest.py', archive, '--jd-text', jd_data['text'], '-o', output,
+                   '--workers', str(workers), '--quiet']
+        process = subprocess.Popen(command)
+        deadline = time.monotonic() + 60
+        checkpoint = output + '.checkpoint'
+        while time.monotonic() < deadline and process.poll() is None:
+            if os.path.exists(checkpoint) and sum(1 for _ in open(checkpoint)) >= 3:
+                break
+            time.sleep(0.05)
+        process.send_signal(signal.SIGINT)
+        first_code = process.wait()
+        written = len(output_sources(output))
+        start = time.perf_counter()
+        second_code = subprocess.run(command).returncode
+        seconds = time.perf_counter() - start
+        sources = output_sources(output)
+        print(f"\nInterrupted CLI run (exit {first_code}) after {written} of {count} rows; rerun (exit "
+              f"{second_code}) finished the other {count - written} in {seconds:.2f}s. "
+              f"Rows: {len(sources)}, unique: {len(set(sources))}, complete: {len(set(sources)) == count}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark: LLM response cache and in-flight coalescing with a counting stub
+
+Usage: python benchmarks/bench_llm_cache.py [concurrent_requests] [llm_latency_seconds]
+"""
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from llm_cache import LLMResponseCache  # noqa: E402
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.content = content
+
+
+class CountingLLM:
+    """Stub LLM that records how many upstream calls actually happen"""
+    model_name = 'stub-model'
+    temperature = 0.3
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        return FakeResponse(f"answer to {prompt[:20]}")
+
+
+def burst(cache, llm, prompts, concurrency):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda p: cache.invoke(llm, p), prompts))
+    return time.perf_counter() - start
+
+
+def main():
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.3
+
+    cache = LLMResponseCache(ttl=60, max_entries=128)
+    llm = CountingLLM(latency)
+
+    # Same prompt fired concurrently: one upstream call, everyone else waits on it
+    elapsed = burst(cache, llm, ["analyze resume A vs JD X"] * concurrency, concurrency)
+    print(f"{concurrency} concurrent identical prompts -> {llm.calls} upstream call(s) in {elapsed:.2f}s")
+
+    # Repeat after completion: served from cache
+    calls_before = llm.calls
+    elapsed = burst(cache, llm, ["analyze resume A vs JD X"] * concurrency, concurrency)
+    print(f"{concurrency} repeated prompts          -> {llm.calls - calls_before} upstream call(s) in {elapsed:.4f}s")
+
+    # Distinct prompts are never merged
+    calls_before = llm.calls
+    elapsed = burst(cache, llm, [f"analyze resume {i} vs JD X" for i in range(8)], 8)
+    print(f"8 distinct prompts               -> {llm.calls - calls_before} upstream call(s) in {elapsed:.2f}s")
+
+    print("\nstats:", cache.stats())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark: LLM gateway vs a bare ChatGroq client against a fault-injecting fake Groq
+
+Scenarios: healthy, flaky (30% 503s), throttled (429 + Retry-After), slow
+(responses past the timeout) and a full outage. For each, reports calls
+that succeeded, latency percentiles per call (success or failure), requests
+that reached the server and TCP connections opened.
+
+Usage: python benchmarks/bench_llm_gateway.py [calls] [concurrency]
+"""
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from langchain_core.messages import HumanMessage  # noqa: E402
+from langchain_groq import ChatGroq  # noqa: E402
+
+from fake_groq import FakeGroq  # noqa: E402
+from llm_gateway import create_groq_gateway  # noqa: E402
+
+SCENARIOS = [
+    ('healthy', dict(latency=0.05, error_rate=0.0)),
+    ('flaky 30% 503', dict(latency=0.05, error_rate=0.3, error_status=503, retry_after=None)),
+    ('throttled 429', dict(latency=0.05, error_rate=0.4, error_status=429, retry_after=0.2)),
+    ('slow (3s)', dict(latency=3.0, error_rate=0.0)),
+    ('outage', dict(latency=0.05, error_rate=1.0, error_status=503, retry_after=None)),
+]
+
+
+def clients(url):
+    # What app.py used to build: SDK defaults, fresh settings per client
+    bare = ChatGroq(model='llama-3.1-8b-instant', temperature=0.3, groq_api_key='fake', groq_api_base=url)
+    gateway = create_groq_gateway(
+        'fake', 'llama-3.1-8b-instant', 0.3, base_url=url, timeout=1.0, pool_size=8,
+        failure_threshold=5, reset_timeout=30.0, deadline=4.0, max_retries=2, backoff=0.1, backoff_max=1.0
+    )
+    return {'bare ChatGroq': bare, 'gateway': gateway}
+
+
+def run(client, calls, concurrency, index):
+    def one(i):
+        start = time.perf_counter()
+        try:
+            client.invoke([HumanMessage(content=f"Analyze candidate {index}-{i}")])
+            ok = True
+        except Exception:
+            ok = False
+        return ok, time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(calls)))
+    latencies = sorted(seconds for _, seconds in results)
+    return sum(ok for ok, _ in results), latencies
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    server = FakeGroq().start()
+    try:
+        print(f"{calls} calls, {concurrency} concurrent\n")
+        print(f"{'scenario':<15} | {'client':<13} | {'ok':>5} | {'p50 s':>6} | {'p95 s':>6} | {'max s':>6} | "
+              f"{'requests':>8} | {'conns':>5}")
+        print("-" * 86)
+        for index, (name, settings) in enumerate(SCENARIOS):
+            for label, client in clients(server.url).items():
+                server.configure(**settings)
+                server.reset_counts()
+                ok, latencies = run(client, calls, concurrency, index)
+                counts = dict(server.counts)
+                print(f"{name:<15} | {label:<13} | {ok:>2}/{calls:<2} | {latencies[len(latencies) // 2]:>6.2f} | "
+                      f"{latencies[int(len(latencies) * 0.95) - 1]:>6.2f} | {latencies[-1]:>6.2f} | "
+                      f"{counts['requests']:>8} | {counts['connections']:>5}")
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
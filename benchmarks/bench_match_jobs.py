@@ -0,0 +1,113 @@
+"""Benchmark: ranking open roles for candidates, 1 x 500 and 100 x 500
+
+Scoring: every resume against every JD with calculate_skill_match in a
+loop (what one /analyze per pair would do) vs run_job_matching, which
+scores the whole matrix in one pass and matches only each candidate's
+top k in detail. Checks that both pick the same roles with the same scores.
+
+End to end: POST /match-jobs (TXT resumes, 500 catalog openings, fake
+Groq with fixed latency, LLM on each candidate's best role only).
+
+Usage: python benchmarks/bench_match_jobs.py [jobs] [llm_latency_s]
+"""
+import io
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+
+from corpus import make_jd, make_resume_txt, taxonomy_skills  # noqa: E402
+from fake_groq import FakeGroq  # noqa: E402
+
+LLM_LATENCY = float(sys.argv[2]) if len(sys.argv) > 2 else 0.2
+FAKE_GROQ = FakeGroq(latency=LLM_LATENCY).start()
+os.environ.update({'GROQ_API_KEY': 'fake', 'GROQ_API_BASE': FAKE_GROQ.url, 'LLM_CACHE_MAX_ENTRIES': '0'})
+
+import app as resumeiq  # noqa: E402
+from job_catalog import JobCatalog  # noqa: E402
+from ranking import top_k_rows  # noqa: E402
+
+K = 5
+SHAPES = [(1, 500), (100, 500)]
+
+
+def naive_ranking(parsed, jobs, k):
+    """Top-k (job index, score) per resume, one calculate_skill_match per pair"""
+    rankings = []
+    for _, resume_data in parsed:
+        scores = [resumeiq.calculate_skill_match(resume_data['skills'], jd_data['skills'])['overall_score']
+                  for jd_data in jobs]
+        rankings.append([(j, scores[j]) for j in top_k_rows(scores, k)])
+    return rankings
+
+
+def main():
+    job_count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    shapes = [(n, job_count) for n, _ in SHAPES]
+    rng = random.Random(21)
+    skills = taxonomy_skills(resumeiq.TAXONOMY.current().skills)
+    jobs = [{'id': f'role-{i:03d}', 'text': make_jd(rng, skills)} for i in range(job_count)]
+    resumes = [make_resume_txt(rng, skills) for _ in range(max(n for n, _ in shapes))]
+
+    directory = tempfile.mkdtemp(prefix='bench-openings-')
+    resumeiq.JOB_CATALOG = JobCatalog(
+        os.path.join(directory, 'openings.sqlite3'), resumeiq.TAXONOMY.current().vocabulary, resumeiq.TAXONOMY.version
+    )
+    try:
+        start = time.perf_counter()
+        for jd_data in resumeiq._parse_openings(jobs):
+            resumeiq.JOB_CATALOG.put(jd_data['job_id'], jd_data)
+        openings = resumeiq.JOB_CATALOG.snapshot()
+        print(f"Catalog: {job_count} openings parsed and stored in {time.perf_counter() - start:.2f}s\n")
+
+        print(f"{'resumes x jobs':<15} | {'pair loop ms':>12} | {'matrix ms':>9} | {'speedup':>7} | same top-{K}")
+        print("-" * 64)
+        for n, m in shapes:
+            parsed = [(f'{i}.txt', resumeiq.parse_resume(resumes[i], f'{i}.txt')) for i in range(n)]
+            naive_ranking(parsed[:1], openings.jobs, K)  # warm-up
+            resumeiq.run_job_matching(parsed[:1], openings, K, llm_top=0)
+
+            repeat = max(1, 20 // n)
+            start = time.perf_counter()
+            for _ in range(repeat):
+                expected = naive_ranking(parsed, openings.jobs, K)
+            loop = (time.perf_counter() - start) / repeat
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                candidates, _ = resumeiq.run_job_matching(parsed, openings, K, llm_top=0)
+            matrix = (time.perf_counter() - start) / repeat
+
+            got = [[(int(match['job_id'].split('-')[1]), match['ats_score']) for match in c['matches']]
+                   for c in candidates]
+            print(f"{f'{n} x {m}':<15} | {loop * 1000:>12.1f} | {matrix * 1000:>9.1f} | "
+                  f"{loop / matrix:>6.0f}x | {got == expected}")
+
+        print(f"\nPOST /match-jobs, k={K}, LLM on each candidate's best role "
+              f"(fake Groq ~{LLM_LATENCY:g}s, {resumeiq.Config.LLM_MAX_CONCURRENCY} concurrent)\n")
+        print(f"{'resumes x jobs':<15} | {'seconds':>7} | {'llm calls':>9} | {'status':>6}")
+        print("-" * 48)
+        client = resumeiq.app.test_client()
+        client.post('/match-jobs', data={'resume': (io.BytesIO(resumes[0]), 'warm.txt')})  # lazy imports, LLM client
+        for n, m in shapes:
+            data = {'resumes': [(io.BytesIO(resumes[i]), f'{i}.txt') for i in range(n)],
+                    'k': str(K), 'llm_top': '1'}
+            start = time.perf_counter()
+            response = client.post('/match-jobs', data=data)
+            seconds = time.perf_counter() - start
+            print(f"{f'{n} x {m}':<15} | {seconds:>7.2f} | {response.get_json().get('llm_calls', 0):>9} | "
+                  f"{response.status_code:>6}")
+    finally:
+        FAKE_GROQ.stop()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Benchmark: cost of the always-on instrumentation
+
+Times MetricsRegistry.stage() against a bare block, and a cached /analyze
+request with METRICS_ENABLED on and off.
+
+Usage: python benchmarks/bench_metrics.py [iterations]
+"""
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+os.environ.setdefault('GROQ_API_KEY', 'benchmark-fake-key')
+
+import app as resumeiq  # noqa: E402
+from bench_triage import CountingLLM  # noqa: E402
+from config import Config  # noqa: E402
+from metrics import MetricsRegistry  # noqa: E402
+
+
+def per_call(fn, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    registry = MetricsRegistry()
+
+    def bare():
+        pass
+
+    def staged():
+        with registry.stage('bench'):
+            pass
+
+    token = registry.begin_request()
+    base, timed = per_call(bare, iterations), per_call(staged, iterations)
+    registry.end_request(token)
+    print(f"stage() overhead: {(timed - base) * 1e6:.2f} us per block")
+    start = time.perf_counter()
+    registry.render()
+    print(f"render():        {(time.perf_counter() - start) * 1000:.2f} ms\n")
+
+    resumeiq.llm = CountingLLM(0)
+    client = resumeiq.app.test_client()
+    resume = b"Jane Doe\njane@example.com\n" + b"Python AWS Docker SQL Kubernetes React\n" * 50
+    form = lambda: {'resume': (io.BytesIO(resume), 'resume.txt'), 'jd_text': 'Python Kubernetes AWS Go Terraform'}  # noqa: E731
+    requests = max(200, iterations // 1000)
+    client.post('/analyze', data=form(), content_type='multipart/form-data')  # warm the caches
+    best = {}
+    for _ in range(3):  # interleave so drift hits both settings alike
+        for enabled in (False, True):
+            Config.METRICS_ENABLED = resumeiq.METRICS.enabled = enabled
+            elapsed = per_call(lambda: client.post('/analyze', data=form(), content_type='multipart/form-data'), requests)
+            best[enabled] = min(best.get(enabled, elapsed), elapsed)
+    for enabled in (False, True):
+        print(f"/analyze (cached), metrics {'on ' if enabled else 'off'}: {best[enabled] * 1000:.3f} ms per request")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+"""Benchmark: PDF parsing in-process vs in the parser sandbox, with hostile documents
+
+A batch of normal resume PDFs is parsed by 4 request threads together with
+a few hostile documents: one that spins the CPU, one that allocates
+without bound and one that crashes the parser process. Reports latency of
+the normal documents and what became of the hostile ones.
+
+In-process, only the spinning document can be run (bounded to SPIN_SECONDS
+here; a real one never returns): the memory hog would take the whole
+process down and the crash would kill it. The sandbox gets all three.
+Also reports the per-document overhead of the sandbox on normal PDFs.
+
+Usage: python benchmarks/bench_parser_sandbox.py [normal pdfs] [timeout_s]
+"""
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+os.environ.setdefault('GROQ_API_KEY', 'benchmark-fake-key')
+
+import app as resumeiq  # noqa: E402
+from corpus import make_resume_pdf, taxonomy_skills  # noqa: E402
+from parser_sandbox import ParserSandbox  # noqa: E402
+
+THREADS = 4
+SPIN_SECONDS = 15.0
+
+
+def hostile_extract(source):
+    """extract_pdf_text, except for the marker documents standing in for hostile PDFs"""
+    if source == b'HOSTILE spin':
+        deadline = time.monotonic() + SPIN_SECONDS
+        while time.monotonic() < deadline:
+            pass
+        return "", {}
+    if source == b'HOSTILE balloon':
+        hoard = []
+        while True:
+            hoard.append(bytearray(64 * 1024 * 1024))
+    if source == b'HOSTILE crash':
+        os.abort()
+    return resumeiq.extract_pdf_text(source)
+
+
+def run_batch(parse, documents):
+    """Parse documents with THREADS threads; (normal latencies, hostile outcomes, wall seconds)"""
+    latencies, hostile = [], {}
+    lock = threading.Lock()
+    pending = list(enumerate(documents))
+
+    def work():
+        while True:
+            with lock:
+                if not pending:
+                    return
+                _, document = pending.pop(0)
+            start = time.perf_counter()
+            outcome = parse(document)
+            seconds = time.perf_counter() - start
+            with lock:
+                if document.startswith(b'HOSTILE'):
+                    hostile[document.decode()[8:]] = (outcome, seconds)
+                else:
+                    latencies.append(seconds)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=work) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, hostile, time.perf_counter() - start
+
+
+def in_process(document):
+    try:
+        return {'ok': True, 'value': hostile_extract(document)}
+    except Exception as e:
+        return {'ok': False, 'error': {'type': 'error', 'message': str(e)}}
+
+
+def in_sandbox(sandbox):
+    return lambda document: sandbox.run(hostile_extract, document)
+
+
+def summary(label, latencies, wall):
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(f"{label:<32} | {statistics.median(ordered) * 1000:>7.0f} | {p95 * 1000:>7.0f} | "
+          f"{ordered[-1] * 1000:>8.0f} | {wall:>6.1f}")
+
+
+def describe(outcome, seconds):
+    if outcome['ok']:
+        return f"returned after {seconds:.1f}s"
+    return f"{outcome['error']['type']} after {seconds:.1f}s ({outcome['error']['message']})"
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    timeout = float(sys.argv[2]) if len(sys.argv) > 2 else 3.0
+    rng = random.Random(25)
+    skills = taxonomy_skills(resumeiq.TAXONOMY.current().skills)
+    pdfs = [make_resume_pdf(rng, skills) for _ in range(count)]
+    sandbox = ParserSandbox(workers=THREADS, timeout=timeout,
+                            memory_limit=resumeiq.Config.PARSER_SANDBOX_MEMORY_MB * 1024 * 1024,
+                            max_documents=resumeiq.Config.PARSER_SANDBOX_MAX_DOCUMENTS, preload=('pdfplumber',))
+
+    resumeiq.extract_pdf_text(pdfs[0])
+    sandbox.run(hostile_extract, pdfs[0])
+    start = time.perf_counter()
+    for pdf in pdfs[:10]:
+        resumeiq.extract_pdf_text(pdf)
+    direct = (time.perf_counter() - start) / 10
+    start = time.perf_counter()
+    for pdf in pdfs[:10]:
+        sandbox.run(hostile_extract, pdf)
+    sandboxed = (time.perf_counter() - start) / 10
+    print(f"Sequential, normal 2-page PDFs: in-process {direct * 1000:.0f} ms, sandbox {sandboxed * 1000:.0f} ms "
+          f"per document (+{(sandboxed - direct) * 1000:.1f} ms)\n")
+
+    print(f"{count} normal PDFs, {THREADS} threads, sandbox timeout {timeout:g}s\n")
+    print(f"{'run':<32} | {'p50 ms':>7} | {'p95 ms':>7} | {'max ms':>8} | {'wall s':>6}")
+    print("-" * 72)
+    latencies, _, wall = run_batch(in_process, pdfs)
+    summary("in-process, normal only", latencies, wall)
+    latencies, spin, wall = run_batch(in_process, [b'HOSTILE spin'] + pdfs)
+    summary(f"in-process + spin ({SPIN_SECONDS:g}s)", latencies, wall)
+    latencies, _, wall = run_batch(in_sandbox(sandbox), pdfs)
+    summary("sandbox, normal only", latencies, wall)
+    hostile_docs = [b'HOSTILE spin', b'HOSTILE balloon', b'HOSTILE crash']
+    latencies, hostile, wall = run_batch(in_sandbox(sandbox), hostile_docs + pdfs)
+    summary("sandbox + spin, balloon, crash", latencies, wall)
+
+    print(f"\nIn-process spin: {describe(*spin['spin'])}, holding a request thread the whole time")
+    for kind in ('spin', 'balloon', 'crash'):
+        print(f"Sandbox {kind}: {describe(*hostile[kind])}")
+    print(f"Sandbox stats: {sandbox.stats()}")
+    sandbox.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark: prompt tokens per analysis, first-N-characters vs token-budgeted context
+
+Builds the analysis and short-screening prompts for sectioned synthetic
+resumes and JDs twice: with the old truncation (PROMPT_*_TOKENS=0, first
+2000/500 characters) and with the budgeted passages. Reports estimated
+prompt tokens per call, how many of the job's skills the resume mentions
+are still visible to the LLM (skill coverage), and the cost of building
+the context.
+
+Usage: python benchmarks/bench_prompt_tokens.py [resumes]
+"""
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+os.environ.setdefault('GROQ_API_KEY', 'benchmark-fake-key')
+
+import app as resumeiq  # noqa: E402
+from corpus import make_sectioned_jd, make_sectioned_resume, taxonomy_skills  # noqa: E402
+from prompt_builder import estimate_tokens  # noqa: E402
+
+BUDGETS = ('PROMPT_RESUME_TOKENS', 'PROMPT_JD_TOKENS', 'PROMPT_SHORT_RESUME_TOKENS')
+
+
+def measure(pairs):
+    """Mean prompt tokens (analysis, short), mean skill coverage and build ms per analysis"""
+    analysis = short = coverage = 0
+    start = time.perf_counter()
+    for resume_data, jd_data, match_results in pairs:
+        jd_data.pop('prompt_context', None)
+        messages = resumeiq._analysis_messages(resume_data, jd_data, match_results)
+        analysis += sum(estimate_tokens(message.content) for message in messages)
+        short += sum(estimate_tokens(message.content)
+                     for message in resumeiq._short_messages(resume_data, jd_data, match_results))
+        matched = {s['skill'] for s in match_results['matched_flat']}
+        visible = resumeiq._skill_names(messages[-1].content.split('RESUME SUMMARY:')[1].split('ATS ANALYSIS:')[0])
+        coverage += len(matched & visible) / len(matched) if matched else 1
+    seconds = time.perf_counter() - start
+    n = len(pairs)
+    return analysis / n, short / n, coverage / n * 100, seconds / n * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rng = random.Random(23)
+    skills = taxonomy_skills(resumeiq.TAXONOMY.current().skills)
+    jds = [resumeiq.parse_job_description(text=make_sectioned_jd(rng, skills)) for _ in range(10)]
+    pairs = []
+    for i in range(count):
+        resume_data = resumeiq.parse_resume(make_sectioned_resume(rng, skills).encode('utf-8'), f'{i}.txt')
+        jd_data = jds[i % len(jds)]
+        pairs.append((resume_data, jd_data, resumeiq.calculate_skill_match(resume_data['skills'], jd_data['skills'])))
+    source = sum(estimate_tokens(r['raw_text']) for r, _, _ in pairs) / count
+
+    budgets = {name: getattr(resumeiq.Config, name) for name in BUDGETS}
+    for name in BUDGETS:
+        setattr(resumeiq.Config, name, 0)
+    measure(pairs[:5])
+    before = measure(pairs)
+    for name, value in budgets.items():
+        setattr(resumeiq.Config, name, value)
+    measure(pairs[:5])
+    after = measure(pairs)
+
+    print(f"{count} analyses, resumes average {source:.0f} tokens; budgets "
+          + ", ".join(f"{name}={value}" for name, value in budgets.items()) + "\n")
+    print(f"{'prompt':<22} | {'analysis tok':>12} | {'short tok':>9} | {'skill coverage':>14} | {'build ms':>8}")
+    print("-" * 78)
+    for label, (analysis, short, coverage, ms) in (('first 2000/500 chars', before), ('token-budgeted', after)):
+        print(f"{label:<22} | {analysis:>12.0f} | {short:>9.0f} | {coverage:>13.1f}% | {ms:>8.2f}")
+    print(f"\nanalysis prompt tokens: {(1 - after[0] / before[0]) * 100:.0f}% fewer; "
+          f"short prompt tokens: {(1 - after[1] / before[1]) * 100:.0f}% fewer")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Benchmark: vectorized CandidatePool scoring vs calculate_skill_match per resume
+
+Also checks that every overall and per-category score is exactly equal.
+
+Usage: python benchmarks/bench_ranking.py [pool sizes...]
+"""
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+os.environ.setdefault('GROQ_API_KEY', 'benchmark-fake-key')
+
+from app import TAXONOMY, calculate_skill_match  # noqa: E402
+from ranking import CandidatePool, SkillVocabulary  # noqa: E402
+
+SKILLS_TAXONOMY = TAXONOMY.current().skills
+
+
+def random_skills(rng, low, high):
+    skills = {category: [] for category in SKILLS_TAXONOMY}
+    pairs = [(c, s) for c, skills_list in SKILLS_TAXONOMY.items() for s in skills_list]
+    for category, skill in rng.sample(pairs, rng.randint(low, high)):
+        skills[category].append(skill)
+    return skills
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000]
+    rng = random.Random(3)
+    vocab = SkillVocabulary(SKILLS_TAXONOMY)
+    jd_skills = random_skills(rng, 20, 35)
+
+    print(f"{'candidates':>10} | {'encode s':>8} | {'MB':>5} | {'loop s':>8} | {'numpy ms':>8} | {'top-10 ms':>9} | {'speedup':>7}")
+    print("-" * 76)
+    for size in sizes:
+        candidates = [(i, random_skills(rng, 5, 40)) for i in range(size)]
+
+        start = time.perf_counter()
+        pool = CandidatePool.from_skills(vocab, candidates)
+        encode = time.perf_counter() - start
+
+        start = time.perf_counter()
+        expected = [calculate_skill_match(skills, jd_skills) for _, skills in candidates]
+        loop = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scores = pool.score(jd_skills)
+        vectorized = time.perf_counter() - start
+
+        start = time.perf_counter()
+        top = pool.top_k(jd_skills, 10)
+        top_k = time.perf_counter() - start
+
+        for row, result in enumerate(expected):
+            assert scores['overall_score'][row] == result['overall_score'], row
+            for category, value in result['category_scores'].items():
+                assert scores['category_scores'][category][row] == value, (row, category)
+        best = max(r['overall_score'] for r in expected)
+        assert top[0][1] == best
+
+        megabytes = pool.matrix.nbytes / 1e6
+        print(f"{size:>10} | {encode:>8.2f} | {megabytes:>5.1f} | {loop:>8.2f} | {vectorized * 1000:>8.1f} | "
+              f"{top_k * 1000:>9.1f} | {loop / vectorized:>6.0f}x")
+
+    print("\nAll scores identical to calculate_skill_match.")
+
+
+if __name__ == '__main__':
+    main()
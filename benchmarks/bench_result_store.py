@@ -0,0 +1,89 @@
+"""Benchmark: per-request session overhead, cookie sessions vs server-side store
+
+Compares carrying the full analysis in Flask's signed cookie (the old
+behavior) against carrying only an id and loading the analysis from each
+result store backend.
+
+Usage: python benchmarks/bench_result_store.py
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from flask import Flask  # noqa: E402
+from flask.sessions import SecureCookieSessionInterface  # noqa: E402
+
+from result_store import create_result_store  # noqa: E402
+
+ITERATIONS = 2000
+
+
+def make_analysis(i):
+    skills = [f"Skill {n}" for n in range(40)]
+    return {
+        'candidate_name': f"Candidate {i}",
+        'candidate_email': f"candidate{i}@example.com",
+        'job_title': 'Senior Data Engineer',
+        'ats_score': 72.5,
+        'role_fit_score': 3.5,
+        'category_scores': {'Technical Skills': 80.0, 'Tools & Platforms': 60.0},
+        'matched_skills': skills[:25],
+        'missing_skills': skills[25:],
+        'matched_skills_detailed': [{'skill': s, 'category': 'Technical Skills', 'confidence': 100} for s in skills[:25]],
+        'missing_skills_detailed': [{'skill': s, 'category': 'Technical Skills', 'priority': 'High'} for s in skills[25:]],
+        'ai_analysis': {
+            'overall_fit': 'Strong foundation in data engineering with gaps in streaming. ' * 3,
+            'strengths': ['Built batch pipelines on Spark processing terabytes daily'] * 5,
+            'weaknesses': ['Limited exposure to Kafka and real-time systems'] * 5,
+            'learning_plan_30': 'Complete a Kafka fundamentals course and build a demo. ' * 2,
+            'learning_plan_60': 'Ship a streaming side project with monitoring. ' * 2,
+            'learning_plan_90': 'Lead a production migration to streaming ingestion. ' * 2,
+            'resume_tips': 'Quantify pipeline scale and latency improvements. ' * 2
+        }
+    }
+
+
+def time_per_request(fn):
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        fn()
+    return (time.perf_counter() - start) / ITERATIONS * 1e6
+
+
+def main():
+    app = Flask(__name__)
+    app.secret_key = 'benchmark'
+    serializer = SecureCookieSessionInterface().get_signing_serializer(app)
+
+    analysis = make_analysis(0)
+    batch = [make_analysis(i) for i in range(50)]
+
+    print(f"{'mode':<22} | {'cookie bytes':>12} | {'us/request':>10}")
+    print("-" * 52)
+
+    for label, payload in (('cookie: analysis', {'analysis': analysis}), ('cookie: 50-batch', {'batch_results': batch})):
+        cookie = serializer.dumps(payload)
+        # Every request: verify + decode the incoming cookie, re-sign it on the way out
+        cost = time_per_request(lambda: serializer.dumps(serializer.loads(cookie)))
+        note = '  (over 4 KB browser limit)' if len(cookie) > 4096 else ''
+        print(f"{label:<22} | {len(cookie):>12} | {cost:>10.1f}{note}")
+
+    base_dir = tempfile.mkdtemp()
+    try:
+        for store_type in ('memory', 'sqlite', 'filesystem'):
+            store = create_result_store(store_type, base_dir)
+            store.set('sid:analysis', analysis, 3600)
+            cookie = serializer.dumps({'sid': 'f' * 32})
+            cost = time_per_request(lambda: (serializer.loads(cookie), store.get('sid:analysis')))
+            print(f"{'store: ' + store_type:<22} | {len(cookie):>12} | {cost:>10.1f}")
+    finally:
+        shutil.rmtree(base_dir)
+
+
+if __name__ == '__main__':
+    main()
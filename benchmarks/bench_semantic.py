@@ -0,0 +1,83 @@
+"""Benchmark: offline semantic scoring (hashed TF-IDF cosine) over candidate pools
+
+Tokenizing and hashing resume text is the per-document cost and is paid
+once (the candidate index stores the result); scoring a JD against an
+already-hashed pool is the per-query cost. Also times CandidateIndex
+search with semantic scores, cold (terms loaded from SQLite) and warm.
+
+Usage: python benchmarks/bench_semantic.py [pool sizes...]
+"""
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+os.environ.setdefault('GROQ_API_KEY', 'benchmark-fake-key')
+
+from app import TAXONOMY, extract_skills_from_text  # noqa: E402
+from candidate_index import CandidateIndex  # noqa: E402
+from corpus import make_jd, make_resume_txt, taxonomy_skills  # noqa: E402
+from semantic import SemanticPool, TermMatrix, hash_terms, similarity_scores  # noqa: E402
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 5000]
+    rng = random.Random(22)
+    skills = taxonomy_skills(TAXONOMY.current().skills)
+    jd = make_jd(rng, skills)
+    texts = [make_resume_txt(rng, skills).decode('utf-8') for _ in range(max(sizes))]
+    jobs = SemanticPool(TermMatrix.from_texts(make_jd(rng, skills) for _ in range(500)))
+
+    print(f"{'pool':>6} | {'hash docs/s':>11} | {'pool build ms':>13} | {'1 JD ms':>7} | {'100 x 500 ms':>12} | "
+          f"{'index cold ms':>13} | {'index warm ms':>13}")
+    print("-" * 96)
+    for size in sizes:
+        start = time.perf_counter()
+        terms = [hash_terms(text) for text in texts[:size]]
+        hash_rate = size / (time.perf_counter() - start)
+        start = time.perf_counter()
+        pool = SemanticPool(TermMatrix(terms))
+        build = time.perf_counter() - start
+        query = TermMatrix([hash_terms(jd)])
+
+        similarity_scores(pool, query)
+        start = time.perf_counter()
+        for _ in range(10):
+            similarity_scores(pool, query)
+        one_jd = (time.perf_counter() - start) / 10
+
+        start = time.perf_counter()
+        similarity_scores(jobs, TermMatrix(terms[:100]))
+        cross = time.perf_counter() - start
+
+        directory = tempfile.mkdtemp(prefix='bench-semantic-')
+        try:
+            index = CandidateIndex(directory, TAXONOMY.current().vocabulary, TAXONOMY.version)
+            for i, text in enumerate(texts[:size]):
+                resume = {'skills': extract_skills_from_text(text), 'contact': {'name': f'Candidate {i}'},
+                          'raw_text': text}
+                index.add(f'hash-{i}', resume, filename=f'{i}.txt')
+            jd_skills = extract_skills_from_text(jd)
+
+            start = time.perf_counter()
+            index.search(jd_skills, k=20, jd_text=jd, rank_by='semantic')
+            cold = time.perf_counter() - start
+            start = time.perf_counter()
+            for _ in range(10):
+                index.search(jd_skills, k=20, jd_text=jd, rank_by='semantic')
+            warm = (time.perf_counter() - start) / 10
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+        print(f"{size:>6} | {hash_rate:>11.0f} | {build * 1000:>13.1f} | {one_jd * 1000:>7.1f} | {cross * 1000:>12.1f} | "
+              f"{cold * 1000:>13.1f} | {warm * 1000:>13.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""Benchmark: compiled SkillMatcher vs the legacy per-skill substring loop
+
+First checks that an alias inside its canonical name ("Kafka" in "Apache
+Kafka") counts as one mention.
+
+Usage: python benchmarks/bench_skill_matcher.py
+"""
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from skill_matcher import SkillMatcher  # noqa: E402
+
+SIZES = [1024, 10 * 1024, 100 * 1024, 1024 * 1024]
+FILLER = [
+    "experience", "developed", "delivered", "team", "stakeholders", "with",
+    "and", "the", "project", "responsible", "for", "improved", "systems",
+    "good", "going", "javascripting", "ownership", "reporting", "customers"
+]
+
+
+def legacy_extract(text, skills_db):
+    """The original extract_skills_from_text: one substring scan per skill"""
+    text_lower = text.lower()
+    found_skills = {}
+    for category, skills_list in skills_db.items():
+        found_skills[category] = []
+        for skill in skills_list:
+            if skill.lower() in text_lower:
+                found_skills[category].append(skill)
+    return found_skills
+
+
+def make_resume(size, skills, rng, skills_per_resume=30):
+    """Mostly filler prose mentioning a few dozen skills, like a real resume"""
+    skills = rng.sample(skills, skills_per_resume)
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(skills) if rng.random() < 0.03 else rng.choice(FILLER)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)[:size]
+
+
+def best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def check_alias_overlap(taxonomy, aliases):
+    """One mention per skill when an alias span lies inside the canonical one"""
+    matcher = SkillMatcher(taxonomy, aliases)
+    scan = matcher.scan("Streaming: Apache Kafka and Google Cloud Platform, Apache Spark, Kafka again")
+    assert scan['counts']['Apache Kafka'] == 2, scan['positions']['Apache Kafka']
+    assert scan['positions']['Apache Kafka'] == [(11, 23), (65, 70)]
+    assert scan['counts']['Google Cloud Platform'] == 1, scan['positions']['Google Cloud Platform']
+    assert scan['counts']['Spark'] == 1, scan['positions']['Spark']
+
+
+def main():
+    with open(os.path.join(ROOT, 'skills.json'), 'r') as f:
+        taxonomy = json.load(f)
+    with open(os.path.join(ROOT, 'skill_aliases.json'), 'r') as f:
+        check_alias_overlap(taxonomy, json.load(f))
+    skills = [s for skills_list in taxonomy.values() for s in skills_list]
+
+    start = time.perf_counter()
+    matcher = SkillMatcher(taxonomy)
+    compile_ms = (time.perf_counter() - start) * 1000
+    print(f"Compiled {len(skills)} skills into {matcher.state_count} states in {compile_ms:.1f} ms\n")
+
+    rng = random.Random(42)
+    print(f"{'size':>8} | {'legacy ms':>10} | {'matcher ms':>10} | {'speedup':>7}")
+    print("-" * 46)
+    for size in SIZES:
+        text = make_resume(size, skills, rng)
+        repeat = 20 if size <= 100 * 1024 else 5
+        legacy = best_of(lambda: legacy_extract(text, taxonomy), repeat)
+        compiled = best_of(lambda: matcher.extract(text), repeat)
+        print(f"{size // 1024:>6}KB | {legacy * 1000:>10.2f} | {compiled * 1000:>10.2f} | {legacy / compiled:>6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+"""Benchmark: worker startup time and per-worker memory, lazy vs eager vs preloaded
+
+Import: times `import app` in fresh interpreters as it is now (langchain,
+pdfplumber and the Groq client deferred), with those libraries imported
+up front as every worker used to, and through the first /analyze of a
+PDF, where the deferred imports are paid.
+
+Workers: boots gunicorn with N sync workers, PRELOAD_APP off and on,
+warms them with PDF analyses against a fake Groq, then reads each
+process's RSS, PSS and private memory from /proc/<pid>/smaps_rollup. Also
+reports launch-to-first-answer and, after SIGKILLing every worker, the
+time until a respawned worker answers. Linux only.
+
+Usage: python benchmarks/bench_startup.py [workers] [runs]
+"""
+import os
+import random
+import signal
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import httpx  # noqa: E402
+
+from corpus import make_resume_pdf  # noqa: E402
+from fake_groq import FakeGroq  # noqa: E402
+from harness import gunicorn  # noqa: E402
+
+SKILLS = ["Python", "AWS", "Docker", "SQL", "React", "Kubernetes", "Go", "Java"]
+JD = "Backend engineer: Python, AWS, Docker, Kubernetes, SQL"
+
+FIRST_REQUEST = """
+import io
+import app
+client = app.app.test_client()
+with open({pdf!r}, 'rb') as f:
+    response = client.post('/analyze', data={{'resume': (io.BytesIO(f.read()), 'r.pdf'), 'jd_text': {jd!r}}})
+assert response.status_code == 200 and response.get_json()['ai_analysis']['overall_fit'] == 'Fake analysis.'
+"""
+IMPORT_MODES = [
+    ('import app (lazy)', "import app"),
+    ('import app + libraries (eager)', "import app, startup; startup.preload()"),
+    ('import app + first PDF analysis', None),
+]
+TIMED = """
+import resource, time
+start = time.perf_counter()
+{code}
+print(time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def time_import(code, env, runs):
+    seconds, peak_kb = [], []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, '-c', TIMED.format(code=code)], cwd=ROOT, env=env,
+                             capture_output=True, text=True, check=True).stdout.split()
+        seconds.append(float(out[-2]))
+        peak_kb.append(int(out[-1]))
+    return statistics.median(seconds), statistics.median(peak_kb) / 1024
+
+
+def worker_pids(master_pid):
+    with open(f'/proc/{master_pid}/task/{master_pid}/children') as f:
+        return [int(pid) for pid in f.read().split()]
+
+
+def memory_mb(pid):
+    """Rss, Pss and Private (clean + dirty) of one process, in MB"""
+    fields = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1]) / 1024
+    return fields['Rss'], fields['Pss'], fields['Private_Clean'] + fields['Private_Dirty']
+
+
+def analyze_pdfs(url, pdfs, concurrency):
+    def one(pdf):
+        return httpx.post(f'{url}/analyze', files={'resume': ('r.pdf', pdf)}, data={'jd_text': JD},
+                          timeout=60).status_code
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(one, pdfs))
+
+
+def respawn_seconds(url, master_pid):
+    """SIGKILL every worker, then time until the master's replacements answer"""
+    for pid in worker_pids(master_pid):
+        os.kill(pid, signal.SIGKILL)
+    start = time.perf_counter()
+    time.sleep(0.05)
+    while True:
+        try:
+            httpx.get(f'{url}/metrics', timeout=1)
+            return time.perf_counter() - start
+        except httpx.HTTPError:
+            time.sleep(0.02)
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    server = FakeGroq(latency=0.01).start()
+    env = dict(os.environ, GROQ_API_KEY='fake', GROQ_API_BASE=server.url, BATCH_PARSE_WORKERS='0')
+    rng = random.Random(20)
+    pdfs = [make_resume_pdf(rng, SKILLS, pages=2) for _ in range(workers * 8)]
+    pdf_path = os.path.join(ROOT, 'uploads', 'bench_startup.pdf')
+    os.makedirs(os.path.dirname(pdf_path), exist_ok=True)
+    with open(pdf_path, 'wb') as f:
+        f.write(pdfs[0])
+
+    try:
+        print(f"Fresh interpreter, median of {runs}\n")
+        print(f"{'mode':<34} | {'seconds':>7} | {'peak RSS MB':>11}")
+        print("-" * 58)
+        for name, code in IMPORT_MODES:
+            code = code or FIRST_REQUEST.format(pdf=pdf_path, jd=JD)
+            seconds, peak_mb = time_import(code, env, runs)
+            print(f"{name:<34} | {seconds:>7.3f} | {peak_mb:>11.1f}")
+
+        print(f"\ngunicorn, {workers} sync workers, warmed with {len(pdfs)} PDF analyses\n")
+        print(f"{'mode':<12} | {'ready s':>7} | {'respawn s':>9} | {'RSS/worker':>10} | {'PSS/worker':>10} | "
+              f"{'private/worker':>14} | {'total PSS':>9}")
+        print("-" * 92)
+        for preload in ('false', 'true'):
+            with gunicorn(['-k', 'sync', 'app:app'], {**env, 'PRELOAD_APP': preload}, workers=workers) as app_server:
+                assert set(analyze_pdfs(app_server.url, pdfs, workers)) == {200}
+                usage = [memory_mb(pid) for pid in worker_pids(app_server.pid)]
+                total_pss = sum(pss for _, pss, _ in usage) + memory_mb(app_server.pid)[1]
+                respawn = respawn_seconds(app_server.url, app_server.pid)
+            rss, pss, private = (statistics.mean(column) for column in zip(*usage))
+            label = 'preload' if preload == 'true' else 'per-worker'
+            print(f"{label:<12} | {app_server.ready_seconds:>7.2f} | {respawn:>9.2f} | {rss:>8.1f}MB | "
+                  f"{pss:>8.1f}MB | {private:>12.1f}MB | {total_pss:>7.1f}MB")
+    finally:
+        server.stop()
+        os.remove(pdf_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark: /analyze-multi (one JSON blob) vs /analyze-multi/stream (NDJSON)
+
+Measures time to the first candidate, total time and peak traced Python
+memory while serving one batch, using a stub LLM that sleeps.
+
+Usage: python benchmarks/bench_stream.py [resume_count] [llm_latency_seconds]
+"""
+import io
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+os.environ.setdefault('GROQ_API_KEY', 'benchmark-fake-key')
+
+import app as resumeiq  # noqa: E402
+from bench_triage import CountingLLM  # noqa: E402
+from config import Config  # noqa: E402
+from corpus import make_resume_txt, taxonomy_skills  # noqa: E402
+
+
+def form(resumes, jd_text):
+    return {
+        'jd_text': jd_text,
+        'resumes': [(io.BytesIO(body), f"resume_{i}.txt") for i, body in enumerate(resumes)]
+    }
+
+
+def blocking(client, resumes, jd_text):
+    start = time.perf_counter()
+    response = client.post('/analyze-multi', data=form(resumes, jd_text), content_type='multipart/form-data')
+    body = response.get_json()
+    elapsed = time.perf_counter() - start
+    assert body['count'] == len(resumes)
+    return elapsed, elapsed
+
+
+def streaming(client, resumes, jd_text):
+    start = time.perf_counter()
+    response = client.post('/analyze-multi/stream?format=ndjson', data=form(resumes, jd_text),
+                           content_type='multipart/form-data', buffered=False)
+    first = None
+    count = 0
+    for line in response.response:
+        event = json.loads(line)
+        if event['event'] == 'result':
+            count += 1
+            if first is None:
+                first = time.perf_counter() - start
+    elapsed = time.perf_counter() - start
+    assert count == len(resumes)
+    return first, elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.1
+
+    rng = random.Random(17)
+    skills = taxonomy_skills(resumeiq.TAXONOMY.current().skills)
+    resumes = [make_resume_txt(rng, skills, lines=400) for _ in range(count)]
+    jd_text = "Senior Engineer\n" + ", ".join(rng.sample(skills, 30))
+
+    Config.TRIAGE_MODE = 'off'
+    Config.BATCH_PARSE_WORKERS = 0  # keep parsing in-process so tracemalloc sees it
+    client = resumeiq.app.test_client()
+
+    print(f"{count} resumes, stub LLM latency {latency * 1000:.0f} ms\n")
+    print(f"{'endpoint':<22} | {'first result s':>14} | {'total s':>7} | {'peak MB':>7}")
+    print("-" * 60)
+    for name, fn in (('/analyze-multi', blocking), ('/analyze-multi/stream', streaming)):
+        resumeiq.PARSE_CACHE.clear()
+        resumeiq.LLM_CACHE.clear()
+        resumeiq.llm = CountingLLM(latency)
+        tracemalloc.start()
+        first, total = fn(client, resumes, jd_text)
+        peak = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+        print(f"{name:<22} | {first:>14.2f} | {total:>7.2f} | {peak:>7.1f}")
+
+
+if __name__ == '__main__':
+    main()
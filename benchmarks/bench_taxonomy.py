@@ -0,0 +1,100 @@
+"""Benchmark: compiled taxonomy cost at the shipped size vs a 10x synthetic one
+
+Reports compile time, extraction time per 10KB resume, alias lookups per
+second and how long a hot reload takes to go live after skills.json changes.
+
+Usage: python benchmarks/bench_taxonomy.py [scale]
+"""
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import resume_lines, taxonomy_skills  # noqa: E402
+from taxonomy import CompiledTaxonomy, TaxonomyStore  # noqa: E402
+
+
+def scaled(taxonomy, aliases, scale):
+    """Taxonomy with every skill (and alias) repeated under scale variants"""
+    if scale == 1:
+        return taxonomy, aliases
+    big = {category: [f"{skill} {i}" if i else skill for i in range(scale) for skill in skills_list]
+           for category, skills_list in taxonomy.items()}
+    big_aliases = {f"{skill} {i}" if i else skill: [f"{alias} {i}" if i else alias for alias in spellings]
+                   for i in range(scale) for skill, spellings in aliases.items()}
+    return big, big_aliases
+
+
+def best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def reload_latency(taxonomy, aliases):
+    """Seconds from rewriting skills.json to the new version serving lookups"""
+    directory = tempfile.mkdtemp(prefix='bench-taxonomy-')
+    try:
+        taxonomy_path = os.path.join(directory, 'skills.json')
+        aliases_path = os.path.join(directory, 'skill_aliases.json')
+        with open(taxonomy_path, 'w') as f:
+            json.dump(taxonomy, f)
+        with open(aliases_path, 'w') as f:
+            json.dump(aliases, f)
+        store = TaxonomyStore(taxonomy_path, aliases_path, check_interval=0)
+
+        changed = dict(taxonomy)
+        first = next(iter(changed))
+        changed[first] = list(changed[first]) + ["Benchmark Skill"]
+        with open(taxonomy_path, 'w') as f:
+            json.dump(changed, f)
+        start = time.perf_counter()
+        assert store.reload_if_changed()
+        assert store.current().lookup("benchmark skill")
+        return time.perf_counter() - start
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main():
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    with open(os.path.join(ROOT, 'skills.json'), 'r') as f:
+        taxonomy = json.load(f)
+    with open(os.path.join(ROOT, 'skill_aliases.json'), 'r') as f:
+        aliases = json.load(f)
+
+    print(f"{'taxonomy':>8} | {'skills':>6} | {'aliases':>7} | {'compile ms':>10} | {'extract ms':>10} | "
+          f"{'lookups/s':>10} | {'reload ms':>9}")
+    print("-" * 80)
+    for factor in (1, scale):
+        db, db_aliases = scaled(taxonomy, aliases, factor)
+        start = time.perf_counter()
+        compiled = CompiledTaxonomy(db, db_aliases)
+        compile_ms = (time.perf_counter() - start) * 1000
+
+        rng = random.Random(11)
+        skills = taxonomy_skills(db)
+        spellings = [alias for spellings in db_aliases.values() for alias in spellings]
+        text = "\n".join(resume_lines(rng, skills + spellings, lines=80))[:10 * 1024]
+        extract = best_of(lambda: compiled.extract(text), 20)
+
+        names = [rng.choice(skills + spellings).upper() for _ in range(100000)]
+        lookup = best_of(lambda: [compiled.lookup(name) for name in names], 3)
+
+        reload = reload_latency(db, db_aliases)
+        print(f"{factor:>7}x | {compiled.skill_count:>6} | {compiled.alias_count:>7} | {compile_ms:>10.1f} | "
+              f"{extract * 1000:>10.2f} | {len(names) / lookup:>10.0f} | {reload * 1000:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""Benchmark: batch LLM triage modes (off / short / template) against a stub LLM
+
+Reports wall time, LLM calls and estimated Groq token spend (characters / 4)
+for one batch of resumes whose ATS scores spread from near 0 to high.
+
+Usage: python benchmarks/bench_triage.py [resume_count] [llm_latency_seconds]
+"""
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+os.environ.setdefault('GROQ_API_KEY', 'benchmark-fake-key')
+
+import app as resumeiq  # noqa: E402
+from config import Config  # noqa: E402
+from corpus import resume_lines, taxonomy_skills  # noqa: E402
+
+FULL_RESPONSE = json.dumps({
+    "overall_fit": "Solid match for the core stack.",
+    "strengths": ["Python", "AWS", "SQL", "Docker", "Testing"],
+    "weaknesses": ["Kubernetes", "Terraform", "Go", "Kafka", "Spark"],
+    "red_flags": "",
+    "recommendation": "Moderate Fit",
+    "confidence": "Medium",
+    "learning_plan_30": "Ship a small service on Kubernetes.",
+    "learning_plan_60": "Own a Terraform module end to end.",
+    "learning_plan_90": "Lead a streaming pipeline project.",
+    "resume_tips": "Quantify impact and mirror the JD's keywords."
+})
+SHORT_RESPONSE = json.dumps({"overall_fit": "Limited overlap with the role.", "recommendation": "Weak Fit"})
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.content = content
+
+
+class CountingLLM:
+    """Stub ChatGroq that sleeps and tallies calls and token estimates"""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.prompt_chars = 0
+        self.completion_chars = 0
+
+    def invoke(self, messages):
+        prompt = "".join(m.content for m in messages)
+        # The short prompt asks for two fields; answer in kind
+        content = SHORT_RESPONSE if "Reply in JSON" in prompt else FULL_RESPONSE
+        time.sleep(self.latency)
+        with self.lock:
+            self.calls += 1
+            self.prompt_chars += len(prompt)
+            self.completion_chars += len(content)
+        return FakeResponse(content)
+
+
+def make_batch(rng, skills, jd_skills, count):
+    """Resumes drawing an increasing share of their skills from the JD"""
+    resumes = []
+    for i in range(count):
+        overlap = rng.random() ** 2  # most candidates match poorly, as in real pipelines
+        pool = rng.sample(jd_skills, max(1, int(len(jd_skills) * overlap))) + rng.sample(skills, 10)
+        body = "\n".join(resume_lines(rng, pool, lines=60, skill_rate=0.2))
+        resumes.append((f"resume_{i}.txt", body.encode('utf-8')))
+    return resumes
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.2
+
+    rng = random.Random(13)
+    skills = taxonomy_skills(resumeiq.TAXONOMY.current().skills)
+    jd_skills = rng.sample(skills, 30)
+    jd_data = resumeiq.parse_job_description(text="Senior Engineer\n" + ", ".join(jd_skills))
+    resumes = make_batch(rng, skills, jd_skills, count)
+
+    print(f"{count} resumes, stub LLM latency {latency * 1000:.0f} ms, "
+          f"threshold {Config.TRIAGE_MIN_SCORE}, top-N {Config.TRIAGE_TOP_N}\n")
+    print(f"{'mode':<9} | {'seconds':>7} | {'resumes/s':>9} | {'LLM calls':>9} | {'saved':>5} | "
+          f"{'prompt tok':>10} | {'output tok':>10}")
+    print("-" * 78)
+    for mode in ('off', 'short', 'template'):
+        Config.TRIAGE_MODE = mode
+        resumeiq.PARSE_CACHE.clear()
+        resumeiq.LLM_CACHE.clear()
+        fake = CountingLLM(latency)
+        resumeiq.llm = fake
+
+        start = time.perf_counter()
+        results, errors, triage = resumeiq.run_multi_analysis(resumes, jd_data)
+        elapsed = time.perf_counter() - start
+        assert len(results) == count and not errors
+        assert fake.calls == triage['llm_calls']
+
+        print(f"{mode:<9} | {elapsed:>7.2f} | {count / elapsed:>9.1f} | {fake.calls:>9} | "
+              f"{triage['llm_calls_saved']:>5} | {fake.prompt_chars // 4:>10} | {fake.completion_chars // 4:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""Benchmark: disk round-trip through UPLOAD_FOLDER vs in-memory upload parsing
+
+"disk" reproduces the old flow (FileStorage.save into uploads/, parse from
+the path, os.remove). "memory" buffers the upload with UploadBuffer and
+parses the bytes. Both run under concurrent threads; file-system traffic is
+read from /proc/self/io where available.
+
+Usage: python benchmarks/bench_upload_io.py [txt_uploads] [threads]
+(the PDF corpus is a fifth of the TXT one; pdfplumber dominates its time)
+"""
+import io
+import os
+import random
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+os.environ.setdefault('GROQ_API_KEY', 'benchmark-fake-key')
+
+from werkzeug.datastructures import FileStorage  # noqa: E402
+
+import app as resumeiq  # noqa: E402
+from config import Config  # noqa: E402
+from corpus import make_resume_pdf, make_resume_txt, taxonomy_skills  # noqa: E402
+from upload_buffer import UploadBuffer  # noqa: E402
+
+
+def io_counters():
+    """{'syscr', 'syscw', 'rchar', 'wchar'} for this process, or {} off Linux"""
+    try:
+        with open('/proc/self/io') as f:
+            return {k: int(v) for k, v in (line.split(': ') for line in f)}
+    except OSError:
+        return {}
+
+
+def disk_roundtrip(filename, payload):
+    upload = FileStorage(io.BytesIO(payload), filename)
+    path = os.path.join(resumeiq.app.config['UPLOAD_FOLDER'], f"{uuid.uuid4().hex}_{filename}")
+    upload.save(path)
+    try:
+        return resumeiq.parse_resume(path)
+    finally:
+        os.remove(path)
+
+
+def in_memory(filename, payload):
+    upload = FileStorage(io.BytesIO(payload), filename)
+    buffer = UploadBuffer.from_upload(upload, Config.UPLOAD_MEMORY_LIMIT)
+    try:
+        return resumeiq.parse_resume(buffer.source, buffer.filename)
+    finally:
+        buffer.close()
+
+
+def run(fn, files, threads):
+    before = io_counters()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(lambda item: fn(*item), files))
+    elapsed = time.perf_counter() - start
+    after = io_counters()
+    delta = {k: after[k] - before[k] for k in after}
+    return results, elapsed, delta
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    rng = random.Random(11)
+    skills = taxonomy_skills(resumeiq.TAXONOMY.current().skills)
+
+    corpora = {
+        'txt': [(f"resume_{i}.txt", make_resume_txt(rng, skills)) for i in range(count)],
+        'pdf': [(f"resume_{i}.pdf", make_resume_pdf(rng, skills)) for i in range(max(1, count // 5))],
+    }
+
+    # Warm the matcher and pdfplumber imports so neither mode pays for them
+    for files in corpora.values():
+        in_memory(*files[0])
+
+    print(f"{threads} threads")
+    print(f"{'corpus':>6} | {'files':>5} | {'mode':>6} | {'uploads/s':>9} | {'ms/upload':>9} | {'syscalls/upload':>15} | {'KB written/upload':>17}")
+    print("-" * 88)
+    for name, files in corpora.items():
+        baseline = None
+        for mode, fn in (('disk', disk_roundtrip), ('memory', in_memory)):
+            results, elapsed, delta = run(fn, files, threads)
+            if baseline is None:
+                baseline = results
+            else:
+                assert [r['skills'] for r in results] == [r['skills'] for r in baseline]
+            n = len(files)
+            syscalls = (delta.get('syscr', 0) + delta.get('syscw', 0)) / n
+            written = delta.get('wchar', 0) / n / 1024
+            print(f"{name:>6} | {n:>5} | {mode:>6} | {n / elapsed:>9.0f} | {elapsed / n * 1000:>9.2f} | "
+                  f"{syscalls:>15.1f} | {written:>17.1f}")
+
+    print("\nParsed skills identical in both modes.")
+
+
+if __name__ == '__main__':
+    main()
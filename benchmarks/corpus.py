@@ -0,0 +1,112 @@
+"""Synthetic resume documents and job descriptions for the benchmarks (TXT text and minimal PDFs)"""
+import random
+
+FILLER = ["led", "built", "team", "delivery", "shipped", "designed", "owned", "improved", "platform", "service"]
+
+
+def resume_lines(rng, skills, lines=40, skill_rate=0.15):
+    """Plain resume-like lines: a name, contact details, then prose with skills"""
+    chosen = rng.sample(skills, min(25, len(skills)))
+    out = [f"Candidate {rng.randint(1000, 9999)}", f"candidate{rng.randint(1, 10 ** 6)}@example.com", "+1 555 010 2030"]
+    for _ in range(lines):
+        words = [rng.choice(chosen) if rng.random() < skill_rate else rng.choice(FILLER) for _ in range(12)]
+        out.append(" ".join(words))
+    return out
+
+
+def make_pdf(pages):
+    """Smallest valid PDF with one Helvetica text block per page.
+
+    pages is a list of pages, each a list of text lines.
+    """
+    def escape(line):
+        return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once the page ids are known
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for lines in pages:
+        stream = "BT /F1 11 Tf 50 750 Td 14 TL " + " ".join(f"({escape(line)}) '" for line in lines) + " ET"
+        page_id, content_id = len(objects) + 1, len(objects) + 2
+        kids.append(f"{page_id} 0 R")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode('latin-1')
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def make_resume_pdf(rng, skills, pages=2):
+    return make_pdf([resume_lines(rng, skills, lines=45) for _ in range(pages)])
+
+
+def make_resume_txt(rng, skills, lines=120):
+    return "\n".join(resume_lines(rng, skills, lines=lines)).encode('utf-8')
+
+
+def make_jd(rng, skills, required=12):
+    """Job description text: a title line, then requirement bullets naming skills"""
+    wanted = rng.sample(skills, min(required, len(skills)))
+    lines = [f"Senior Engineer {rng.randint(100, 999)}", "Requirements:"]
+    lines += [f"- {rng.choice(['Strong', 'Hands-on', 'Production'])} experience with {skill}" for skill in wanted]
+    return "\n".join(lines)
+
+
+def make_sectioned_resume(rng, skills, jobs=4):
+    """Resume text laid out the way real ones are: contact header, summary,
+    experience, projects, skills and education sections"""
+    chosen = rng.sample(skills, min(25, len(skills)))
+
+    def prose(words, skill_rate=0.15):
+        return " ".join(rng.choice(chosen) if rng.random() < skill_rate else rng.choice(FILLER) for _ in range(words))
+
+    out = [f"Candidate {rng.randint(1000, 9999)}", f"candidate{rng.randint(1, 10 ** 6)}@example.com",
+           "+1 555 010 2030", "linkedin.com/in/candidate", "", "PROFESSIONAL SUMMARY", prose(40, 0.05), "",
+           "WORK EXPERIENCE"]
+    for job in range(jobs):
+        out += ["", f"Engineer {job + 1}, Company {rng.randint(10, 99)} | 20{10 + job}-20{11 + job}"]
+        out += [f"- {prose(18)}" for _ in range(rng.randint(4, 7))]
+    out += ["", "PROJECTS"]
+    for project in range(3):
+        out += ["", f"Project {project + 1}", f"- {prose(20)}", f"- {prose(20)}"]
+    out += ["", "TECHNICAL SKILLS", ", ".join(chosen), "", "EDUCATION",
+            "B.S. Computer Science, State University, 2009", "", "INTERESTS", prose(25, 0)]
+    return "\n".join(out)
+
+
+def make_sectioned_jd(rng, skills, required=12):
+    """Job description with the usual company blurb, responsibilities,
+    requirements and benefits sections"""
+    wanted = rng.sample(skills, min(required, len(skills)))
+    blurb = " ".join(rng.choice(FILLER + ["mission", "customers", "growth", "values"]) for _ in range(60))
+    lines = [f"Senior Engineer {rng.randint(100, 999)}", "", "About Us", blurb, "", "Responsibilities"]
+    lines += [f"- {rng.choice(['Design', 'Build', 'Own'])} {rng.choice(FILLER)} with {skill}" for skill in wanted[:4]]
+    lines += ["", "Requirements"]
+    lines += [f"- {rng.choice(['Strong', 'Hands-on', 'Production'])} experience with {skill}" for skill in wanted]
+    lines += ["", "Benefits", blurb, "", "Equal Opportunity", blurb]
+    return "\n".join(lines)
+
+
+def taxonomy_skills(taxonomy):
+    return [skill for skills in taxonomy.values() for skill in skills]
+
+
+if __name__ == '__main__':
+    rng = random.Random(0)
+    print(len(make_resume_pdf(rng, ["Python", "AWS", "SQL"])), "byte sample PDF")
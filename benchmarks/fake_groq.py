@@ -0,0 +1,130 @@
+"""Local stand-in for Groq's OpenAI-compatible chat API with injectable faults
+
+    server = FakeGroq(latency=0.05, error_rate=0.3, error_status=503)
+    server.start()   # then point GROQ_API_BASE / create_groq_gateway at server.url
+    server.configure(error_rate=1.0)   # change behaviour between scenarios
+    server.stop()
+
+Handles POST .../chat/completions, plain and stream=true (SSE chunks).
+Counts requests, injected errors and TCP connections opened, so callers
+can check retries and connection reuse.
+"""
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REPLY = json.dumps({
+    "overall_fit": "Fake analysis.", "strengths": ["Python"], "weaknesses": ["Go"], "red_flags": "",
+    "recommendation": "Moderate Fit", "confidence": "Medium", "learning_plan_30": "Practice Go.",
+    "learning_plan_60": "Ship a Go service.", "learning_plan_90": "Own it.", "resume_tips": "Quantify impact."
+})
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, so connection reuse is visible
+
+    def setup(self):
+        super().setup()
+        self.server.fake.count('connections')
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        fake = self.server.fake
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        fake.count('requests')
+        if not self.path.endswith('/chat/completions'):
+            return self._json(404, {"error": {"message": "not found"}})
+        request = json.loads(body or b'{}')
+
+        settings = fake.settings()
+        time.sleep(settings['latency'] * (0.5 + fake.rng.random()))
+        if fake.rng.random() < settings['error_rate']:
+            fake.count('errors')
+            headers = {'Retry-After': str(settings['retry_after'])} if settings['retry_after'] is not None else {}
+            return self._json(settings['error_status'], {"error": {"message": "injected failure"}}, headers)
+
+        prompt_tokens = sum(len(str(m.get('content', ''))) for m in request.get('messages', [])) // 4
+        if request.get('stream'):
+            return self._stream(request.get('model'), prompt_tokens)
+        return self._json(200, {
+            "id": "chatcmpl-fake", "object": "chat.completion", "created": int(time.time()),
+            "model": request.get('model'),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": REPLY}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": len(REPLY) // 4,
+                      "total_tokens": prompt_tokens + len(REPLY) // 4}
+        })
+
+    def _json(self, status, payload, headers=None):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        try:
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True  # the client gave up (timeout) first
+
+    def _stream(self, model, prompt_tokens):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        words = REPLY.split(' ')
+        for i, word in enumerate(words):
+            chunk = {"id": "chatcmpl-fake", "object": "chat.completion.chunk", "created": int(time.time()),
+                     "model": model, "choices": [{"index": 0, "delta": {"content": word + (' ' if i < len(words) - 1 else '')},
+                                                  "finish_reason": None}]}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.close_connection = True
+
+
+class FakeGroq:
+    def __init__(self, latency=0.05, error_rate=0.0, error_status=503, retry_after=None, seed=1):
+        self.rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._settings = {}
+        self.counts = {}
+        self.configure(latency=latency, error_rate=error_rate, error_status=error_status, retry_after=retry_after)
+        self.reset_counts()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self._server.daemon_threads = True
+        self._server.fake = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def configure(self, **settings):
+        with self._lock:
+            self._settings.update(settings)
+
+    def settings(self):
+        with self._lock:
+            return dict(self._settings)
+
+    def count(self, name):
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + 1
+
+    def reset_counts(self):
+        with self._lock:
+            self.counts = {'requests': 0, 'errors': 0, 'connections': 0}
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,59 @@
+"""Shared helpers for the load benchmarks: latency summaries and a gunicorn runner"""
+import os
+import subprocess
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(ordered, q):
+    """q-th percentile (0-1) of an already sorted list, nearest rank"""
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def summarize(seconds):
+    """Latency stats in milliseconds for a list of durations in seconds"""
+    ordered = sorted(seconds)
+    return {
+        'n': len(ordered),
+        'mean_ms': round(sum(ordered) / len(ordered) * 1000, 3),
+        'p50_ms': round(percentile(ordered, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(ordered, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(ordered, 0.99) * 1000, 3),
+    }
+
+
+@contextmanager
+def gunicorn(worker_args, env=None, port=8731, workers=1):
+    """Run the app under gunicorn from the repo root. Once GET /metrics
+    answers, yields the server: its base url, the master's pid and
+    ready_seconds (launch to first answer). worker_args picks the worker
+    class and app, e.g. ['-k', 'asgi', 'asgi:application']."""
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        ['gunicorn', '-w', str(workers), '--timeout', '120', '-b', f'127.0.0.1:{port}'] + worker_args,
+        cwd=ROOT, env=dict(os.environ, **(env or {})), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    url = f'http://127.0.0.1:{port}'
+    try:
+        for _ in range(300):
+            try:
+                httpx.get(f'{url}/metrics', timeout=1)
+                break
+            except httpx.HTTPError:
+                if process.poll() is not None:
+                    raise RuntimeError(f"gunicorn {' '.join(worker_args)} failed to start")
+                time.sleep(0.1)
+        else:
+            raise RuntimeError("gunicorn did not come up")
+        yield SimpleNamespace(url=url, pid=process.pid, ready_seconds=time.perf_counter() - start)
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=40)
+        except subprocess.TimeoutExpired:
+            process.kill()
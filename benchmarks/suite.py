@@ -0,0 +1,274 @@
+"""Benchmark suite: hot-path micro-benchmarks and end-to-end load, as JSON
+
+Builds a synthetic corpus from skills.json (TXT resumes, PDFs of 1 to 20
+pages, job descriptions) and times parse_pdf, extract_skills_from_text,
+extract_contact_info and calculate_skill_match in-process. Then it serves
+the app with gunicorn against a fake Groq (fake_groq.py) and load-tests
+POST /analyze, /batch and /analyze-multi.
+
+Results go to stdout as a table and, with --output, to a JSON file.
+Given a baseline (benchmarks/baseline-<profile>.json by default) each p50
+latency and req/s figure is compared with it, and the exit status is 1 if
+any of them regressed by more than --threshold or any load-test request
+failed (a run with failures is not saved as a baseline either). Baselines
+are only comparable on the same machine and profile; refresh one with
+--save-baseline.
+
+Usage:
+    python benchmarks/suite.py [--quick] [--output run.json]
+    python benchmarks/suite.py --save-baseline
+    python benchmarks/suite.py --skip-load --baseline other.json --threshold 0.1
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+os.environ.setdefault('GROQ_API_KEY', 'benchmark-fake-key')
+
+import httpx  # noqa: E402
+
+import app as resumeiq  # noqa: E402
+from corpus import make_jd, make_resume_pdf, make_resume_txt  # noqa: E402
+from fake_groq import FakeGroq  # noqa: E402
+from harness import gunicorn, summarize  # noqa: E402
+
+BASELINE_PATH = os.path.join(ROOT, 'benchmarks', 'baseline-{profile}.json')
+PDF_PAGES = [1, 5, 20]
+PROFILES = {
+    'quick': {'repeat': 50, 'requests': 24, 'concurrency': 4, 'batch_size': 5},
+    'full': {'repeat': 100, 'requests': 60, 'concurrency': 8, 'batch_size': 10},
+}
+WORKERS = {
+    'sync': ['-k', 'sync', 'app:app'],
+    'gthread': ['-k', 'gthread', '--threads', '8', 'app:app'],
+    'asgi': ['-k', 'asgi', 'asgi:application'],
+}
+# Figures compared with the baseline, and which direction is better
+COMPARED = {'p50_ms': 'lower', 'rps': 'higher'}
+
+
+# ----------------------------------------------------------------------------
+# Micro-benchmarks
+# ----------------------------------------------------------------------------
+
+def time_calls(fn, inputs, repeat):
+    """Latency stats for repeat calls of fn, cycling through inputs, after a warm-up pass"""
+    for value in inputs:
+        fn(value)
+    durations = []
+    for value in itertools.islice(itertools.cycle(inputs), repeat):
+        start = time.perf_counter()
+        fn(value)
+        durations.append(time.perf_counter() - start)
+    return summarize(durations)
+
+
+def micro_benchmarks(rng, skills, repeat):
+    results = {}
+    for pages in PDF_PAGES:
+        documents = [make_resume_pdf(rng, skills, pages=pages) for _ in range(3)]
+        results[f'micro/parse_pdf/{pages}p'] = time_calls(resumeiq.parse_pdf, documents, max(5, repeat // pages))
+
+    texts = [make_resume_txt(rng, skills).decode('utf-8') for _ in range(20)]
+    results['micro/extract_skills_from_text'] = time_calls(resumeiq.extract_skills_from_text, texts, repeat * 10)
+    results['micro/extract_contact_info'] = time_calls(resumeiq.extract_contact_info, texts, repeat * 10)
+
+    jd_skills = [resumeiq.extract_skills_from_text(make_jd(rng, skills)) for _ in range(5)]
+    pairs = [(resumeiq.extract_skills_from_text(text), jd) for text, jd in zip(texts, itertools.cycle(jd_skills))]
+    results['micro/calculate_skill_match'] = time_calls(
+        lambda pair: resumeiq.calculate_skill_match(*pair), pairs, repeat * 10
+    )
+    return results
+
+
+# ----------------------------------------------------------------------------
+# End-to-end load
+# ----------------------------------------------------------------------------
+
+def resume_upload(rng, skills, index):
+    """(filename, bytes): alternating TXT and two-page PDF resumes"""
+    if index % 2:
+        return f'resume_{index}.pdf', make_resume_pdf(rng, skills, pages=2)
+    return f'resume_{index}.txt', make_resume_txt(rng, skills)
+
+
+def load_payloads(rng, skills, endpoint, requests, batch_size):
+    counter = itertools.count()
+    payloads = []
+    for _ in range(requests):
+        data = {'jd_text': make_jd(rng, skills)}
+        if endpoint == '/analyze':
+            files = {'resume': resume_upload(rng, skills, next(counter))}
+        else:
+            files = [('resumes', resume_upload(rng, skills, next(counter))) for _ in range(batch_size)]
+        payloads.append((files, data))
+    return payloads
+
+
+def load_test(url, endpoint, payloads, concurrency):
+    """POST every payload to endpoint from concurrent clients; latency stats plus req/s"""
+    with httpx.Client(base_url=url, timeout=120) as client:
+        def one(payload):
+            files, data = payload
+            start = time.perf_counter()
+            try:
+                ok = client.post(endpoint, files=files, data=data).status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            return ok, time.perf_counter() - start
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            outcomes = list(pool.map(one, payloads))
+        wall = time.perf_counter() - start
+
+    stats = summarize([seconds for _, seconds in outcomes])
+    stats['rps'] = round(len(payloads) / wall, 2)
+    stats['errors'] = sum(not ok for ok, _ in outcomes)
+    return stats
+
+
+def load_benchmarks(rng, skills, profile, worker, llm_latency):
+    server = FakeGroq(latency=llm_latency).start()
+    env = {'GROQ_API_KEY': 'fake', 'GROQ_API_BASE': server.url, 'LLM_CACHE_MAX_ENTRIES': '0'}
+    results = {}
+    try:
+        with gunicorn(WORKERS[worker], env) as app_server:
+            concurrency = profile['concurrency']
+            for endpoint in ('/analyze', '/batch', '/analyze-multi'):
+                payloads = load_payloads(rng, skills, endpoint, profile['requests'], profile['batch_size'])
+                load_test(app_server.url, endpoint, payloads[:concurrency], concurrency)  # warm-up
+                results[f'load{endpoint}'] = load_test(app_server.url, endpoint, payloads, concurrency)
+    finally:
+        server.stop()
+    return results
+
+
+# ----------------------------------------------------------------------------
+# Reporting
+# ----------------------------------------------------------------------------
+
+def run_metadata(args):
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'profile': 'quick' if args.quick else 'full',
+        'worker': args.worker,
+        'llm_latency': args.llm_latency,
+        'taxonomy_version': resumeiq.TAXONOMY.version,
+    }
+
+
+def compare(results, baseline, threshold):
+    """One row per compared figure present in both runs, plus one per load
+    test's failed requests: any failure fails the comparison, since failed
+    requests make the timings meaningless (they usually come back fast)"""
+    rows = []
+    for name, stats in results.items():
+        before = baseline.get('results', {}).get(name, {})
+        if 'errors' in stats:
+            rows.append({'metric': f'{name}.errors', 'baseline': before.get('errors', 0), 'current': stats['errors'],
+                         'change_pct': None, 'regressed': stats['errors'] > 0})
+        for key, better in COMPARED.items():
+            if not before.get(key) or key not in stats:
+                continue
+            change = (stats[key] - before[key]) / before[key]
+            regressed = change > threshold if better == 'lower' else change < -threshold
+            rows.append({'metric': f'{name}.{key}', 'baseline': before[key], 'current': stats[key],
+                         'change_pct': round(change * 100, 1), 'regressed': regressed})
+    return rows
+
+
+def print_results(results):
+    print(f"{'benchmark':<34} | {'n':>5} | {'p50 ms':>9} | {'p95 ms':>9} | {'p99 ms':>9} | {'req/s':>7}")
+    print("-" * 86)
+    for name, stats in results.items():
+        rps = f"{stats['rps']:>7.1f}" if 'rps' in stats else f"{'':>7}"
+        print(f"{name:<34} | {stats['n']:>5} | {stats['p50_ms']:>9.3f} | {stats['p95_ms']:>9.3f} | "
+              f"{stats['p99_ms']:>9.3f} | {rps}")
+
+
+def print_comparison(rows, threshold):
+    print(f"\nAgainst baseline (regression = worse by more than {threshold:.0%})\n")
+    print(f"{'metric':<42} | {'baseline':>10} | {'current':>10} | {'change':>8}")
+    print("-" * 80)
+    for row in rows:
+        flag = '  REGRESSED' if row['regressed'] else ''
+        change = f"{row['change_pct']:>+7.1f}%" if row['change_pct'] is not None else f"{'':>8}"
+        print(f"{row['metric']:<42} | {row['baseline']:>10.3f} | {row['current']:>10.3f} | {change}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--quick', action='store_true', help='smaller corpus and load (CI smoke run)')
+    parser.add_argument('--skip-micro', action='store_true')
+    parser.add_argument('--skip-load', action='store_true')
+    parser.add_argument('--worker', choices=sorted(WORKERS), default='gthread', help='gunicorn worker class for load')
+    parser.add_argument('--llm-latency', type=float, default=0.2, help='fake Groq latency in seconds')
+    parser.add_argument('--output', help='write the JSON report here')
+    parser.add_argument('--baseline', help='baseline JSON to compare with (default: benchmarks/baseline-<profile>.json)')
+    parser.add_argument('--save-baseline', action='store_true', help='write this run to --baseline instead')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed slowdown before failing (0.25 = 25%%)')
+    args = parser.parse_args()
+
+    profile = PROFILES['quick' if args.quick else 'full']
+    args.baseline = args.baseline or BASELINE_PATH.format(profile='quick' if args.quick else 'full')
+    rng = random.Random(19)
+    skills = [skill for skills in resumeiq.TAXONOMY.current().skills.values() for skill in skills]
+
+    report = {'meta': run_metadata(args), 'results': {}}
+    if not args.skip_micro:
+        report['results'].update(micro_benchmarks(rng, skills, profile['repeat']))
+    if not args.skip_load:
+        report['results'].update(load_benchmarks(rng, skills, profile, args.worker, args.llm_latency))
+    print_results(report['results'])
+
+    regressed = False
+    failed = {name: stats['errors'] for name, stats in report['results'].items() if stats.get('errors')}
+    if args.save_baseline and failed:
+        print(f"\nNot saving a baseline from a run with failed requests: {failed}")
+        regressed = True
+    elif args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"\nBaseline written to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline['meta'].get('profile') != report['meta']['profile']:
+            print(f"\nWarning: baseline profile is {baseline['meta'].get('profile')!r}, "
+                  f"this run is {report['meta']['profile']!r}")
+        report['comparison'] = compare(report['results'], baseline, args.threshold)
+        print_comparison(report['comparison'], args.threshold)
+        regressed = any(row['regressed'] for row in report['comparison'])
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write('\n')
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,381 @@
+"""Persistent candidate index: SQLite metadata + memory-mapped skill matrix"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from ranking import score_packed, top_k_rows
+from semantic import SemanticPool, TermMatrix, hash_terms, pack_terms, similarity_scores, unpack_terms
+
+
+class CandidateIndex:
+    """On-disk talent pool that can be ranked against a JD without re-parsing.
+
+    Each candidate owns one fixed-width row (bit-packed skill presence over
+    the SkillVocabulary) in skills.bin, addressed by its row number in the
+    SQLite table. Adds append a row; removals are tombstones that also erase
+    the candidate's personal data (contact details and text). The matrix is
+    opened lazily with np.memmap, so worker startup does not read it. Each
+    row also stores its resume's hashed term counts (semantic.py), so a
+    search can score the whole pool's text against the JD without
+    re-tokenizing it.
+    """
+
+    def __init__(self, directory, vocabulary, taxonomy_version):
+        self.directory = directory
+        self.vocabulary = vocabulary
+        self.taxonomy_version = taxonomy_version
+        self.db_path = os.path.join(directory, 'candidates.sqlite3')
+        self.matrix_path = os.path.join(directory, 'skills.bin')
+        os.makedirs(directory, exist_ok=True)
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._mapped = None
+        self._mapped_rows = 0
+        self._mapped_identity = None
+        self._active = None
+        self._active_generation = None
+        self._terms = None
+        self._terms_generation = None
+        self._idf = None
+        self._idf_size = 0
+
+        db = self._connect()
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS candidates ("
+            "row INTEGER PRIMARY KEY, content_hash TEXT UNIQUE NOT NULL, "
+            "filename TEXT, name TEXT, email TEXT, contact TEXT, skills TEXT NOT NULL, "
+            "raw_text BLOB, deleted INTEGER NOT NULL DEFAULT 0, added REAL NOT NULL, terms BLOB)"
+        )
+        columns = [column[1] for column in db.execute("PRAGMA table_info(candidates)")]
+        if 'terms' not in columns:
+            db.execute("ALTER TABLE candidates ADD COLUMN terms BLOB")  # filled in by _term_matrix()
+        db.execute("CREATE INDEX IF NOT EXISTS candidates_added ON candidates (added) WHERE deleted = 0")
+        db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        db.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('generation', '0')")
+        db.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('taxonomy_version', ?)", (taxonomy_version,))
+        db.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('row_width', ?)", (str(vocabulary.packed_width),))
+        db.commit()
+
+    def _connect(self):
+        db = getattr(self._local, 'db', None)
+        if db is None or self._local.pid != os.getpid():
+            db = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            self._local.db = db
+            self._local.pid = os.getpid()
+        return db
+
+    def _meta(self, key):
+        row = self._connect().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    @property
+    def is_stale(self):
+        """True when rows were encoded with a different taxonomy"""
+        return self._meta('taxonomy_version') != self.taxonomy_version
+
+    def set_taxonomy(self, vocabulary, taxonomy_version):
+        """Switch to a reloaded taxonomy; is_stale then reports that the
+        matrix needs a rebuild()"""
+        with self._lock:
+            self.vocabulary = vocabulary
+            self.taxonomy_version = taxonomy_version
+            self._mapped = None
+            self._mapped_rows = 0
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------------
+
+    def add(self, content_hash, resume_data, filename=None):
+        """Add a parsed resume; returns its row, or the existing row if already indexed"""
+        db = self._connect()
+        packed = self.vocabulary.encode_packed(resume_data['skills'])
+        contact = resume_data.get('contact', {})
+        raw_text = resume_data.get('raw_text', '')
+        values = (filename, contact.get('name'), contact.get('email'), json.dumps(contact),
+                  json.dumps(resume_data['skills']), zlib.compress(raw_text.encode('utf-8')), time.time(),
+                  pack_terms(hash_terms(raw_text)))
+
+        # BEGIN IMMEDIATE serializes writers across processes, so row numbers
+        # and file offsets never collide
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            existing = db.execute(
+                "SELECT row, deleted FROM candidates WHERE content_hash = ?", (content_hash,)
+            ).fetchone()
+            if existing is not None and not existing[1]:
+                db.execute("COMMIT")
+                return existing[0]
+
+            if existing is not None:
+                # Re-adding a removed candidate: its personal data was erased,
+                # so store it again as if new
+                row = existing[0]
+            else:
+                row = db.execute("SELECT COALESCE(MAX(row) + 1, 0) FROM candidates").fetchone()[0]
+            stored_version = db.execute("SELECT value FROM meta WHERE key = 'taxonomy_version'").fetchone()[0]
+            if stored_version == self.taxonomy_version:
+                fd = os.open(self.matrix_path, os.O_WRONLY | os.O_CREAT, 0o644)
+                try:
+                    os.pwrite(fd, packed.tobytes(), row * len(packed))
+                finally:
+                    os.close(fd)
+            else:
+                # The matrix was laid out for another taxonomy (another
+                # process reloaded first, or we did); writing our row width
+                # into it would corrupt neighbours. Keep the row in SQLite
+                # and force the next search to rebuild the matrix.
+                db.execute("UPDATE meta SET value = '' WHERE key = 'taxonomy_version'")
+
+            if existing is not None:
+                db.execute(
+                    "UPDATE candidates SET filename = ?, name = ?, email = ?, contact = ?, skills = ?, "
+                    "raw_text = ?, added = ?, terms = ?, deleted = 0 WHERE row = ?",
+                    values + (row,)
+                )
+            else:
+                db.execute(
+                    "INSERT INTO candidates (row, content_hash, filename, name, email, contact, skills, raw_text, "
+                    "added, terms) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (row, content_hash) + values
+                )
+            self._bump_generation(db)
+            db.execute("COMMIT")
+            return row
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+
+    def remove(self, row):
+        """Tombstone a candidate and erase its personal data; returns False if it was not found"""
+        return self._erase("row = ? AND deleted = 0", (row,)) > 0
+
+    def purge(self, older_than):
+        """Remove every candidate added before the epoch time older_than; returns how many"""
+        expired = self._connect().execute(
+            "SELECT 1 FROM candidates WHERE deleted = 0 AND added < ? LIMIT 1", (older_than,)
+        ).fetchone()
+        if expired is None:
+            return 0
+        return self._erase("deleted = 0 AND added < ?", (older_than,))
+
+    def _erase(self, where, params):
+        db = self._connect()
+        db.execute("BEGIN IMMEDIATE")
+        cursor = db.execute(
+            "UPDATE candidates SET deleted = 1, filename = NULL, name = NULL, email = NULL, contact = NULL, "
+            f"skills = '[]', raw_text = NULL, terms = NULL WHERE {where}", params
+        )
+        if cursor.rowcount:
+            self._bump_generation(db)
+        db.execute("COMMIT")
+        return cursor.rowcount
+
+    def _bump_generation(self, db):
+        db.execute("UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'generation'")
+
+    def rebuild(self, extract_skills):
+        """Re-extract skills from stored text with the current taxonomy and
+        rewrite the matrix (needed after the taxonomy changes).
+
+        The extraction works on a snapshot of the rows, outside any
+        transaction, so add() and remove() carry on meanwhile. The write
+        lock is held only to re-extract the few rows added (or re-added)
+        since the snapshot, store the results and swap the matrix in.
+        """
+        vocabulary, taxonomy_version = self.vocabulary, self.taxonomy_version
+        if self._meta('taxonomy_version') == taxonomy_version:
+            return
+        db = self._connect()
+        snapshot = {
+            row: (added, self._extract(vocabulary, extract_skills, raw_text))
+            for row, added, raw_text in db.execute(
+                "SELECT row, added, raw_text FROM candidates WHERE deleted = 0 ORDER BY row"
+            ).fetchall()
+        }
+
+        tmp_path = self.matrix_path + '.tmp'
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            stored_version = db.execute("SELECT value FROM meta WHERE key = 'taxonomy_version'").fetchone()[0]
+            if stored_version == taxonomy_version:
+                # Another process rebuilt it in the meantime
+                db.execute("COMMIT")
+                return
+            rows = db.execute("SELECT row, added, raw_text FROM candidates WHERE deleted = 0").fetchall()
+            row_count = db.execute("SELECT COALESCE(MAX(row) + 1, 0) FROM candidates").fetchone()[0]
+            matrix = np.zeros((row_count, vocabulary.packed_width), dtype=np.uint8)
+            updates = []
+            for row, added, raw_text in rows:
+                taken = snapshot.get(row)
+                skills, packed = (taken[1] if taken is not None and taken[0] == added
+                                  else self._extract(vocabulary, extract_skills, raw_text))
+                matrix[row] = packed
+                updates.append((json.dumps(skills), row))
+            db.executemany("UPDATE candidates SET skills = ? WHERE row = ?", updates)
+            matrix.tofile(tmp_path)
+            os.replace(tmp_path, self.matrix_path)
+            db.execute("UPDATE meta SET value = ? WHERE key = 'taxonomy_version'", (taxonomy_version,))
+            db.execute("UPDATE meta SET value = ? WHERE key = 'row_width'", (str(vocabulary.packed_width),))
+            self._bump_generation(db)
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        with self._lock:
+            self._mapped = None
+            self._mapped_rows = 0
+
+    @staticmethod
+    def _extract(vocabulary, extract_skills, raw_text):
+        """(skills, packed row) re-extracted from a row's compressed text"""
+        skills = extract_skills(zlib.decompress(raw_text).decode('utf-8') if raw_text else '')
+        return skills, vocabulary.encode_packed(skills)
+
+    # ------------------------------------------------------------------
+    # Query
+    # ------------------------------------------------------------------
+
+    def _matrix(self, rows_needed):
+        """Memory-map the skill matrix, remapping only when it has grown or
+        been replaced by a rebuild (possibly in another process)"""
+        try:
+            st = os.stat(self.matrix_path)
+            identity = st.st_ino
+        except OSError:
+            st, identity = None, None
+        with self._lock:
+            if self._mapped is None or self._mapped_rows < rows_needed or self._mapped_identity != identity:
+                width = self.vocabulary.packed_width
+                size = st.st_size if st else 0
+                rows = size // width
+                self._mapped_identity = identity
+                if rows == 0:
+                    self._mapped = np.zeros((0, width), dtype=np.uint8)
+                else:
+                    self._mapped = np.memmap(self.matrix_path, dtype=np.uint8, mode='r', shape=(rows, width))
+                self._mapped_rows = rows
+            return self._mapped[:rows_needed]
+
+    def _active_rows(self):
+        """Bool mask of live rows, cached until the generation changes"""
+        generation = self._meta('generation')
+        with self._lock:
+            if self._active is not None and self._active_generation == generation:
+                return self._active
+        rows = self._connect().execute("SELECT row FROM candidates WHERE deleted = 0").fetchall()
+        size = max((r[0] for r in rows), default=-1) + 1
+        mask = np.zeros(size, dtype=bool)
+        mask[[r[0] for r in rows]] = True
+        with self._lock:
+            self._active = mask
+            self._active_generation = generation
+        return mask
+
+    def _semantic_pool(self, rows_needed):
+        """SemanticPool with one document per candidate row (empty for
+        removed ones), cached until the generation changes. Rows indexed
+        before terms were stored are tokenized from their text once and saved."""
+        generation = self._meta('generation')
+        with self._lock:
+            if self._terms is not None and self._terms_generation == generation and len(self._terms) >= rows_needed:
+                return self._terms
+        db = self._connect()
+        empty = hash_terms('')
+        terms = [empty] * rows_needed
+        for row, blob, raw_text in db.execute(
+            "SELECT row, terms, CASE WHEN terms IS NULL THEN raw_text END FROM candidates WHERE deleted = 0"
+        ):
+            if row >= rows_needed:
+                continue
+            if blob is None:
+                terms[row] = hash_terms(zlib.decompress(raw_text).decode('utf-8') if raw_text else '')
+                db.execute("UPDATE candidates SET terms = ? WHERE row = ?", (pack_terms(terms[row]), row))
+            else:
+                terms[row] = unpack_terms(blob)
+        pool = SemanticPool(TermMatrix(terms))
+        with self._lock:
+            self._terms = pool
+            self._terms_generation = generation
+        return pool
+
+    def count(self):
+        return int(self._active_rows().sum())
+
+    def idf(self, min_documents):
+        """IDF of the indexed resumes' terms, for scoring resumes outside any
+        pool (semantic.pair_similarity); None with fewer than min_documents.
+        Refitted once the pool has changed size by a tenth, not on every add."""
+        size = self.count()
+        if size < max(1, min_documents):
+            return None
+        with self._lock:
+            if self._idf is not None and abs(size - self._idf_size) <= self._idf_size // 10:
+                return self._idf
+        idf = self._semantic_pool(len(self._active_rows())).idf
+        with self._lock:
+            self._idf, self._idf_size = idf, size
+        return idf
+
+    def search(self, jd_skills, k=20, jd_text=None, rank_by='ats'):
+        """Rank indexed candidates against a parsed JD; best first.
+
+        With jd_text every result also gets a semantic_score (hashed TF-IDF
+        cosine, 0-100), and rank_by='semantic' ranks the pool by it instead
+        of by ats_score.
+        """
+        vocabulary = self.vocabulary
+        active = self._active_rows()
+        if not active.any():
+            return []
+
+        matrix = self._matrix(len(active))
+        active = active[:matrix.shape[0]]
+        scores = score_packed(vocabulary, matrix, jd_skills)
+        semantic = None
+        if jd_text is not None:
+            pool = self._semantic_pool(len(active))
+            semantic = similarity_scores(pool, TermMatrix([hash_terms(jd_text)]))[0][:len(active)]
+        ranked = semantic if rank_by == 'semantic' and semantic is not None else scores['overall_score']
+        winners = top_k_rows(ranked, k, eligible=active)
+        if not winners:
+            return []
+
+        placeholders = ','.join('?' * len(winners))
+        records = {
+            r[0]: r for r in self._connect().execute(
+                f"SELECT row, filename, name, email, contact FROM candidates WHERE row IN ({placeholders})",
+                winners
+            )
+        }
+
+        jd_cols = scores['jd_columns']
+        results = []
+        for row in winners:
+            _, filename, name, email, contact = records[row]
+            present = np.unpackbits(np.asarray(matrix[row]))[:vocabulary.size].astype(bool)
+            matched = [vocabulary.columns[c][1] for c in jd_cols if present[c]]
+            missing = [vocabulary.columns[c][1] for c in jd_cols if not present[c]]
+            results.append({
+                'candidate_id': row,
+                'filename': filename,
+                'name': name,
+                'email': email,
+                'contact': json.loads(contact) if contact else {},
+                'ats_score': float(scores['overall_score'][row]),
+                'category_scores': {
+                    category: float(values[row]) for category, values in scores['category_scores'].items()
+                },
+                'matched_skills': matched,
+                'missing_skills': missing
+            })
+            if semantic is not None:
+                results[-1]['semantic_score'] = float(semantic[row])
+        return results
@@ -14,18 +14,118 @@ class Config:
     MAX_CONTENT_LENGTH = int(os.getenv('MAX_FILE_SIZE', 5 * 1024 * 1024))  # 5MB default
     UPLOAD_FOLDER = 'uploads'
     ALLOWED_EXTENSIONS = {'pdf', 'docx', 'doc', 'txt'}
+    UPLOAD_MEMORY_LIMIT = int(os.getenv('UPLOAD_MEMORY_LIMIT', 2 * 1024 * 1024))  # larger uploads spill to a temp file
+
+    # Skill taxonomy (reloaded without a restart when either file changes)
+    TAXONOMY_PATH = os.getenv('TAXONOMY_PATH', 'skills.json')
+    TAXONOMY_ALIASES_PATH = os.getenv('TAXONOMY_ALIASES_PATH', 'skill_aliases.json')
+    TAXONOMY_RELOAD_INTERVAL = float(os.getenv('TAXONOMY_RELOAD_INTERVAL', 5))  # seconds between checks, 0 = never
+
+    # Text extraction budgets (0 = unlimited)
+    PDF_MAX_PAGES = int(os.getenv('PDF_MAX_PAGES', 30))
+    PARSE_MAX_CHARS = int(os.getenv('PARSE_MAX_CHARS', 200000))
+    PDF_TIME_BUDGET = float(os.getenv('PDF_TIME_BUDGET', 10))  # seconds per document
+
+    # Parser sandbox: PDFs, and every resume of a batch, are parsed in worker
+    # processes with a hard timeout and an address-space cap, replaced after
+    # MAX_DOCUMENTS. Batches get at least BATCH_PARSE_WORKERS of them; with 0
+    # workers PDFs are parsed in-process and batches in the process pool.
+    PARSER_SANDBOX_WORKERS = int(os.getenv('PARSER_SANDBOX_WORKERS', 2))
+    PARSER_SANDBOX_TIMEOUT = float(os.getenv('PARSER_SANDBOX_TIMEOUT', 30))  # seconds per document
+    PARSER_SANDBOX_MEMORY_MB = int(os.getenv('PARSER_SANDBOX_MEMORY_MB', 512))  # beyond what a worker inherits
+    PARSER_SANDBOX_MAX_DOCUMENTS = int(os.getenv('PARSER_SANDBOX_MAX_DOCUMENTS', 50))
+    PARSER_SANDBOX_QUEUE_TIMEOUT = float(os.getenv('PARSER_SANDBOX_QUEUE_TIMEOUT', 30))  # wait for a free worker
+
+    # Contact details are looked for in the resume header and footer only
+    CONTACT_HEAD_CHARS = int(os.getenv('CONTACT_HEAD_CHARS', 4000))
+    CONTACT_TAIL_CHARS = int(os.getenv('CONTACT_TAIL_CHARS', 1000))
     
     # Groq API
     GROQ_API_KEY = os.getenv('GROQ_API_KEY', '')
     GROQ_MODEL = os.getenv('GROQ_MODEL', 'llama-3.1-8b-instant')
-    
+    GROQ_API_BASE = os.getenv('GROQ_API_BASE') or None  # e.g. a local fake server for testing
+
+    # LLM gateway: per-attempt timeout, overall deadline, retries, circuit breaker
+    LLM_TIMEOUT = float(os.getenv('LLM_TIMEOUT', 20))  # seconds per HTTP attempt
+    LLM_DEADLINE = float(os.getenv('LLM_DEADLINE', 45))  # seconds per call, retries included
+    LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', 2))  # on 429/5xx/timeouts
+    LLM_RETRY_BACKOFF = float(os.getenv('LLM_RETRY_BACKOFF', 0.5))  # seconds, doubled per retry, full jitter
+    LLM_RETRY_BACKOFF_MAX = float(os.getenv('LLM_RETRY_BACKOFF_MAX', 8))
+    LLM_BREAKER_THRESHOLD = int(os.getenv('LLM_BREAKER_THRESHOLD', 5))  # consecutive failures to open
+    LLM_BREAKER_RESET = float(os.getenv('LLM_BREAKER_RESET', 30))  # seconds before a trial call
+    LLM_POOL_CONNECTIONS = int(os.getenv('LLM_POOL_CONNECTIONS', 20))  # keep-alive connections to Groq
+
+    # Prompt context: token budgets for the resume and JD passages sent to the
+    # LLM, picked by relevance to the job's skills (0 = first 2000/500 chars)
+    PROMPT_RESUME_TOKENS = int(os.getenv('PROMPT_RESUME_TOKENS', 400))
+    PROMPT_JD_TOKENS = int(os.getenv('PROMPT_JD_TOKENS', 250))
+    PROMPT_SHORT_RESUME_TOKENS = int(os.getenv('PROMPT_SHORT_RESUME_TOKENS', 100))
+
+    # Batch processing
+    BATCH_PARSE_WORKERS = int(os.getenv('BATCH_PARSE_WORKERS', min(4, os.cpu_count() or 1)))  # 0 = parse in-process
+    LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', 4))
+
+    # Batch LLM triage: below the threshold and outside the top N, candidates
+    # get a short prompt ('short'), a templated summary ('template') or the
+    # full analysis anyway ('off')
+    TRIAGE_MODE = os.getenv('TRIAGE_MODE', 'template')
+    TRIAGE_MIN_SCORE = float(os.getenv('TRIAGE_MIN_SCORE', 25))
+    TRIAGE_TOP_N = int(os.getenv('TRIAGE_TOP_N', 10))
+    # Blend of the offline semantic score (hashed TF-IDF cosine) into the
+    # triage score: 0 = ATS score only, 1 = semantic score only
+    SEMANTIC_TRIAGE_WEIGHT = float(os.getenv('SEMANTIC_TRIAGE_WEIGHT', 0))
+    # A single analysis has no pool of its own: its semantic_score uses IDF
+    # from the candidate index, and is null until it holds this many resumes
+    SEMANTIC_MIN_POOL = int(os.getenv('SEMANTIC_MIN_POOL', 50))
+
+    # Streaming batch results: top-k snapshot size and how often it is sent
+    STREAM_TOP_K = int(os.getenv('STREAM_TOP_K', 10))
+    STREAM_SNAPSHOT_EVERY = int(os.getenv('STREAM_SNAPSHOT_EVERY', 5))  # results between snapshots
+    STREAM_BUFFER_EVENTS = int(os.getenv('STREAM_BUFFER_EVENTS', 64))  # events queued for a slow client
+
+    # Parse cache
+    PARSE_CACHE_MAX_BYTES = int(os.getenv('PARSE_CACHE_MAX_BYTES', 64 * 1024 * 1024))  # 64MB
+    PARSE_CACHE_DISK = os.getenv('PARSE_CACHE_DISK', 'False').lower() == 'true'
+
+    # LLM response cache (0 disables)
+    LLM_CACHE_TTL = int(os.getenv('LLM_CACHE_TTL', 3600))  # seconds
+    LLM_CACHE_MAX_ENTRIES = int(os.getenv('LLM_CACHE_MAX_ENTRIES', 1024))
+
+    # Observability: /metrics and the Server-Timing response header
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True').lower() == 'true'
+
+    # Candidate index. Auto-add keeps every analysed resume (personal data)
+    # for /search, so it is opt-in; candidates are erased after
+    # CANDIDATE_INDEX_RETENTION_DAYS (0 = keep until DELETE /candidates/<id>)
+    CANDIDATE_INDEX_AUTO_ADD = os.getenv('CANDIDATE_INDEX_AUTO_ADD', 'False').lower() == 'true'
+    CANDIDATE_INDEX_RETENTION_DAYS = float(os.getenv('CANDIDATE_INDEX_RETENTION_DAYS', 0))
+
+    # Job matching (/match-jobs): roles returned per candidate, and how many of
+    # each candidate's best roles get an LLM evaluation (0 = none)
+    MATCH_JOBS_TOP_K = int(os.getenv('MATCH_JOBS_TOP_K', 5))
+    MATCH_JOBS_LLM_TOP = int(os.getenv('MATCH_JOBS_LLM_TOP', 1))
+
+    # ASGI entry point (asgi.py): threads for the routes that stay synchronous
+    ASGI_WSGI_THREADS = int(os.getenv('ASGI_WSGI_THREADS', 32))
+
+    # gunicorn.conf.py: import the app and heavy libraries once in the master
+    # and share them with forked workers (off: each worker imports lazily)
+    PRELOAD_APP = os.getenv('PRELOAD_APP', 'True').lower() == 'true'
+
+    # Background jobs
+    JOB_WORKERS = int(os.getenv('JOB_WORKERS', 2))  # worker threads per process
+    JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', 0.5))  # seconds
+    JOB_LEASE_SECONDS = int(os.getenv('JOB_LEASE_SECONDS', 600))
+    JOB_RETENTION_SECONDS = int(os.getenv('JOB_RETENTION_SECONDS', 86400))
+
     # Session
     SESSION_TYPE = 'filesystem'
     PERMANENT_SESSION_LIFETIME = 3600  # 1 hour
     
-    # Rate Limiting (future)
+    # Rate Limiting
     RATELIMIT_ENABLED = os.getenv('RATELIMIT_ENABLED', 'False').lower() == 'true'
     RATELIMIT_DEFAULT = "10 per minute"
+    RATELIMIT_GROQ = os.getenv('RATELIMIT_GROQ', '30 per minute')  # client-side cap on Groq requests
     
     @staticmethod
     def init_app(app):
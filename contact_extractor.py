@@ -0,0 +1,73 @@
+"""Contact details (email, phone, profile links, name) from resume text.
+
+Patterns are compiled once and every quantifier is bounded, so a single
+attempt does a fixed amount of work and a scan stays linear in the window
+it is given, whatever the input (table-heavy PDFs, base64 blobs, long
+digit runs). Only the header of the resume is searched, plus a short tail
+for footers; the rest of a long document is never touched.
+"""
+import re
+
+HEAD_CHARS = 4000
+TAIL_CHARS = 1000
+
+# Local part may not start mid-token, so each run of address characters is
+# tried once instead of from every offset. Domain labels exclude '.', so
+# there is only one way to split them.
+EMAIL_RE = re.compile(
+    r'(?<![\w.%+-])[A-Za-z0-9._%+-]{1,64}@(?:[A-Za-z0-9-]{1,63}\.){1,8}[A-Za-z]{2,24}(?![\w-])'
+)
+
+# Optional country code (+44, or a bare one-digit code such as the 1 in
+# 1-800-...) and (area) code, which may itself be a country code such as
+# (+1), then two to six short digit groups separated by at most one space,
+# dot or dash. Groups hold 2-4 digits, so the number of ways to split a run
+# is capped no matter how long it is; only the group right after a +code
+# may be a single digit, as in +33 1 23 45 67 89.
+PHONE_RE = re.compile(
+    r'(?<![\w+])(?:\+\d{1,3}[ .-]?(?:\(\d{1,4}\)[ .-]?)?\d{1,4}|(?:\d[ .-])?(?:\(\+?\d{1,4}\)[ .-]?)?\d{2,4})'
+    r'(?:[ .-]?\d{2,4}){1,5}(?![\w])'
+)
+PHONE_MIN_DIGITS = 9   # rejects year ranges such as 2019-2021
+PHONE_MAX_DIGITS = 15  # E.164 limit
+
+LINKEDIN_RE = re.compile(r'linkedin\.com/in/[\w-]{1,100}', re.IGNORECASE)
+GITHUB_RE = re.compile(r'github\.com/[\w-]{1,100}', re.IGNORECASE)
+FIRST_LINE_RE = re.compile(r'^[^\S\n]*(\S[^\n]*)', re.MULTILINE)
+
+
+def _windows(text, head_chars, tail_chars):
+    """Header first, then the footer if the text runs past the header"""
+    yield text[:head_chars]
+    if tail_chars and len(text) > head_chars:
+        yield text[max(head_chars, len(text) - tail_chars):]
+
+
+def _first(pattern, windows):
+    for window in windows:
+        match = pattern.search(window)
+        if match:
+            return match.group(0)
+    return ""
+
+
+def _first_phone(windows):
+    for window in windows:
+        for match in PHONE_RE.finditer(window):
+            digits = sum(ch.isdigit() for ch in match.group(0))
+            if PHONE_MIN_DIGITS <= digits <= PHONE_MAX_DIGITS:
+                return match.group(0)
+    return ""
+
+
+def extract_contact(text, head_chars=HEAD_CHARS, tail_chars=TAIL_CHARS):
+    """{'email', 'phone', 'linkedin', 'github', 'name'} from the first match of each"""
+    windows = tuple(_windows(text, head_chars, tail_chars))
+    name = FIRST_LINE_RE.search(windows[0])
+    return {
+        'email': _first(EMAIL_RE, windows),
+        'phone': _first_phone(windows),
+        'linkedin': _first(LINKEDIN_RE, windows),
+        'github': _first(GITHUB_RE, windows),
+        'name': name.group(1).strip() if name else "Candidate"
+    }
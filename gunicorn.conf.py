@@ -0,0 +1,31 @@
+"""gunicorn settings, read automatically when gunicorn starts in this directory
+
+    gunicorn -w 4 app:app
+    gunicorn -k asgi -w 2 asgi:application
+
+With PRELOAD_APP (the default) the master imports the app, the heavy
+libraries it loads lazily and the compiled taxonomy once, then freezes
+them before forking, so workers start at once and share those pages
+copy-on-write. Set PRELOAD_APP=false to have each worker import on its own.
+"""
+import gc
+
+from config import Config
+
+preload_app = Config.PRELOAD_APP
+
+if preload_app:
+    # No collections while the app loads: freed objects would leave holes
+    # in pages the workers are about to share
+    gc.disable()
+
+
+def when_ready(server):
+    """Runs in the master after the preloaded app is imported, before workers fork"""
+    if not server.cfg.preload_app:
+        return
+    import startup
+    startup.preload()
+    frozen = startup.freeze_shared_state()
+    gc.enable()
+    server.log.info("Preloaded app and libraries; %d objects frozen for sharing", frozen)
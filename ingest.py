@@ -0,0 +1,545 @@
+"""Bulk resume ingestion from directories and ZIP archives
+
+    python ingest.py resumes.zip more_resumes/ --jd job.txt -o results.csv
+    python ingest.py resumes.zip --jd job.pdf -o results.sqlite3 --workers 8
+
+Resumes (.pdf, .txt) are read straight out of ZIP archives, without
+extracting them to disk, or from directory trees; ZIPs found in a directory
+are read too. They are parsed with parse_resume in the parser sandbox's
+worker processes (or a process pool when PARSER_SANDBOX_WORKERS=0), matched
+against the JD (if one is given) with calculate_skill_match and written as
+they finish to CSV, JSONL or SQLite, picked by the output's extension.
+Progress and throughput go to stderr.
+
+A checkpoint next to the output (<output>.checkpoint) records which
+documents have been written. Rerunning the same command after an
+interruption skips them and carries on where it stopped; --restart starts
+over.
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import signal
+import sqlite3
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from app import TAXONOMY, calculate_skill_match, create_pdf_sandbox, parse_job_description, parse_resume
+from config import Config
+from parse_cache import content_digest
+
+EXTENSIONS = ('.pdf', '.txt')
+FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.sqlite': 'sqlite', '.sqlite3': 'sqlite',
+           '.db': 'sqlite'}
+FIELDS = ('source', 'filename', 'name', 'email', 'phone', 'linkedin', 'github', 'ats_score', 'matched_count',
+          'missing_count', 'matched_skills', 'missing_skills', 'skills', 'text_length', 'pages_read',
+          'truncated_reason', 'content_hash', 'error')
+LIST_FIELDS = ('matched_skills', 'missing_skills', 'skills')
+CHECKPOINT_EVERY = 200  # documents, or every CHECKPOINT_SECONDS, whichever comes first
+CHECKPOINT_SECONDS = 5.0
+PROGRESS_SECONDS = 2.0
+
+
+class CheckpointMismatch(Exception):
+    """The checkpoint belongs to a run with another JD, output or taxonomy"""
+
+
+# ----------------------------------------------------------------------------
+# Finding documents
+# ----------------------------------------------------------------------------
+
+def _wanted(name):
+    base = os.path.basename(name)
+    return (name.lower().endswith(EXTENSIONS) and not base.startswith('.')
+            and '__MACOSX/' not in name.replace('\\', '/'))
+
+
+def _archive_documents(archive):
+    with zipfile.ZipFile(archive) as zf:
+        for info in sorted(zf.infolist(), key=lambda info: info.filename):
+            if not info.is_dir() and _wanted(info.filename):
+                yield f"{archive}!{info.filename}", archive, info.filename, info.file_size
+
+
+def iter_documents(inputs):
+    """(source id, archive or None, path or member name, size) for every resume under inputs.
+
+    The order is stable between runs so checkpoints line up: inputs as
+    given, directory entries and archive members sorted by name.
+    """
+    for path in inputs:
+        path = os.path.abspath(path)
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    full = os.path.join(root, name)
+                    if name.lower().endswith('.zip') and zipfile.is_zipfile(full):
+                        yield from _archive_documents(full)
+                    elif _wanted(full):
+                        yield full, None, full, os.path.getsize(full)
+        elif zipfile.is_zipfile(path):
+            yield from _archive_documents(path)
+        else:
+            yield path, None, path, os.path.getsize(path)
+
+
+# ----------------------------------------------------------------------------
+# Parsing (runs in the worker processes)
+# ----------------------------------------------------------------------------
+
+_archives = {}  # archive path -> open ZipFile, one per worker process
+_archives_pid = None
+
+
+def _worker_init():
+    # Ctrl-C is handled by the parent, which checkpoints and shuts the pool down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _read(archive, name):
+    """Bytes of an archive member, or the path of a plain file"""
+    global _archives_pid
+    if archive is None:
+        return name
+    if _archives_pid != os.getpid():
+        # A forked worker must not share the parent's open archives (and file offsets)
+        _archives.clear()
+        _archives_pid = os.getpid()
+    zf = _archives.get(archive)
+    if zf is None:
+        zf = _archives[archive] = zipfile.ZipFile(archive)
+    return zf.read(name)
+
+
+def ingest_document(archive, name, jd_skills=None):
+    """One output row (without 'source') for a resume file or archive member"""
+    source = _read(archive, name)
+    resume_data = parse_resume(source, name)
+    contact = resume_data['contact']
+    row = dict.fromkeys(FIELDS)
+    row.update({
+        'filename': os.path.basename(name),
+        'name': contact['name'],
+        'email': contact['email'],
+        'phone': contact['phone'],
+        'linkedin': contact['linkedin'],
+        'github': contact['github'],
+        'skills': [skill for skills in resume_data['skills'].values() for skill in skills],
+        'text_length': resume_data['text_length'],
+        'pages_read': resume_data['parse_info']['pages_read'],
+        'truncated_reason': resume_data['parse_info']['truncated_reason'],
+        'content_hash': content_digest(source),
+        'error': _parse_error(resume_data)
+    })
+    if jd_skills is not None:
+        match_results = calculate_skill_match(resume_data['skills'], jd_skills)
+        row.update({
+            'ats_score': match_results['overall_score'],
+            'matched_count': len(match_results['matched_flat']),
+            'missing_count': len(match_results['missing_flat']),
+            'matched_skills': [s['skill'] for s in match_results['matched_flat']],
+            'missing_skills': [s['skill'] for s in match_results['missing_flat']]
+        })
+    return row
+
+
+def _parse_error(resume_data):
+    error = resume_data['parse_info'].get('error')
+    if error:
+        return f"{error['type']}: {error['message']}"
+    return None if resume_data['text_length'] else 'No text extracted'
+
+
+def _error_row(name, error):
+    row = dict.fromkeys(FIELDS)
+    row.update({'filename': os.path.basename(name), 'error': error})
+    return row
+
+
+# ----------------------------------------------------------------------------
+# Output and checkpoint
+# ----------------------------------------------------------------------------
+
+class JsonlWriter:
+    """One JSON object per line; commit() returns the byte offset written so far"""
+
+    def __init__(self, path):
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def write(self, row):
+        self.file.write(json.dumps(row, ensure_ascii=False) + '\n')
+
+    def commit(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+
+class CsvWriter(JsonlWriter):
+    """CSV with a header row; list fields are joined with '; '"""
+
+    def __init__(self, path):
+        self.file = open(path, 'a', encoding='utf-8', newline='')
+        self.writer = csv.DictWriter(self.file, fieldnames=FIELDS)
+        if self.file.tell() == 0:
+            self.writer.writeheader()
+
+    def write(self, row):
+        self.writer.writerow({key: '; '.join(value) if key in LIST_FIELDS and value is not None else value
+                              for key, value in row.items()})
+
+
+class SqliteWriter:
+    """A 'resumes' table keyed by source; list fields are stored as JSON.
+
+    Rows are replaced by source, so documents redone after a crash between
+    two checkpoints are not duplicated and no offset is needed.
+    """
+
+    def __init__(self, path):
+        self.db = sqlite3.connect(path)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS resumes (source TEXT PRIMARY KEY, "
+            + ", ".join(f"{field} {'REAL' if field == 'ats_score' else 'TEXT'}" for field in FIELDS[1:]) + ")"
+        )
+        self.insert = (f"INSERT OR REPLACE INTO resumes ({', '.join(FIELDS)}) "
+                       f"VALUES ({', '.join('?' for _ in FIELDS)})")
+
+    def write(self, row):
+        self.db.execute(self.insert, [json.dumps(row[key]) if key in LIST_FIELDS and row[key] is not None
+                                      else row[key] for key in FIELDS])
+
+    def commit(self):
+        self.db.commit()
+        return None
+
+    def close(self):
+        self.db.close()
+
+
+WRITERS = {'csv': CsvWriter, 'jsonl': JsonlWriter, 'sqlite': SqliteWriter}
+
+
+class Checkpoint:
+    """Append-only record of the documents already written to the output.
+
+    The first line describes the run (output, format, JD and taxonomy);
+    every later line lists the sources committed since the previous one and
+    the output's size at that point. A file output is cut back to that size
+    on resume, dropping rows written after the last checkpoint.
+    """
+
+    def __init__(self, path, run):
+        self.path = path
+        self.done = set()
+        self.offset = None
+        exists = os.path.exists(path)
+        if exists:
+            with open(path, encoding='utf-8') as f:
+                lines = f.read().splitlines()
+            if lines and json.loads(lines[0]) != run:
+                raise CheckpointMismatch(
+                    f"{path} is from a run with a different JD, output format or taxonomy; "
+                    "pass --restart to start over"
+                )
+            for line in lines[1:]:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # torn write from the interrupted run
+                self.done.update(entry['done'])
+                self.offset = entry['offset']
+        self.file = open(path, 'a', encoding='utf-8')
+        if not exists or os.path.getsize(path) == 0:
+            self.file.write(json.dumps(run) + '\n')
+            self.file.flush()
+
+    def record(self, sources, offset):
+        self.file.write(json.dumps({'done': sources, 'offset': offset}) + '\n')
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.done.update(sources)
+        self.offset = offset
+
+    def close(self):
+        self.file.close()
+
+
+# ----------------------------------------------------------------------------
+# Running
+# ----------------------------------------------------------------------------
+
+class Progress:
+    """Throttled progress line on stderr with throughput and ETA"""
+
+    def __init__(self, total, skipped, stream=sys.stderr):
+        self.total = total
+        self.skipped = skipped
+        self.stream = stream
+        self.done = 0
+        self.errors = 0
+        self.started = time.monotonic()
+        self.last = 0.0
+
+    def rate(self):
+        elapsed = time.monotonic() - self.started
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    def update(self, error):
+        self.done += 1
+        self.errors += bool(error)
+        now = time.monotonic()
+        if self.stream is None or now - self.last < PROGRESS_SECONDS:
+            return
+        self.last = now
+        finished = self.skipped + self.done
+        rate = self.rate()
+        eta = (self.total - finished) / rate if rate else 0
+        self.stream.write(f"\r{finished:,}/{self.total:,} ({finished / max(self.total, 1):.1%}) "
+                          f"{rate:,.1f} resumes/s, {self.errors:,} errors, ETA {eta:,.0f}s ")
+        self.stream.flush()
+
+
+def detect_format(output, fmt=None):
+    fmt = fmt or FORMATS.get(os.path.splitext(output)[1].lower())
+    if fmt not in WRITERS:
+        raise ValueError(f"Cannot tell the output format of {output}; use --format csv, jsonl or sqlite")
+    return fmt
+
+
+def ingest(inputs, output, jd_data=None, workers=None, fmt=None, restart=False,
+           max_file_size=None, progress=sys.stderr):
+    """Parse and match every resume under inputs into output, resumably.
+
+    Returns {'total', 'skipped', 'processed', 'errors', 'seconds',
+    'per_second', 'interrupted'}; skipped counts documents a previous run
+    already wrote.
+    """
+    fmt = detect_format(output, fmt)
+    workers = Config.BATCH_PARSE_WORKERS if workers is None else workers
+    max_file_size = Config.MAX_CONTENT_LENGTH if max_file_size is None else max_file_size
+    checkpoint_path = output + '.checkpoint'
+    if restart:
+        for path in (output, checkpoint_path):
+            if os.path.exists(path):
+                os.remove(path)
+    elif os.path.exists(output) and not os.path.exists(checkpoint_path):
+        raise CheckpointMismatch(f"{output} exists but has no checkpoint; pass --restart to overwrite it")
+
+    jd_skills = jd_data['skills'] if jd_data is not None else None
+    run = {
+        'output': os.path.abspath(output),
+        'format': fmt,
+        'jd': hashlib.sha256(jd_data['text'].encode('utf-8')).hexdigest() if jd_data is not None else None,
+        'taxonomy_version': TAXONOMY.version
+    }
+    checkpoint = Checkpoint(checkpoint_path, run)
+    # A file output is cut back to the last checkpoint; with none recorded
+    # (killed before the first one) everything in it is uncommitted
+    offset = checkpoint.offset or 0
+    if fmt != 'sqlite' and os.path.exists(output) and os.path.getsize(output) > offset:
+        os.truncate(output, offset)
+    writer = WRITERS[fmt](output)
+
+    documents = list(iter_documents(inputs))
+    pending = [document for document in documents if document[0] not in checkpoint.done]
+    tracker = Progress(len(documents), len(documents) - len(pending), progress)
+    uncommitted = []
+    last_commit = time.monotonic()
+
+    def finish(document, row):
+        nonlocal last_commit
+        row['source'] = document[0]
+        writer.write(row)
+        uncommitted.append(document[0])
+        tracker.update(row['error'])
+        if len(uncommitted) >= CHECKPOINT_EVERY or time.monotonic() - last_commit > CHECKPOINT_SECONDS:
+            commit()
+
+    def commit():
+        nonlocal last_commit
+        if uncommitted:
+            checkpoint.record(list(uncommitted), writer.commit())
+            uncommitted.clear()
+        last_commit = time.monotonic()
+
+    interrupted = False
+    try:
+        _process(pending, jd_skills, workers, max_file_size, finish)
+    except KeyboardInterrupt:
+        interrupted = True
+    finally:
+        commit()
+        writer.close()
+        checkpoint.close()
+
+    seconds = time.monotonic() - tracker.started
+    if progress is not None:
+        progress.write(f"\r{tracker.skipped + tracker.done:,}/{tracker.total:,} done in {seconds:,.1f}s: "
+                       f"{tracker.done:,} processed ({tracker.rate():,.1f} resumes/s), "
+                       f"{tracker.skipped:,} skipped, {tracker.errors:,} errors\n")
+        if interrupted:
+            progress.write("Interrupted; run the same command again to resume.\n")
+    return {
+        'total': tracker.total,
+        'skipped': tracker.skipped,
+        'processed': tracker.done,
+        'errors': tracker.errors,
+        'seconds': seconds,
+        'per_second': tracker.rate(),
+        'interrupted': interrupted
+    }
+
+
+def _process(pending, jd_skills, workers, max_file_size, finish):
+    """Run ingest_document over pending documents, calling finish(document,
+    row) in completion order; at most a few documents per worker are read
+    ahead.
+
+    Documents go to a parser sandbox of `workers` processes, which runs
+    each one with a timeout and memory cap and fails only that document
+    when it takes its worker down. With the sandbox off they go to a
+    process pool instead, where a dying worker fails every document in
+    flight: those are rerun one at a time on a fresh pool, so only a
+    document that takes a worker down on its own is reported.
+    """
+    runnable = []
+    for document in pending:
+        if max_file_size and document[3] > max_file_size:
+            finish(document, _error_row(document[2], f"File is larger than {max_file_size:,} bytes"))
+        else:
+            runnable.append(document)
+
+    if workers <= 0:
+        for document in runnable:
+            finish(document, _run_one(document, jd_skills))
+        return
+
+    sandbox = create_pdf_sandbox(workers)
+    if sandbox is not None:
+        try:
+            _process_sandboxed(iter(runnable), jd_skills, sandbox, finish)
+        finally:
+            sandbox.close()
+        return
+
+    queue = iter(runnable)
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_worker_init)
+    in_flight = {}
+    suspects = []  # in flight when a worker died
+    alone = None   # the suspect now running by itself
+    try:
+        while True:
+            if suspects and alone is None:
+                document = suspects.pop(0)
+                alone = pool.submit(ingest_document, document[1], document[2], jd_skills)
+                in_flight[alone] = document
+            while alone is None and len(in_flight) < workers * 4:
+                document = next(queue, None)
+                if document is None:
+                    break
+                in_flight[pool.submit(ingest_document, document[1], document[2], jd_skills)] = document
+            if not in_flight:
+                return
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            crashed = False
+            for future in finished:
+                document = in_flight.pop(future)
+                try:
+                    row = future.result()
+                except BrokenProcessPool as e:
+                    crashed = True
+                    if future is not alone:
+                        suspects.append(document)
+                        continue
+                    # Its second crash, this time with nothing else running
+                    row = _error_row(document[2], f"Worker crashed: {e}")
+                except Exception as e:
+                    row = _error_row(document[2], str(e))
+                finish(document, row)
+            if alone in finished:
+                alone = None
+            if crashed:
+                suspects.extend(in_flight.values())
+                in_flight.clear()
+                pool.shutdown(wait=False, cancel_futures=True)
+                pool = ProcessPoolExecutor(max_workers=workers, initializer=_worker_init)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _process_sandboxed(queue, jd_skills, sandbox, finish):
+    """_process's loop over a parser sandbox, fed by one thread per sandbox worker"""
+    threads = ThreadPoolExecutor(max_workers=sandbox.size, thread_name_prefix='sandbox')
+    in_flight = {}
+    try:
+        while True:
+            while len(in_flight) < sandbox.size * 4:
+                document = next(queue, None)
+                if document is None:
+                    break
+                future = threads.submit(sandbox.run, ingest_document, document[1], document[2], jd_skills)
+                in_flight[future] = document
+            if not in_flight:
+                return
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                document = in_flight.pop(future)
+                outcome = future.result()
+                finish(document, outcome['value'] if outcome['ok'] else
+                       _error_row(document[2], outcome['error']['message']))
+    finally:
+        threads.shutdown(wait=False, cancel_futures=True)
+
+
+def _run_one(document, jd_skills):
+    try:
+        return ingest_document(document[1], document[2], jd_skills)
+    except Exception as e:
+        return _error_row(document[2], str(e))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Parse and ATS-match resumes from directories and ZIP archives into CSV, JSONL or SQLite."
+    )
+    parser.add_argument('inputs', nargs='+', help="directories, ZIP archives or resume files (.pdf, .txt)")
+    parser.add_argument('-o', '--output', required=True, help="results file: .csv, .jsonl or .sqlite3")
+    parser.add_argument('--format', choices=sorted(WRITERS), help="output format (default: from the extension)")
+    jd = parser.add_mutually_exclusive_group()
+    jd.add_argument('--jd', help="job description file (.pdf or .txt) to match every resume against")
+    jd.add_argument('--jd-text', help="job description text")
+    parser.add_argument('--workers', type=int, default=Config.BATCH_PARSE_WORKERS,
+                        help="parser (sandbox) processes, 0 parses in this process (default: %(default)s)")
+    parser.add_argument('--max-file-size', type=int, default=Config.MAX_CONTENT_LENGTH,
+                        help="skip documents larger than this many bytes, 0 = no limit (default: %(default)s)")
+    parser.add_argument('--restart', action='store_true', help="ignore the checkpoint and overwrite the output")
+    parser.add_argument('--quiet', action='store_true', help="no progress output")
+    args = parser.parse_args(argv)
+
+    jd_data = None
+    if args.jd:
+        jd_data = parse_job_description(args.jd)
+    elif args.jd_text:
+        jd_data = parse_job_description(text=args.jd_text)
+
+    try:
+        stats = ingest(args.inputs, args.output, jd_data, workers=args.workers, fmt=args.format,
+                       restart=args.restart, max_file_size=args.max_file_size,
+                       progress=None if args.quiet else sys.stderr)
+    except (CheckpointMismatch, ValueError) as e:
+        parser.error(str(e))
+    return 130 if stats['interrupted'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,185 @@
+"""Open roles with pre-parsed skill sets, scored against resumes in one pass"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from ranking import cross_scores
+from semantic import SemanticPool, TermMatrix
+
+
+class OpeningSet:
+    """Immutable snapshot of job openings ready for matching.
+
+    jobs holds one parsed JD per opening ({'job_id', 'title', 'text',
+    'skills'}), packed the matching bit-packed skill matrix and semantic the
+    TF-IDF vectors of their text, one row per job in the same order.
+    """
+
+    def __init__(self, vocabulary, jobs):
+        self.vocabulary = vocabulary
+        self.jobs = list(jobs)
+        self.packed = np.zeros((len(self.jobs), vocabulary.packed_width), dtype=np.uint8)
+        for row, jd_data in enumerate(self.jobs):
+            self.packed[row] = vocabulary.encode_packed(jd_data['skills'])
+        self.semantic = SemanticPool(TermMatrix.from_texts(jd_data['text'] for jd_data in self.jobs))
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def score(self, resume_skills):
+        """(N, M) overall-score matrix for a list of N resume skill dicts"""
+        resumes = np.zeros((len(resume_skills), self.vocabulary.packed_width), dtype=np.uint8)
+        for row, skills in enumerate(resume_skills):
+            resumes[row] = self.vocabulary.encode_packed(skills)
+        return cross_scores(self.vocabulary, resumes, self.packed)
+
+
+class JobCatalog:
+    """The open roles /match-jobs ranks candidates against.
+
+    Openings live in SQLite (shared by every worker process) with their
+    extracted skills, so a JD is parsed once when it is added rather than
+    on every match. snapshot() keeps the OpeningSet built from them until an
+    opening is added or removed in any process.
+    """
+
+    def __init__(self, db_path, vocabulary, taxonomy_version):
+        self.db_path = db_path
+        self.vocabulary = vocabulary
+        self.taxonomy_version = taxonomy_version
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._snapshot_generation = None
+
+        db = self._connect()
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS openings ("
+            "job_id TEXT PRIMARY KEY, title TEXT NOT NULL, text TEXT NOT NULL, "
+            "skills TEXT NOT NULL, taxonomy_version TEXT NOT NULL, updated REAL NOT NULL)"
+        )
+        db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        db.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('generation', '0')")
+
+    def _connect(self):
+        db = getattr(self._local, 'db', None)
+        if db is None or self._local.pid != os.getpid():
+            db = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            self._local.db = db
+            self._local.pid = os.getpid()
+        return db
+
+    def _generation(self):
+        return self._connect().execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()[0]
+
+    def _bump_generation(self, db):
+        db.execute("UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'generation'")
+
+    @property
+    def is_stale(self):
+        """True when some opening's skills were extracted with another taxonomy"""
+        return self._connect().execute(
+            "SELECT 1 FROM openings WHERE taxonomy_version != ? LIMIT 1", (self.taxonomy_version,)
+        ).fetchone() is not None
+
+    def set_taxonomy(self, vocabulary, taxonomy_version):
+        """Switch to a reloaded taxonomy; is_stale then reports whether
+        openings need a rebuild()"""
+        with self._lock:
+            self.vocabulary = vocabulary
+            self.taxonomy_version = taxonomy_version
+            self._snapshot = None
+
+    def put(self, job_id, jd_data):
+        """Add or replace an opening from a parsed JD (parse_job_description)"""
+        db = self._connect()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.execute(
+                "INSERT OR REPLACE INTO openings (job_id, title, text, skills, taxonomy_version, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, jd_data['title'], jd_data['text'], json.dumps(jd_data['skills']),
+                 self.taxonomy_version, time.time())
+            )
+            self._bump_generation(db)
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+
+    def remove(self, job_id):
+        """Delete an opening; returns False if it was not found"""
+        db = self._connect()
+        db.execute("BEGIN IMMEDIATE")
+        cursor = db.execute("DELETE FROM openings WHERE job_id = ?", (job_id,))
+        if cursor.rowcount:
+            self._bump_generation(db)
+        db.execute("COMMIT")
+        return cursor.rowcount > 0
+
+    def rebuild(self, extract_skills, passes=3):
+        """Re-extract the skills of openings parsed with another taxonomy.
+
+        Extraction runs outside any transaction, so put() and remove() are
+        not held up by it; the write lock is only taken to store the results.
+        An opening replaced meanwhile keeps its new row, and one another
+        process adds with an older taxonomy is picked up by the next pass.
+        """
+        taxonomy_version = self.taxonomy_version
+        db = self._connect()
+        for _ in range(passes):
+            rows = db.execute(
+                "SELECT job_id, text, updated FROM openings WHERE taxonomy_version != ?", (taxonomy_version,)
+            ).fetchall()
+            if not rows:
+                return
+            extracted = [(json.dumps(extract_skills(text)), taxonomy_version, job_id, updated)
+                         for job_id, text, updated in rows]
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.executemany(
+                    "UPDATE openings SET skills = ?, taxonomy_version = ? WHERE job_id = ? AND updated = ?",
+                    extracted
+                )
+                self._bump_generation(db)
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+
+    def count(self):
+        return self._connect().execute("SELECT COUNT(*) FROM openings").fetchone()[0]
+
+    def list(self):
+        """[{'job_id', 'title', 'skill_count'}] in job_id order"""
+        return [
+            {'job_id': job_id, 'title': title, 'skill_count': sum(len(s) for s in json.loads(skills).values())}
+            for job_id, title, skills in self._connect().execute(
+                "SELECT job_id, title, skills FROM openings ORDER BY job_id"
+            )
+        ]
+
+    def snapshot(self):
+        """OpeningSet of every opening, rebuilt only when the catalog changed"""
+        generation = self._generation()
+        with self._lock:
+            if self._snapshot is not None and self._snapshot_generation == generation:
+                return self._snapshot
+            vocabulary = self.vocabulary
+        jobs = [
+            {'job_id': job_id, 'title': title, 'text': text, 'skills': json.loads(skills)}
+            for job_id, title, text, skills in self._connect().execute(
+                "SELECT job_id, title, text, skills FROM openings ORDER BY job_id"
+            )
+        ]
+        snapshot = OpeningSet(vocabulary, jobs)
+        with self._lock:
+            if self.vocabulary is vocabulary:
+                self._snapshot = snapshot
+                self._snapshot_generation = generation
+        return snapshot
@@ -0,0 +1,317 @@
+"""Durable local job queue (SQLite) with an in-process worker pool"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+
+TERMINAL_STATES = ('done', 'failed')
+
+
+class LeaseLost(Exception):
+    """The job's lease expired and another worker has taken it over"""
+
+
+class JobQueue:
+    """SQLite-backed queue shared by every worker process on the host.
+
+    Jobs move queued -> running -> done/failed. A running job holds a lease
+    that its worker renews with heartbeats; if its process dies the lease
+    expires and the job is queued again (up to max_attempts), so nothing is
+    lost on a restart. Every worker-side write checks that the caller still
+    holds the job, so a worker whose lease lapsed cannot overwrite the
+    worker that took over.
+    """
+
+    def __init__(self, db_path, lease_seconds=600, retention_seconds=86400, max_attempts=2):
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.retention_seconds = retention_seconds
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+
+        db = self._connect()
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, kind TEXT NOT NULL, status TEXT NOT NULL, "
+            "payload TEXT NOT NULL, result TEXT, error TEXT, "
+            "completed INTEGER NOT NULL DEFAULT 0, total INTEGER NOT NULL DEFAULT 0, "
+            "attempts INTEGER NOT NULL DEFAULT 0, claimed_by TEXT, lease_until REAL, "
+            "created REAL NOT NULL, updated REAL NOT NULL)"
+        )
+        db.execute("CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created)")
+        # Partial results are appended one row each, never rewritten
+        db.execute("CREATE TABLE IF NOT EXISTS job_partials (job_id TEXT NOT NULL, entry TEXT NOT NULL)")
+        db.execute("CREATE INDEX IF NOT EXISTS job_partials_job ON job_partials (job_id)")
+        db.commit()
+
+    def _connect(self):
+        """One connection per thread per process"""
+        db = getattr(self._local, 'db', None)
+        if db is None or self._local.pid != os.getpid():
+            db = sqlite3.connect(self.db_path, timeout=10)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.row_factory = sqlite3.Row
+            self._local.db = db
+            self._local.pid = os.getpid()
+        return db
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def submit(self, kind, payload, total=0):
+        """Enqueue a job and return its id"""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        db = self._connect()
+        db.execute(
+            "INSERT INTO jobs (id, kind, status, payload, total, created, updated) "
+            "VALUES (?, ?, 'queued', ?, ?, ?, ?)",
+            (job_id, kind, json.dumps(payload), total, now, now)
+        )
+        db.commit()
+        return job_id
+
+    def get(self, job_id, partials_from=0):
+        """Return the job as a dict, or None if unknown.
+
+        partial_results holds the partial results from position
+        partials_from on, so pollers can fetch only the ones they lack.
+        """
+        db = self._connect()
+        row = db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        partials = db.execute(
+            "SELECT entry FROM job_partials WHERE job_id = ? ORDER BY rowid LIMIT -1 OFFSET ?",
+            (job_id, partials_from)
+        ).fetchall()
+        return {
+            'id': row['id'],
+            'kind': row['kind'],
+            'status': row['status'],
+            'progress': {'completed': row['completed'], 'total': row['total']},
+            'partial_results': [json.loads(entry) for (entry,) in partials],
+            'result': json.loads(row['result']) if row['result'] else None,
+            'error': row['error'],
+            'created': row['created'],
+            'updated': row['updated']
+        }
+
+    # ------------------------------------------------------------------
+    # Worker side
+    # ------------------------------------------------------------------
+
+    def claim(self, worker_id):
+        """Atomically take the oldest queued job, or return None"""
+        db = self._connect()
+        now = time.time()
+        cursor = db.execute(
+            "UPDATE jobs SET status = 'running', claimed_by = ?, lease_until = ?, "
+            "attempts = attempts + 1, updated = ? "
+            "WHERE id = (SELECT id FROM jobs WHERE status = 'queued' ORDER BY created LIMIT 1) "
+            "AND status = 'queued'",
+            (worker_id, now + self.lease_seconds, now)
+        )
+        db.commit()
+        if cursor.rowcount == 0:
+            return None
+        row = db.execute(
+            "SELECT id, kind, payload FROM jobs WHERE claimed_by = ? AND status = 'running' "
+            "ORDER BY updated DESC LIMIT 1",
+            (worker_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        # A retried job starts over: drop what the previous attempt reported
+        db.execute("DELETE FROM job_partials WHERE job_id = ?", (row['id'],))
+        db.commit()
+        return {'id': row['id'], 'kind': row['kind'], 'payload': json.loads(row['payload'])}
+
+    def _update_held(self, db, job_id, worker_id, assignments, values):
+        """UPDATE a running job only if worker_id still holds it; True if it did"""
+        cursor = db.execute(
+            f"UPDATE jobs SET {assignments} WHERE id = ? AND claimed_by = ? AND status = 'running'",
+            (*values, job_id, worker_id)
+        )
+        return cursor.rowcount > 0
+
+    def renew(self, job_id, worker_id):
+        """Extend the lease (a heartbeat); False if the job is no longer ours"""
+        db = self._connect()
+        held = self._update_held(db, job_id, worker_id, "lease_until = ?", (time.time() + self.lease_seconds,))
+        db.commit()
+        return held
+
+    def report_progress(self, job_id, worker_id, new_results, completed, total):
+        """Append partial results and update progress; False if the job is no longer ours"""
+        db = self._connect()
+        now = time.time()
+        held = self._update_held(db, job_id, worker_id, "completed = ?, total = ?, updated = ?, lease_until = ?",
+                                 (completed, total, now, now + self.lease_seconds))
+        if held:
+            db.executemany("INSERT INTO job_partials (job_id, entry) VALUES (?, ?)",
+                           [(job_id, json.dumps(entry)) for entry in new_results])
+        db.commit()
+        return held
+
+    def complete(self, job_id, worker_id, result):
+        """Store the result; False (nothing written) if the job is no longer ours"""
+        db = self._connect()
+        held = self._update_held(db, job_id, worker_id, "status = 'done', result = ?, completed = total, updated = ?",
+                                 (json.dumps(result), time.time()))
+        db.commit()
+        return held
+
+    def fail(self, job_id, worker_id, error):
+        """Mark the job failed; False (nothing written) if the job is no longer ours"""
+        db = self._connect()
+        held = self._update_held(db, job_id, worker_id, "status = 'failed', error = ?, updated = ?",
+                                 (error, time.time()))
+        db.commit()
+        return held
+
+    def recover_expired(self):
+        """Requeue (or fail) running jobs whose worker stopped renewing the lease.
+
+        Returns the jobs failed here, shaped like claim()'s, so the caller
+        can run the same on-finish cleanup a worker would have.
+        """
+        db = self._connect()
+        now = time.time()
+        db.execute(
+            "UPDATE jobs SET status = 'queued', claimed_by = NULL, lease_until = NULL, updated = ? "
+            "WHERE status = 'running' AND lease_until < ? AND attempts < ?",
+            (now, now, self.max_attempts)
+        )
+        expired = db.execute(
+            "SELECT id, kind, payload FROM jobs WHERE status = 'running' AND lease_until < ?", (now,)
+        ).fetchall()
+        failed = []
+        for row in expired:
+            # Conditional per job, so a worker that renewed in between keeps it
+            cursor = db.execute(
+                "UPDATE jobs SET status = 'failed', error = 'Job was interrupted too many times', updated = ? "
+                "WHERE id = ? AND status = 'running' AND lease_until < ?",
+                (now, row['id'], now)
+            )
+            if cursor.rowcount:
+                failed.append({'id': row['id'], 'kind': row['kind'], 'payload': json.loads(row['payload'])})
+        db.commit()
+        return failed
+
+    def purge_old(self):
+        """Delete finished jobs older than the retention window"""
+        db = self._connect()
+        cutoff = time.time() - self.retention_seconds
+        db.execute(
+            "DELETE FROM job_partials WHERE job_id IN "
+            "(SELECT id FROM jobs WHERE status IN ('done', 'failed') AND updated < ?)",
+            (cutoff,)
+        )
+        db.execute("DELETE FROM jobs WHERE status IN ('done', 'failed') AND updated < ?", (cutoff,))
+        db.commit()
+
+
+class JobWorkerPool:
+    """Background threads that pull jobs from a JobQueue and run handlers.
+
+    handlers maps a job kind to fn(payload, report) -> result, where
+    report(new_results, completed, total) appends partial results and
+    publishes progress. While a handler runs, a heartbeat renews the job's
+    lease every third of lease_seconds, so a long LLM call does not let it
+    expire; if the job was taken over anyway, report raises LeaseLost and
+    the result is dropped. Threads do not survive fork, so start() is safe
+    to call on every request.
+    """
+
+    def __init__(self, queue, handlers, workers=2, poll_interval=0.5, on_finish=None):
+        self.queue = queue
+        self.handlers = handlers
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.on_finish = on_finish
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._started_pid = None
+
+    def start(self):
+        if self.workers <= 0 or self._started_pid == os.getpid():
+            return
+        with self._lock:
+            if self._started_pid == os.getpid():
+                return
+            self._started_pid = os.getpid()
+            for i in range(self.workers):
+                worker_id = f"{os.getpid()}-{i}-{uuid.uuid4().hex[:6]}"
+                thread = threading.Thread(target=self._loop, args=(worker_id,), name=f"job-worker-{i}", daemon=True)
+                thread.start()
+
+    def notify(self):
+        """Wake idle workers immediately after a submit"""
+        self._wakeup.set()
+
+    def _loop(self, worker_id):
+        last_maintenance = 0
+        while True:
+            try:
+                if time.time() - last_maintenance > 60:
+                    for failed in self.queue.recover_expired():
+                        if self.on_finish is not None:
+                            self.on_finish(failed)
+                    self.queue.purge_old()
+                    last_maintenance = time.time()
+
+                job = self.queue.claim(worker_id)
+                if job is None:
+                    self._wakeup.wait(self.poll_interval)
+                    self._wakeup.clear()
+                    continue
+                self._run(job, worker_id)
+            except Exception as e:
+                print(f"Job worker error: {e}")
+                traceback.print_exc()
+                time.sleep(self.poll_interval)
+
+    def _heartbeat(self, job_id, worker_id, stop, lost):
+        while not stop.wait(self.queue.lease_seconds / 3):
+            try:
+                if not self.queue.renew(job_id, worker_id):
+                    lost.set()
+                    return
+            except Exception as e:
+                print(f"Job {job_id} heartbeat error: {e}")
+
+    def _run(self, job, worker_id):
+        handler = self.handlers.get(job['kind'])
+        stop, lost = threading.Event(), threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job['id'], worker_id, stop, lost),
+                                     name=f"job-heartbeat-{job['id'][:8]}", daemon=True)
+        heartbeat.start()
+        try:
+            if handler is None:
+                raise ValueError(f"Unknown job kind: {job['kind']}")
+
+            def report(new_results, completed, total):
+                if lost.is_set() or not self.queue.report_progress(job['id'], worker_id, new_results,
+                                                                   completed, total):
+                    raise LeaseLost(job['id'])
+
+            result = handler(job['payload'], report)
+            if not self.queue.complete(job['id'], worker_id, result):
+                raise LeaseLost(job['id'])
+        except LeaseLost:
+            print(f"Job {job['id']} was taken over by another worker; dropping this attempt's result")
+            return
+        except Exception as e:
+            print(f"Job {job['id']} failed: {e}")
+            traceback.print_exc()
+            self.queue.fail(job['id'], worker_id, str(e))
+        finally:
+            stop.set()
+            heartbeat.join()
+        if self.on_finish is not None:
+            self.on_finish(job)
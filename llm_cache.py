@@ -0,0 +1,259 @@
+"""Prompt-fingerprint response cache with in-flight request coalescing"""
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+def prompt_fingerprint(llm, prompt):
+    """Stable hash of the model settings plus the exact prompt sent"""
+    if isinstance(prompt, str):
+        payload = prompt
+    else:
+        payload = [(getattr(m, 'type', type(m).__name__), m.content) for m in prompt]
+    settings = {
+        'model': getattr(llm, 'model_name', None) or getattr(llm, 'model', None),
+        'temperature': getattr(llm, 'temperature', None)
+    }
+    raw = json.dumps([settings, payload], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def _wake(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class _InFlight:
+    """A pending upstream call that concurrent identical requests wait on"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+        self._lock = threading.Lock()
+        self._futures = []  # (loop, asyncio.Future) of async waiters
+
+    def wait_async(self):
+        """An asyncio future that is done once the call settles; awaiting it
+        holds no thread, unlike waiting on the event"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            if not self.event.is_set():
+                self._futures.append((loop, future))
+                return future
+        future.set_result(None)
+        return future
+
+    def settle(self):
+        """Wake every waiter, sync and async"""
+        with self._lock:
+            self.event.set()
+            futures, self._futures = self._futures, []
+        for loop, future in futures:
+            try:
+                loop.call_soon_threadsafe(_wake, future)
+            except RuntimeError:  # that waiter's loop is closed
+                pass
+
+    def result(self):
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+def _accepts(valid, response):
+    if valid is None:
+        return True
+    try:
+        return bool(valid(response))
+    except Exception:
+        return False
+
+
+class LLMResponseCache:
+    """TTL + LRU cache in front of llm.invoke.
+
+    Identical prompts (same model, temperature and messages) are answered from
+    the cache while fresh. If an identical prompt is already being sent
+    upstream, later callers wait for that call instead of issuing their own.
+    Errors are never cached; they are re-raised to every waiting caller.
+    Neither is a reply that valid(response), if given, rejects (e.g. one
+    whose JSON does not parse): it is returned, but the next identical
+    prompt goes upstream again. on_upstream(response, seconds), if given, is called after each call
+    that actually reached the LLM (e.g. to count tokens spent).
+    """
+
+    def __init__(self, ttl=3600, max_entries=1024, on_upstream=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.on_upstream = on_upstream
+
+        self._entries = OrderedDict()  # key -> (expires_at, response)
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.upstream_errors = 0
+        self.rejected = 0
+
+    def invoke(self, llm, prompt, valid=None):
+        """Return llm.invoke(prompt), served from cache when possible"""
+        if self.max_entries <= 0 or self.ttl <= 0:
+            return self._upstream(llm, prompt)
+
+        key = prompt_fingerprint(llm, prompt)
+        response, flight, leader = self._lookup(key)
+        if flight is None:
+            return response
+        if not leader:
+            flight.event.wait()
+            return flight.result()
+
+        try:
+            response = self._upstream(llm, prompt)
+        except BaseException as e:
+            self._settle(key, flight, error=e)
+            raise
+        self._settle(key, flight, response=response, valid=valid)
+        return response
+
+    async def ainvoke(self, llm, prompt, valid=None):
+        """Async invoke(): awaits llm.ainvoke on a miss. Shares entries and
+        in-flight calls with invoke(), so sync and async callers coalesce."""
+        if self.max_entries <= 0 or self.ttl <= 0:
+            return await self._aupstream(llm, prompt)
+
+        key = prompt_fingerprint(llm, prompt)
+        response, flight, leader = self._lookup(key)
+        if flight is None:
+            return response
+        if not leader:
+            await flight.wait_async()
+            return flight.result()
+
+        try:
+            response = await self._aupstream(llm, prompt)
+        except BaseException as e:
+            self._settle(key, flight, error=e)
+            raise
+        self._settle(key, flight, response=response, valid=valid)
+        return response
+
+    def _lookup(self, key):
+        """(response, None, False) on a fresh hit, else (None, flight, leader)
+        where the leader must call upstream and settle the flight"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, response = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return response, None, False
+                del self._entries[key]
+
+            flight = self._in_flight.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                return None, flight, False
+            flight = self._in_flight[key] = _InFlight()
+            self.misses += 1
+            return None, flight, True
+
+    def _settle(self, key, flight, response=None, error=None, valid=None):
+        """Publish the leader's outcome to waiters; errors and replies valid() rejects are not cached"""
+        keep = error is None and _accepts(valid, response)
+        with self._lock:
+            if error is None:
+                flight.value = response
+                if keep:
+                    self._store(key, response)
+                else:
+                    self.rejected += 1
+            else:
+                flight.error = error
+                self.upstream_errors += 1
+            self._in_flight.pop(key, None)
+        flight.settle()
+
+    def _upstream(self, llm, prompt):
+        start = time.perf_counter()
+        response = llm.invoke(prompt)
+        if self.on_upstream is not None:
+            self.on_upstream(response, time.perf_counter() - start)
+        return response
+
+    async def _aupstream(self, llm, prompt):
+        start = time.perf_counter()
+        response = await llm.ainvoke(prompt)
+        if self.on_upstream is not None:
+            self.on_upstream(response, time.perf_counter() - start)
+        return response
+
+    def peek(self, llm, prompt):
+        """Return a fresh cached response without calling upstream, or None.
+
+        For callers such as token streaming that talk to the LLM themselves
+        and hand the finished response back via store().
+        """
+        if self.max_entries <= 0 or self.ttl <= 0:
+            return None
+        key = prompt_fingerprint(llm, prompt)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def store(self, llm, prompt, response):
+        """Cache a response that was obtained outside invoke()"""
+        if self.max_entries <= 0 or self.ttl <= 0:
+            return
+        key = prompt_fingerprint(llm, prompt)
+        with self._lock:
+            self._store(key, response)
+
+    def _store(self, key, response):
+        self._entries[key] = (time.monotonic() + self.ttl, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def after_fork(self):
+        """In a forked child: a fresh lock, in case another thread held this
+        one at the fork, and none of the parent's in-flight calls"""
+        self._lock = threading.Lock()
+        self._in_flight = {}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'hit_rate': round((self.hits + self.coalesced) / lookups, 3) if lookups else 0.0,
+                'evictions': self.evictions,
+                'upstream_errors': self.upstream_errors,
+                'rejected': self.rejected,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl
+            }
@@ -0,0 +1,376 @@
+"""Resilient front for the Groq chat model: deadlines, retries, circuit breaker, rate limit"""
+import asyncio
+import random
+import re
+import threading
+import time
+
+# Errors worth another attempt: throttling, server-side failures, timeouts
+# (plus groq.APIConnectionError, which covers the SDK's timeouts)
+RETRYABLE_STATUS = frozenset({408, 409, 429, 500, 502, 503, 504})
+TRANSIENT_ERRORS = (TimeoutError, ConnectionError)
+
+_PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+
+class LLMUnavailable(Exception):
+    """Raised without calling upstream when the circuit is open, the rate
+    limit cannot be met before the deadline, or retries ran out of time.
+    Callers treat it like any other LLM failure (fallback analysis)."""
+
+
+def parse_rate(spec):
+    """'30 per minute' -> (30, 60.0): requests allowed per period in seconds"""
+    match = re.fullmatch(r'\s*(\d+)\s*(?:per|/)\s*(second|minute|hour|day)s?\s*', spec or '', re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Unrecognized rate limit {spec!r}; expected e.g. '30 per minute'")
+    return int(match.group(1)), float(_PERIODS[match.group(2).lower()])
+
+
+class TokenBucket:
+    """Client-side rate limiter: capacity tokens, refilled at rate per second"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_spec(cls, spec):
+        count, period = parse_rate(spec)
+        return cls(count / period, count)
+
+    def try_acquire(self):
+        """Take one token if available (returns 0), else the seconds until one is"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self, timeout=None):
+        """Take one token, waiting up to timeout seconds; False if none came"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return True
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    async def acquire_async(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return True
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            await asyncio.sleep(wait)
+
+
+class CircuitBreaker:
+    """Opens after failure_threshold consecutive failures and rejects calls
+    for reset_timeout seconds; then lets one trial call through (half-open)
+    and closes again if it succeeds."""
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+        self.opened = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self):
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def release(self):
+        """Give back a half-open trial slot without a verdict (call never made)"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self.opened += 1
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+def is_retryable(error):
+    import groq  # already loaded by the client that raised error
+
+    if isinstance(error, TRANSIENT_ERRORS + (groq.APIConnectionError,)):
+        return True
+    return getattr(error, 'status_code', None) in RETRYABLE_STATUS
+
+
+def _retry_after(error):
+    """Seconds the server asked us to wait (Retry-After), if any"""
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    try:
+        return float(headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+
+class LLMGateway:
+    """Wraps a chat model (invoke/stream) with the policies every caller needs.
+
+    Each invoke() gets a deadline for all attempts together. Failures that
+    look transient (429, 5xx, timeouts, dropped connections) are retried
+    with full-jitter exponential backoff, honouring Retry-After, while the
+    deadline allows. Each failed attempt counts towards the circuit
+    breaker; once it opens, calls raise LLMUnavailable immediately so the
+    caller's fallback runs without waiting on a sick upstream. The optional
+    token bucket keeps us under the provider's request quota. Other
+    attributes are read from the wrapped model.
+
+    The deadline also bounds the attempt in flight: ainvoke() cancels it,
+    and with attempt_timeout set invoke() and stream() pass the client
+    timeout=min(attempt_timeout, time left) on every attempt (ChatGroq
+    hands it to the SDK as the per-request timeout). Without it, a sync
+    attempt is only bounded by the client's own timeout.
+
+    client may be given as client_factory instead, a callable that builds
+    it on first use, so constructing the gateway imports nothing heavy.
+    model_name and temperature are then given too, so cache fingerprints
+    (llm_cache.prompt_fingerprint) never need the client.
+    """
+
+    def __init__(self, client=None, deadline=45.0, max_retries=2, backoff=0.5, backoff_max=8.0,
+                 breaker=None, bucket=None, client_factory=None, model_name=None, temperature=None,
+                 attempt_timeout=None):
+        if client is None and client_factory is None:
+            raise ValueError("LLMGateway needs a client or a client_factory")
+        self._client = client
+        self._client_factory = client_factory
+        self.model_name = model_name if model_name is not None else getattr(client, 'model_name', None)
+        self.temperature = temperature if temperature is not None else getattr(client, 'temperature', None)
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.attempt_timeout = attempt_timeout
+        self.breaker = breaker or CircuitBreaker()
+        self.bucket = bucket
+        self._lock = threading.Lock()
+        self._counts = {'calls': 0, 'failures': 0, 'retries': 0, 'rejected': 0, 'rate_limited': 0}
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._client_factory()
+        return self._client
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+    def _count(self, name):
+        with self._lock:
+            self._counts[name] += 1
+
+    def _check_breaker(self):
+        if not self.breaker.allow():
+            self._count('rejected')
+            raise LLMUnavailable("LLM circuit is open")
+
+    def _rate_limited(self):
+        self._count('rate_limited')
+        self.breaker.release()
+        return LLMUnavailable("LLM rate limit would be exceeded before the deadline")
+
+    def _admit(self, expires_at):
+        """Breaker and rate limit checks before an attempt"""
+        self._check_breaker()
+        if self.bucket is not None and not self.bucket.acquire(timeout=max(0.0, expires_at - time.monotonic())):
+            raise self._rate_limited()
+
+    async def _admit_async(self, expires_at):
+        self._check_breaker()
+        if self.bucket is not None and not await self.bucket.acquire_async(timeout=max(0.0, expires_at - time.monotonic())):
+            raise self._rate_limited()
+
+    def _retry_delay(self, attempt, error, expires_at):
+        """Seconds to wait before retrying after error, or None to give up.
+        Records the attempt's outcome with the breaker."""
+        if not is_retryable(error):
+            # Our request was bad (400, 401...): no verdict on upstream's
+            # health, so a half-open trial slot is just given back
+            self.breaker.release()
+            return None
+        self._count('failures')
+        self.breaker.record_failure()
+        if attempt >= self.max_retries:
+            return None
+        delay = random.uniform(0, min(self.backoff_max, self.backoff * (2 ** attempt)))
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        if time.monotonic() + delay >= expires_at:
+            return None
+        self._count('retries')
+        return delay
+
+    def _limit(self, kwargs, expires_at):
+        """kwargs for one sync attempt, with the client timeout clamped to the deadline"""
+        if self.attempt_timeout is None or 'timeout' in kwargs:
+            return kwargs
+        return dict(kwargs, timeout=max(0.001, min(self.attempt_timeout, expires_at - time.monotonic())))
+
+    def _attempts(self, call):
+        """call(expires_at) until it succeeds, retrying under the policies"""
+        expires_at = time.monotonic() + self.deadline
+        attempt = 0
+        while True:
+            self._admit(expires_at)
+            self._count('calls')
+            try:
+                result = call(expires_at)
+            except Exception as e:
+                delay = self._retry_delay(attempt, e, expires_at)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self.breaker.record_success()
+            return result
+
+    def invoke(self, prompt, **kwargs):
+        return self._attempts(lambda expires_at: self.client.invoke(prompt, **self._limit(kwargs, expires_at)))
+
+    async def ainvoke(self, prompt, **kwargs):
+        """Async invoke(). The deadline is enforced on the attempt itself
+        (cancelled when it expires), not just between attempts."""
+        expires_at = time.monotonic() + self.deadline
+        attempt = 0
+        while True:
+            await self._admit_async(expires_at)
+            self._count('calls')
+            try:
+                result = await asyncio.wait_for(self.client.ainvoke(prompt, **kwargs),
+                                                timeout=max(0.0, expires_at - time.monotonic()))
+            except asyncio.TimeoutError:
+                self._count('failures')
+                self.breaker.record_failure()
+                raise LLMUnavailable(f"LLM call exceeded its {self.deadline:g}s deadline")
+            except Exception as e:
+                delay = self._retry_delay(attempt, e, expires_at)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            self.breaker.record_success()
+            return result
+
+    def stream(self, prompt, **kwargs):
+        """Yield chunks; attempts are retried only until the first chunk arrives"""
+        chunks = self._attempts(lambda expires_at: self._first_chunk(prompt, self._limit(kwargs, expires_at)))
+        try:
+            yield from chunks
+        except Exception as e:
+            if is_retryable(e):
+                self._count('failures')
+                self.breaker.record_failure()
+            raise
+
+    def _first_chunk(self, prompt, kwargs):
+        iterator = iter(self.client.stream(prompt, **kwargs))
+        try:
+            first = next(iterator)
+        except StopIteration:
+            return iter(())
+
+        def chunks():
+            yield first
+            yield from iterator
+        return chunks()
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self._counts)
+        counts['circuit'] = self.breaker.state
+        counts['circuit_opened'] = self.breaker.opened
+        return counts
+
+
+def create_groq_gateway(api_key, model, temperature, base_url=None, timeout=20.0, pool_size=20,
+                        failure_threshold=5, reset_timeout=30.0, rate_limit=None, **policy):
+    """ChatGroq on a pooled keep-alive HTTP client, wrapped in an LLMGateway.
+
+    The SDK's own retries are switched off so the gateway is the only
+    layer deciding when to try again. timeout bounds each HTTP attempt;
+    policy (deadline, max_retries, backoff, backoff_max) bounds the call.
+    rate_limit is a spec such as '30 per minute', or None for no limit.
+    The client (and langchain_groq) is only loaded on the first call, in
+    the process that makes it, so no connection pool crosses a fork.
+    """
+    def build_client():
+        import httpx
+        from langchain_groq import ChatGroq
+
+        limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        return ChatGroq(
+            model=model,
+            temperature=temperature,
+            groq_api_key=api_key,
+            groq_api_base=base_url,
+            request_timeout=timeout,
+            max_retries=0,
+            http_client=httpx.Client(limits=limits, timeout=timeout),
+            http_async_client=httpx.AsyncClient(limits=limits, timeout=timeout)
+        )
+
+    return LLMGateway(
+        client_factory=build_client,
+        model_name=model,
+        temperature=temperature,
+        attempt_timeout=timeout,
+        breaker=CircuitBreaker(failure_threshold, reset_timeout),
+        bucket=TokenBucket.from_spec(rate_limit) if rate_limit else None,
+        **policy
+    )
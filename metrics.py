@@ -0,0 +1,220 @@
+"""Lightweight in-process Prometheus-style metrics"""
+import bisect
+import contextvars
+import functools
+import os
+import threading
+import time
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_request_stages = contextvars.ContextVar('request_stages', default=None)
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+class _Histogram:
+    __slots__ = ('counts', 'total', 'count')
+
+    def __init__(self, size):
+        self.counts = [0] * size
+        self.total = 0.0
+        self.count = 0
+
+
+class _Stage:
+    __slots__ = ('registry', 'name', 'start')
+
+    def __init__(self, registry, name):
+        self.registry = registry
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        self.registry.observe('stage_seconds', elapsed, stage=self.name)
+        self.registry._add_to_request({self.name: elapsed})
+        return False
+
+
+def call_with_stages(fn, *args):
+    """(fn(*args), {stage: seconds} timed inside it, pid) for work run in
+    another process, whose stages the caller hands to MetricsRegistry.absorb()"""
+    token = _request_stages.set({})
+    try:
+        return fn(*args), _request_stages.get(), os.getpid()
+    finally:
+        _request_stages.reset(token)
+
+
+class MetricsRegistry:
+    """Counters and fixed-bucket histograms rendered as Prometheus text.
+
+    observe() and inc() are a bisect plus a few additions under one lock,
+    cheap enough to leave on for every request. Values that already live
+    elsewhere (cache counters) are read at scrape time through collector()
+    callbacks instead of being mirrored on every update.
+
+    stage() times a block into the '<prefix>_stage_seconds' histogram and,
+    inside begin_request()/end_request(), also adds it to the per-request
+    totals used for the Server-Timing header. Those totals live in a
+    ContextVar: work handed to a thread must run in a copy of the request's
+    context (contextvars.copy_context().run), and work run in another
+    process goes through call_with_stages() and absorb(). Metrics are per
+    process: with several gunicorn workers each one reports its own series.
+    """
+
+    def __init__(self, prefix='resumeiq', buckets=DEFAULT_BUCKETS, enabled=True):
+        self.prefix = prefix
+        self.buckets = tuple(sorted(buckets))
+        self.enabled = enabled
+        self._histograms = {}  # name -> {label_key: _Histogram}
+        self._counters = {}    # name -> {label_key: value}
+        self._help = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def after_fork(self):
+        """In a forked child: a fresh lock, in case another thread held this one at the fork"""
+        self._lock = threading.Lock()
+
+    def describe(self, name, help_text):
+        self._help[name] = help_text
+
+    def observe(self, name, seconds, **labels):
+        if not self.enabled:
+            return
+        index = bisect.bisect_left(self.buckets, seconds)
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(len(self.buckets) + 1)
+            histogram.counts[index] += 1
+            histogram.total += seconds
+            histogram.count += 1
+
+    def inc(self, name, amount=1, **labels):
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def collector(self, fn):
+        """Register fn() -> iterable of (name, kind, labels, value), read at scrape time"""
+        self._collectors.append(fn)
+        return fn
+
+    def stage(self, name):
+        """Context manager timing a block as one stage"""
+        return _Stage(self, name)
+
+    def timed(self, name):
+        """Decorator form of stage()"""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def _add_to_request(self, stages):
+        totals = _request_stages.get()
+        if totals is not None:
+            # Threads that copied the request's context share this dict
+            with self._lock:
+                for name, seconds in stages.items():
+                    totals[name] = totals.get(name, 0.0) + seconds
+
+    def absorb(self, stages, pid):
+        """Record stages returned by call_with_stages() as if timed here:
+        into the current request's totals and, if they were timed in another
+        process (whose histograms are never scraped), into stage_seconds"""
+        if pid != os.getpid():
+            for name, seconds in stages.items():
+                self.observe('stage_seconds', seconds, stage=name)
+        self._add_to_request(stages)
+
+    def begin_request(self):
+        return _request_stages.set({})
+
+    def end_request(self, token=None):
+        """Stage totals for the current request ({name: seconds}), then stop collecting"""
+        stages = _request_stages.get() or {}
+        if token is not None:
+            _request_stages.reset(token)
+        else:
+            _request_stages.set(None)
+        return stages
+
+    @staticmethod
+    def server_timing(stages, total=None):
+        """Server-Timing header value: 'stage;dur=ms, ...'"""
+        entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in stages.items()]
+        if total is not None:
+            entries.append(f"total;dur={total * 1000:.1f}")
+        return ', '.join(entries)
+
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)"""
+        with self._lock:
+            histograms = {name: {key: (list(h.counts), h.total, h.count) for key, h in series.items()}
+                          for name, series in self._histograms.items()}
+            counters = {name: dict(series) for name, series in self._counters.items()}
+
+        lines = []
+
+        def header(name, kind):
+            full = f"{self.prefix}_{name}"
+            if name in self._help:
+                lines.append(f"# HELP {full} {self._help[name]}")
+            lines.append(f"# TYPE {full} {kind}")
+            return full
+
+        for name in sorted(counters):
+            full = header(name, 'counter')
+            for key, value in sorted(counters[name].items()):
+                lines.append(f"{full}{_format_labels(key)} {value}")
+
+        bounds = [repr(float(bound)) for bound in self.buckets] + ['+Inf']
+        for name in sorted(histograms):
+            full = header(name, 'histogram')
+            for key, (counts, total, count) in sorted(histograms[name].items()):
+                cumulative = 0
+                for bound, bucket_count in zip(bounds, counts):
+                    cumulative += bucket_count
+                    lines.append(f"{full}_bucket{_format_labels(key, [('le', bound)])} {cumulative}")
+                lines.append(f"{full}_sum{_format_labels(key)} {total}")
+                lines.append(f"{full}_count{_format_labels(key)} {count}")
+
+        collected = {}
+        for fn in self._collectors:
+            try:
+                for name, kind, labels, value in fn():
+                    collected.setdefault((name, kind), []).append((_label_key(labels), value))
+            except Exception as e:
+                print(f"Metrics collector error: {e}")
+        for (name, kind), samples in sorted(collected.items()):
+            full = header(name, kind)
+            for key, value in samples:
+                lines.append(f"{full}{_format_labels(key)} {value}")
+
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,185 @@
+"""Content-addressed cache for parsed resumes"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def file_digest(file_path, chunk_size=1024 * 1024):
+    """SHA-256 hex digest of a file's bytes"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def content_digest(source, chunk_size=1024 * 1024):
+    """SHA-256 hex digest of a path, a bytes-like buffer or a seekable stream"""
+    if isinstance(source, str):
+        return file_digest(source, chunk_size)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return hashlib.sha256(source).hexdigest()
+    digest = hashlib.sha256()
+    source.seek(0)
+    for chunk in iter(lambda: source.read(chunk_size), b''):
+        digest.update(chunk)
+    source.seek(0)
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """Two-tier cache of parse_resume results keyed by file content.
+
+    Keys combine the SHA-256 of the uploaded bytes, the file type and the
+    taxonomy version, so a taxonomy change never serves stale skills. Values
+    are stored JSON-encoded: the memory tier is an LRU bounded by total bytes,
+    and the optional disk tier is a SQLite file shared by all workers.
+    """
+
+    def __init__(self, version, max_bytes=64 * 1024 * 1024, disk_path=None, disk_max_entries=50000):
+        self.version = version
+        self.max_bytes = max_bytes
+        self.disk_path = disk_path
+        self.disk_max_entries = disk_max_entries
+
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._db = None
+        self._db_pid = None
+        self._disk_writes = 0
+
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _disk(self):
+        """SQLite connection for this process (never shared across a fork)"""
+        if not self.disk_path:
+            return None
+        if self._db is None or self._db_pid != os.getpid():
+            self._db = sqlite3.connect(self.disk_path, timeout=5, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS parse_cache ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS parse_cache_access ON parse_cache (last_access)")
+            self._db.commit()
+            self._db_pid = os.getpid()
+        return self._db
+
+    def key_for_digest(self, digest, extension):
+        return f"{digest}:{extension}:{self.version}"
+
+    # ------------------------------------------------------------------
+    # Lookup / store
+    # ------------------------------------------------------------------
+
+    def get(self, key):
+        """Return the cached parse result for key, or None"""
+        with self._lock:
+            blob = self._memory.get(key)
+            if blob is not None:
+                self._memory.move_to_end(key)
+                self.hits_memory += 1
+                return json.loads(blob)
+
+            db = self._disk()
+            if db is not None:
+                row = db.execute("SELECT value FROM parse_cache WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    db.execute("UPDATE parse_cache SET last_access = ? WHERE key = ?", (time.time(), key))
+                    db.commit()
+                    self._remember(key, row[0])
+                    self.hits_disk += 1
+                    return json.loads(row[0])
+
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        """Store a parse result in both tiers"""
+        blob = json.dumps(value).encode('utf-8')
+        with self._lock:
+            self._remember(key, blob)
+            db = self._disk()
+            if db is not None:
+                try:
+                    db.execute(
+                        "INSERT OR REPLACE INTO parse_cache (key, value, last_access) VALUES (?, ?, ?)",
+                        (key, blob, time.time())
+                    )
+                    self._disk_writes += 1
+                    # Trimming scans the index, so only do it every 100 writes
+                    if self._disk_writes % 100 == 0:
+                        db.execute(
+                            "DELETE FROM parse_cache WHERE key IN ("
+                            "SELECT key FROM parse_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                            (self.disk_max_entries,)
+                        )
+                    db.commit()
+                except sqlite3.Error as e:
+                    print(f"Parse cache write error: {e}")
+
+    def _remember(self, key, blob):
+        """Insert into the memory tier and evict least-recently-used entries"""
+        if len(blob) > self.max_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        self._memory[key] = blob
+        self._memory_bytes += len(blob)
+        while self._memory_bytes > self.max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.evictions += 1
+
+    def set_version(self, version):
+        """Switch to a new taxonomy version and drop entries keyed on any other"""
+        with self._lock:
+            if version == self.version:
+                return
+            self.version = version
+            self._memory.clear()
+            self._memory_bytes = 0
+            db = self._disk()
+            if db is not None:
+                db.execute("DELETE FROM parse_cache WHERE key NOT LIKE ?", (f"%:{version}",))
+                db.commit()
+
+    def after_fork(self):
+        """In a forked child: a fresh lock, in case another thread held this one at the fork"""
+        self._lock = threading.Lock()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            db = self._disk()
+            if db is not None:
+                db.execute("DELETE FROM parse_cache")
+                db.commit()
+
+    def stats(self):
+        """Hit/miss counters and tier sizes"""
+        with self._lock:
+            lookups = self.hits_memory + self.hits_disk + self.misses
+            hits = self.hits_memory + self.hits_disk
+            return {
+                'version': self.version,
+                'hits_memory': self.hits_memory,
+                'hits_disk': self.hits_disk,
+                'misses': self.misses,
+                'hit_rate': round(hits / lookups, 3) if lookups else 0.0,
+                'evictions': self.evictions,
+                'memory_entries': len(self._memory),
+                'memory_bytes': self._memory_bytes,
+                'memory_max_bytes': self.max_bytes,
+                'disk_enabled': bool(self.disk_path)
+            }
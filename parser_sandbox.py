@@ -0,0 +1,249 @@
+"""Parser sandbox: document extraction in disposable worker processes
+
+A malformed or hostile PDF can keep pdfplumber busy for minutes or grow
+it without bound, and neither is caught by an except clause in the web
+worker. ParserSandbox runs the extraction in a small pool of forked
+worker processes instead:
+
+- every document gets a wall-clock timeout; a worker that misses it is
+  killed and replaced,
+- each worker's address space is capped with RLIMIT_AS, so a runaway
+  allocation raises MemoryError (or kills only that worker),
+- a worker is recycled after max_documents documents, which bounds the
+  memory pdfplumber accumulates over time.
+
+Workers are forked from a process that runs other threads. A lock one of
+them held at the fork stays held in the child forever, so the caller's
+initializer, run first in every worker, must give the worker fresh
+copies of the locks fn takes (and detach anything, such as reload hooks,
+that must only run in the parent).
+
+run(fn, *args) returns {'ok': True, 'value'} or {'ok': False, 'error':
+{'type', 'message'}} with type one of 'timeout', 'memory' (MemoryError
+under the address-space cap), 'crashed' (the worker died, e.g. killed by
+a signal) or 'error' (an exception raised by fn), the same outcome shape
+as batch_executor. Workers are forked on demand, so a caller that parses
+one document at a time only ever starts one.
+
+fn runs in a worker, so it can be a whole parse (parse_resume) rather than
+just the PDF extraction; in_worker() lets code called from it see that it
+is already sandboxed and should not start a sandbox of its own.
+"""
+import multiprocessing
+import os
+import signal
+import threading
+from multiprocessing.connection import wait
+
+from startup import preload
+
+try:
+    import resource
+except ImportError:  # not POSIX: no sandbox, parse in-process
+    resource = None
+
+SANDBOX_SUPPORTED = resource is not None and 'fork' in multiprocessing.get_all_start_methods()
+
+_in_worker = False
+
+
+def in_worker():
+    """True inside a sandbox worker process"""
+    return _in_worker
+
+
+def _address_space():
+    """Bytes of address space this process maps now (0 if unknown)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _limit_memory(memory_limit):
+    """Cap address space at what the worker inherited plus memory_limit bytes"""
+    if memory_limit and resource is not None:
+        limit = _address_space() + memory_limit
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _worker_main(conn, memory_limit, max_documents, initializer):
+    """Serve fn(*args) for up to max_documents requests, then exit"""
+    global _in_worker
+    _in_worker = True
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if initializer is not None:
+        initializer()
+    _limit_memory(memory_limit)
+    for _ in range(max_documents or 1 << 62):
+        try:
+            fn, args = conn.recv()
+        except (EOFError, OSError):
+            return
+        except Exception as e:  # fn is not importable in this worker
+            conn.send({'ok': False, 'error': {'type': 'error', 'message': f"{type(e).__name__}: {e}"}})
+            continue
+        try:
+            outcome = {'ok': True, 'value': fn(*args)}
+        except MemoryError:
+            # The heap may be in any state after this; report it and retire
+            conn.send({'ok': False, 'error': {'type': 'memory', 'message': 'Parser exceeded its memory limit'}})
+            return
+        except Exception as e:
+            outcome = {'ok': False, 'error': {'type': 'error', 'message': f"{type(e).__name__}: {e}"}}
+        conn.send(outcome)
+
+
+class _Worker:
+    def __init__(self, context, memory_limit, max_documents, initializer):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child_conn, memory_limit, max_documents, initializer), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.documents = 0
+
+    def stop(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class ParserSandbox:
+    """Pool of up to `workers` forked processes, each running one fn(*args) at a time.
+
+    timeout is the wall-clock limit per document in seconds, memory_limit
+    the bytes each worker may map beyond what it inherited, and
+    max_documents how many documents a worker parses before it is replaced
+    (0 = never). preload names modules to import in this process before
+    the first fork, so workers do not import them each. initializer() runs
+    in each worker before its first document. queue_timeout bounds how
+    long run() waits for a free worker (default: timeout) before it gives
+    up with a 'timeout' outcome.
+    """
+
+    def __init__(self, workers=2, timeout=30.0, memory_limit=512 * 1024 * 1024, max_documents=50, preload=(),
+                 initializer=None, queue_timeout=None):
+        self.size = max(1, workers)
+        self.timeout = timeout
+        self.queue_timeout = timeout if queue_timeout is None else queue_timeout
+        self.initializer = initializer
+        self.memory_limit = memory_limit
+        self.max_documents = max_documents
+        self.preload = tuple(preload)
+        self._context = multiprocessing.get_context('fork')
+        self._idle = []
+        self._started = 0
+        self._available = threading.Condition()
+        self._stats = {'documents': 0, 'timeouts': 0, 'memory': 0, 'crashed': 0, 'errors': 0, 'recycled': 0}
+        self._closed = False
+
+    def _acquire(self):
+        """An idle or newly forked worker, or None if none was free within queue_timeout"""
+        with self._available:
+            if not self._available.wait_for(lambda: self._idle or self._started < self.size,
+                                            self.queue_timeout or None):
+                return None
+            if self._idle:
+                return self._idle.pop()
+            self._started += 1
+        try:
+            if self.preload:
+                preload(self.preload)
+            return _Worker(self._context, self.memory_limit, self.max_documents, self.initializer)
+        except BaseException:
+            self._release(None)
+            raise
+
+    def _release(self, worker):
+        """Return a worker to the pool, or free its slot if it was retired (None)"""
+        with self._available:
+            if worker is not None and not self._closed:
+                self._idle.append(worker)
+            else:
+                self._started -= 1
+                if worker is not None:
+                    worker.stop()
+            self._available.notify()
+
+    def run(self, fn, *args):
+        """fn(*args) in a worker: {'ok': True, 'value'} or {'ok': False, 'error': {'type', 'message'}}.
+
+        fn must be picklable (a module-level function); it is sent with its
+        arguments, so one sandbox can run different functions.
+        """
+        worker = self._acquire()
+        if worker is None:
+            with self._available:
+                self._stats['documents'] += 1
+                self._stats['timeouts'] += 1
+            return {'ok': False, 'error': {'type': 'timeout',
+                                           'message': f"No parser worker was free within {self.queue_timeout:g}s"}}
+        try:
+            outcome = self._call(worker, (fn, args))
+        except BaseException:
+            worker.stop()
+            self._release(None)
+            raise
+
+        worker.documents += 1
+        failed = outcome['error']['type'] if not outcome['ok'] else None
+        retire = failed in ('timeout', 'memory', 'crashed') or (
+            self.max_documents and worker.documents >= self.max_documents)
+        with self._available:
+            self._stats['documents'] += 1
+            if failed:
+                self._stats[{'timeout': 'timeouts', 'error': 'errors'}.get(failed, failed)] += 1
+            elif retire:
+                self._stats['recycled'] += 1
+        if retire:
+            worker.stop()
+            self._release(None)
+        else:
+            self._release(worker)
+        return outcome
+
+    def _call(self, worker, task):
+        try:
+            worker.conn.send(task)
+        except (BrokenPipeError, OSError):
+            return self._crashed(worker)
+        ready = wait([worker.conn, worker.process.sentinel], self.timeout)
+        if worker.conn in ready:
+            try:
+                return worker.conn.recv()
+            except (EOFError, OSError):
+                return self._crashed(worker)
+        if ready:
+            return self._crashed(worker)
+        worker.stop()
+        return {'ok': False, 'error': {'type': 'timeout',
+                                       'message': f"Parser did not finish within {self.timeout:g}s"}}
+
+    def _crashed(self, worker):
+        worker.process.join(1)
+        code = worker.process.exitcode
+        if code is not None and code < 0:
+            name = signal.Signals(-code).name if -code in signal.valid_signals() else str(-code)
+            message = f"Parser process killed by {name}"
+        else:
+            message = f"Parser process exited with code {code}"
+        # Not 'memory': only a MemoryError the worker reported shows the cap
+        # was hit; a SIGKILL may be the OOM killer, or anything else
+        return {'ok': False, 'error': {'type': 'crashed', 'message': message}}
+
+    def stats(self):
+        with self._available:
+            return dict(self._stats, workers=self._started, idle=len(self._idle))
+
+    def close(self):
+        """Stop every idle worker; busy ones are stopped when they finish"""
+        with self._available:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._started -= len(idle)
+        for worker in idle:
+            worker.stop()
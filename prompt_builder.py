@@ -0,0 +1,165 @@
+"""Token-budgeted prompt context: the most relevant resume/JD passages, not the first N characters
+
+A document is split into sections at recognised headings (experience,
+skills, education, requirements, ...), each section into passages of a
+few lines, and every passage is scored by how many of the job's skills it
+mentions per token, weighted by how much its section usually matters. The
+best passages are packed greedily into the token budget and emitted in
+document order under their section headings, so the experience section
+is no longer cut off by a long header or boilerplate.
+
+Token counts are estimates (no tokenizer download): every word or
+punctuation mark counts as at least one token, and long words as one per
+four characters.
+"""
+import re
+
+TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+LONG_WORD_RE = re.compile(r"\w{5,}")
+PASSAGE_TOKENS = 60  # passages grow line by line up to about this size
+
+RESUME_SECTIONS = {
+    'experience': ('experience', 'work experience', 'professional experience', 'employment',
+                   'employment history', 'work history', 'career history', 'relevant experience'),
+    'projects': ('projects', 'personal projects', 'key projects', 'selected projects'),
+    'skills': ('skills', 'technical skills', 'core competencies', 'competencies', 'technologies',
+               'tech stack', 'tools', 'skills & tools', 'skills and tools'),
+    'summary': ('summary', 'profile', 'professional summary', 'about me', 'objective', 'career objective'),
+    'certifications': ('certifications', 'certificates', 'licenses', 'licenses & certifications'),
+    'education': ('education', 'academic background', 'academics', 'education & training'),
+}
+JD_SECTIONS = {
+    'requirements': ('requirements', 'qualifications', 'minimum qualifications', 'preferred qualifications',
+                     'required skills', 'skills', 'must have', 'nice to have', 'what you bring',
+                     'what we are looking for', "what we're looking for", 'who you are'),
+    'responsibilities': ('responsibilities', 'key responsibilities', 'what you will do', "what you'll do",
+                         'the role', 'about the role', 'duties', 'your role'),
+    'company': ('about us', 'about the company', 'who we are', 'benefits', 'perks', 'why join us',
+                'equal opportunity', 'our culture', 'compensation'),
+}
+# How much a passage is worth before counting skills; 'header' is the text
+# before the first heading (contact details, a resume title, the job title)
+RESUME_WEIGHTS = {'experience': 3.0, 'projects': 2.0, 'skills': 2.0, 'summary': 1.5,
+                  'certifications': 1.0, 'education': 1.0, 'other': 0.5, 'header': 0.3}
+JD_WEIGHTS = {'requirements': 3.0, 'responsibilities': 2.0, 'header': 1.5, 'other': 1.0, 'company': 0.1}
+SKILL_WEIGHT = 2.0  # added per distinct job skill a passage mentions
+
+
+def estimate_tokens(text):
+    """Approximate LLM token count of text"""
+    # ceil(len / 4) per word is one token plus one per further 4 characters
+    return len(TOKEN_RE.findall(text)) + sum((len(word) - 1) // 4 for word in LONG_WORD_RE.findall(text))
+
+
+def _heading_key(line):
+    return re.sub(r'\s+', ' ', line.strip().strip('#*=-_:|•').strip()).lower()
+
+
+def split_sections(text, sections):
+    """[(section, heading line or None, [lines])] in document order.
+
+    A line is a heading when it names a known section (sections maps a
+    section to its spellings), or is a short all-caps line ('other').
+    """
+    headings = {spelling: section for section, spellings in sections.items() for spelling in spellings}
+    result = [('header', None, [])]
+    for line in text.splitlines():
+        stripped = line.strip()
+        key = _heading_key(stripped)
+        if key in headings and len(stripped) <= 60:
+            result.append((headings[key], stripped, []))
+        elif stripped and len(stripped.split()) <= 4 and stripped.isupper() and any(c.isalpha() for c in stripped):
+            result.append(('other', stripped, []))
+        else:
+            result[-1][2].append(line)
+    return [entry for entry in result if entry[1] is not None or any(line.strip() for line in entry[2])]
+
+
+def _passages(lines):
+    """Group a section's lines into passages of about PASSAGE_TOKENS,
+    breaking at blank lines; overlong lines are split by words"""
+    passages, current, size = [], [], 0
+    for line in lines:
+        stripped = line.strip()
+        if not stripped:
+            if current:
+                passages.append("\n".join(current))
+            current, size = [], 0
+            continue
+        words = stripped.split()
+        pieces = [" ".join(words[i:i + PASSAGE_TOKENS]) for i in range(0, len(words), PASSAGE_TOKENS)]
+        for piece in pieces:
+            tokens = estimate_tokens(piece)
+            if current and size + tokens > PASSAGE_TOKENS:
+                passages.append("\n".join(current))
+                current, size = [], 0
+            current.append(piece)
+            size += tokens
+    if current:
+        passages.append("\n".join(current))
+    return passages
+
+
+def build_context(text, budget, sections, weights, find_skills=None, targets=()):
+    """Pick the passages of text worth sending within a token budget.
+
+    find_skills(passage) returns the skill names a passage mentions and
+    targets the skills that count (the job's). Returns {'text', 'tokens',
+    'source_tokens', 'sections', 'passages', 'passages_used'}; text is
+    returned whole when it already fits.
+    """
+    source_tokens = estimate_tokens(text)
+    if source_tokens <= budget:
+        return {'text': text.strip(), 'tokens': source_tokens, 'source_tokens': source_tokens,
+                'sections': [], 'passages': None, 'passages_used': None}
+
+    targets = set(targets)
+    candidates = []  # (density, order, section index, passage, tokens)
+    seen = set()
+    parsed = split_sections(text, sections)
+    for section_index, (section, _, lines) in enumerate(parsed):
+        for passage in _passages(lines):
+            if passage in seen:
+                continue
+            seen.add(passage)
+            tokens = estimate_tokens(passage)
+            hits = len(targets.intersection(find_skills(passage))) if find_skills and targets else 0
+            value = weights.get(section, weights['other']) + SKILL_WEIGHT * hits
+            candidates.append((value / tokens, len(candidates), section_index, passage, tokens))
+
+    chosen, used = [], 0
+    headed = set()
+    for density, order, section_index, passage, tokens in sorted(candidates, key=lambda c: (-c[0], c[1])):
+        heading = parsed[section_index][1]
+        cost = tokens + (estimate_tokens(heading) if heading and section_index not in headed else 0)
+        if used + cost > budget:
+            continue
+        chosen.append((order, section_index, passage))
+        headed.add(section_index)
+        used += cost
+
+    out, current_section = [], None
+    for _, section_index, passage in sorted(chosen):
+        if section_index != current_section:
+            heading = parsed[section_index][1]
+            if heading:
+                out.append(heading)
+            current_section = section_index
+        out.append(passage)
+    selected = "\n".join(out)
+    return {
+        'text': selected,
+        'tokens': estimate_tokens(selected),
+        'source_tokens': source_tokens,
+        'sections': list(dict.fromkeys(parsed[section_index][0] for _, section_index, _ in sorted(chosen))),
+        'passages': len(candidates),
+        'passages_used': len(chosen)
+    }
+
+
+def resume_context(text, budget, find_skills=None, targets=()):
+    return build_context(text, budget, RESUME_SECTIONS, RESUME_WEIGHTS, find_skills, targets)
+
+
+def jd_context(text, budget, find_skills=None, targets=()):
+    return build_context(text, budget, JD_SECTIONS, JD_WEIGHTS, find_skills, targets)
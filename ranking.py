@@ -0,0 +1,237 @@
+"""Vectorized candidate ranking over a fixed skill vocabulary (NumPy)"""
+import heapq
+
+import numpy as np
+
+
+def _rounded_percentages(denominator):
+    """round(m / d * 100, 1) for every m in 0..d, computed exactly as
+    calculate_skill_match does (Python round, not np.round, which differs
+    on ties)"""
+    return np.array(
+        [round((m * 10) / (denominator * 10) * 100, 1) for m in range(denominator + 1)],
+        dtype=np.float64
+    )
+
+
+class SkillVocabulary:
+    """Fixed column order over every (category, skill) pair in the taxonomy"""
+
+    def __init__(self, taxonomy):
+        self.categories = list(taxonomy.keys())
+        self.columns = []
+        self.index = {}
+        category_ids = []
+        for category_id, category in enumerate(self.categories):
+            for skill in taxonomy[category]:
+                if (category, skill) in self.index:
+                    continue
+                self.index[(category, skill)] = len(self.columns)
+                self.columns.append((category, skill))
+                category_ids.append(category_id)
+        self.category_ids = np.array(category_ids, dtype=np.int32)
+        self.size = len(self.columns)
+        self.packed_width = (self.size + 7) // 8
+
+    def columns_for(self, skills):
+        """Column indexes for a {category: [skills]} dict (unknown skills ignored)"""
+        cols = set()
+        for category, skills_list in skills.items():
+            for skill in skills_list:
+                col = self.index.get((category, skill))
+                if col is not None:
+                    cols.add(col)
+        return sorted(cols)
+
+    def encode(self, skills):
+        """Bool presence vector for one {category: [skills]} dict"""
+        vector = np.zeros(self.size, dtype=bool)
+        vector[self.columns_for(skills)] = True
+        return vector
+
+    def encode_packed(self, skills):
+        """Presence vector packed 8 skills per byte"""
+        return np.packbits(self.encode(skills))
+
+
+class CandidatePool:
+    """Bit-packed skill matrix (one row per candidate) scored in batch.
+
+    Scores are exactly equal to calculate_skill_match for skill dicts
+    produced by the same taxonomy.
+    """
+
+    def __init__(self, vocabulary, capacity=1024):
+        self.vocabulary = vocabulary
+        self._rows = np.zeros((capacity, vocabulary.packed_width), dtype=np.uint8)
+        self.ids = []
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def matrix(self):
+        """Packed (N, packed_width) uint8 view of the live rows"""
+        return self._rows[:len(self.ids)]
+
+    def add(self, candidate_id, skills):
+        """Append one candidate; returns its row number"""
+        self.add_packed(candidate_id, self.vocabulary.encode_packed(skills))
+        return len(self.ids) - 1
+
+    def add_packed(self, candidate_id, packed_row):
+        if len(self.ids) == self._rows.shape[0]:
+            grown = np.zeros((max(1024, self._rows.shape[0] * 2), self._rows.shape[1]), dtype=np.uint8)
+            grown[:len(self.ids)] = self.matrix
+            self._rows = grown
+        self._rows[len(self.ids)] = packed_row
+        self.ids.append(candidate_id)
+
+    @classmethod
+    def from_skills(cls, vocabulary, items):
+        """Build a pool from (candidate_id, skills) pairs in one go"""
+        items = list(items)
+        pool = cls(vocabulary, capacity=max(1, len(items)))
+        if items:
+            dense = np.zeros((len(items), vocabulary.size), dtype=bool)
+            for row, (_, skills) in enumerate(items):
+                dense[row, vocabulary.columns_for(skills)] = True
+            pool._rows = np.packbits(dense, axis=1)
+            pool.ids = [candidate_id for candidate_id, _ in items]
+        return pool
+
+    def score(self, jd_skills):
+        """Score every candidate against one JD (see score_packed)"""
+        return score_packed(self.vocabulary, self.matrix, jd_skills)
+
+    def top_k(self, jd_skills, k=10):
+        """[(candidate_id, overall_score)] for the k best candidates"""
+        overall = self.score(jd_skills)['overall_score']
+        return [(self.ids[i], float(overall[i])) for i in top_k_rows(overall, k)]
+
+
+def jd_hits(packed, jd_cols):
+    """(N, len(jd_cols)) bool matrix: does each row have each JD skill.
+
+    Only the bytes holding JD columns are read, so this works directly on a
+    memory-mapped matrix without unpacking the rest.
+    """
+    cols = np.asarray(jd_cols, dtype=np.int64)
+    byte = np.asarray(packed[:, cols >> 3])
+    return ((byte >> (7 - (cols & 7)).astype(np.uint8)) & 1).astype(bool)
+
+
+def score_packed(vocabulary, packed, jd_skills):
+    """Score every row of a packed skill matrix against one JD.
+
+    Returns {'overall_score': float array (N,),
+             'category_scores': {category: float array (N,)},
+             'matched_count': int array (N,), 'jd_columns': [int]}
+    Categories without JD skills are omitted, as in calculate_skill_match.
+    """
+    jd_cols = vocabulary.columns_for(jd_skills)
+    n = packed.shape[0]
+    if not jd_cols or n == 0:
+        return {
+            'overall_score': np.zeros(n),
+            'category_scores': {},
+            'matched_count': np.zeros(n, dtype=np.int64),
+            'jd_columns': jd_cols
+        }
+
+    hits = jd_hits(packed, jd_cols)
+    jd_categories = vocabulary.category_ids[jd_cols]
+
+    category_scores = {}
+    for category_id in np.unique(jd_categories):
+        in_category = jd_categories == category_id
+        matched = hits[:, in_category].sum(axis=1)
+        table = _rounded_percentages(int(in_category.sum()))
+        category_scores[vocabulary.categories[category_id]] = table[matched]
+
+    matched_count = hits.sum(axis=1)
+    overall = _rounded_percentages(len(jd_cols))[matched_count]
+    return {
+        'overall_score': overall,
+        'category_scores': category_scores,
+        'matched_count': matched_count,
+        'jd_columns': jd_cols
+    }
+
+
+def cross_scores(vocabulary, resumes, jobs):
+    """Overall score of every (resume, job) pair, as one matrix product.
+
+    resumes is a packed (N, packed_width) skill matrix and jobs a packed
+    (M, packed_width) matrix of JD skills. Entry [i, j] of the (N, M)
+    result equals calculate_skill_match(resume i, job j)['overall_score'].
+    Only the columns some job asks for take part in the product.
+    """
+    job_dense = np.unpackbits(jobs, axis=1, count=vocabulary.size).astype(bool)
+    n, m = resumes.shape[0], job_dense.shape[0]
+    cols = np.flatnonzero(job_dense.any(axis=0))
+    if n == 0 or cols.size == 0:
+        return np.zeros((n, m))
+
+    # Counts stay far below 2**24, so float32 products are exact
+    resume_dense = jd_hits(resumes, cols).astype(np.float32)
+    matched = (resume_dense @ job_dense[:, cols].T.astype(np.float32)).astype(np.int64)
+    sizes = job_dense[:, cols].sum(axis=1)
+
+    table = np.zeros((sizes.max() + 1, sizes.max() + 1))
+    for size in np.unique(sizes):
+        if size:
+            table[size, :size + 1] = _rounded_percentages(int(size))
+    return table[sizes[np.newaxis, :], matched]
+
+
+def top_k_rows(scores, k, eligible=None):
+    """Row numbers of the k highest scores, best first; ties keep row order.
+
+    Uses argpartition so only the k winners are fully sorted. eligible is an
+    optional bool mask of rows that may be returned.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    if eligible is not None:
+        scores = np.where(eligible, scores, -np.inf)
+        available = int(np.count_nonzero(eligible))
+    else:
+        available = len(scores)
+    k = min(k, available)
+    if k <= 0:
+        return []
+    if k < len(scores):
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        # Pull in any rows tied with the k-th score so ties stay stable
+        cutoff = scores[candidates].min()
+        candidates = np.flatnonzero(scores >= cutoff)
+    else:
+        candidates = np.arange(len(scores))
+    order = candidates[np.lexsort((candidates, -scores[candidates]))][:k]
+    return [int(i) for i in order]
+
+
+class LiveRanking:
+    """Running top-k over results that arrive one at a time.
+
+    Keeps only k rows in a min-heap, so memory stays bounded however long
+    the stream is. Ties keep arrival order.
+    """
+
+    def __init__(self, k, key):
+        self.k = k
+        self.key = key
+        self.count = 0
+        self._heap = []
+
+    def push(self, row):
+        self.count += 1
+        item = (self.key(row), -self.count, row)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, item)
+        elif item[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, item)
+
+    def snapshot(self):
+        """Current top-k rows, best first"""
+        return [row for _, _, row in sorted(self._heap, key=lambda item: item[:2], reverse=True)]
@@ -0,0 +1,166 @@
+"""Server-side storage for analysis results referenced from the session cookie"""
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+
+class MemoryResultStore:
+    """Per-process LRU store; only suitable for a single worker process"""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, blob)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, blob = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return json.loads(blob)
+
+    def set(self, key, value, ttl):
+        blob = json.dumps(value)
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, blob)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def purge_expired(self):
+        now = time.time()
+        with self._lock:
+            for key in [k for k, (expires_at, _) in self._entries.items() if expires_at <= now]:
+                del self._entries[key]
+
+
+class SQLiteResultStore:
+    """Store shared by all worker processes on the host via one SQLite file"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._local = threading.local()
+        db = self._connect()
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        db.execute("CREATE INDEX IF NOT EXISTS results_expires ON results (expires_at)")
+        db.commit()
+
+    def _connect(self):
+        db = getattr(self._local, 'db', None)
+        if db is None or self._local.pid != os.getpid():
+            db = sqlite3.connect(self.db_path, timeout=10)
+            db.execute("PRAGMA journal_mode=WAL")
+            self._local.db = db
+            self._local.pid = os.getpid()
+        return db
+
+    def get(self, key):
+        row = self._connect().execute(
+            "SELECT value FROM results WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key, value, ttl):
+        db = self._connect()
+        db.execute(
+            "INSERT OR REPLACE INTO results (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, json.dumps(value), time.time() + ttl)
+        )
+        db.commit()
+
+    def delete(self, key):
+        db = self._connect()
+        db.execute("DELETE FROM results WHERE key = ?", (key,))
+        db.commit()
+
+    def purge_expired(self):
+        db = self._connect()
+        db.execute("DELETE FROM results WHERE expires_at <= ?", (time.time(),))
+        db.commit()
+
+
+class FileSystemResultStore:
+    """One JSON file per key under a directory; writes are atomic renames"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha256(key.encode('utf-8')).hexdigest() + '.json')
+
+    def get(self, key):
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if record['expires_at'] <= time.time():
+            self.delete(key)
+            return None
+        return record['value']
+
+    def set(self, key, value, ttl):
+        record = {'expires_at': time.time() + ttl, 'value': value}
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(record, f)
+            os.replace(tmp_path, self._path(key))
+        except Exception:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def purge_expired(self):
+        now = time.time()
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    expired = json.load(f)['expires_at'] <= now
+            except (OSError, ValueError, KeyError):
+                expired = True
+            if expired:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+def create_result_store(store_type, base_dir):
+    """Build the backend named by SESSION_TYPE ('filesystem', 'sqlite' or 'memory')"""
+    if store_type == 'memory':
+        return MemoryResultStore()
+    if store_type == 'sqlite':
+        return SQLiteResultStore(os.path.join(base_dir, 'results.sqlite3'))
+    if store_type == 'filesystem':
+        return FileSystemResultStore(os.path.join(base_dir, 'results'))
+    raise ValueError(f"Unknown SESSION_TYPE: {store_type}")
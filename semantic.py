@@ -0,0 +1,144 @@
+"""Offline lexical-semantic similarity: hashed TF-IDF vectors and batch cosine
+
+Text is reduced to word unigrams and bigrams hashed into a fixed number of
+buckets, so there is no vocabulary to fit or store and nothing to
+download. Terms are weighted by sublinear term frequency times an IDF
+fitted on the pool being ranked, and queries are compared with every pool
+document by cosine similarity, all over NumPy arrays.
+"""
+import re
+import zlib
+
+import numpy as np
+
+N_FEATURES = 2 ** 18
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that the this to was we were will with "
+    "you your".split()
+)
+
+
+def hash_terms(text, n_features=N_FEATURES):
+    """(bucket indexes, counts) for the unigrams and bigrams of text, indexes sorted.
+
+    Only distinct tokens are hashed (CRC-32, stable across processes);
+    bigram hashes are mixed from their two unigram hashes in NumPy.
+    """
+    ids = {}
+    positions = [ids.setdefault(token, len(ids)) for token in TOKEN_RE.findall(text.lower()) if token not in STOP_WORDS]
+    if not positions:
+        return np.zeros(0, dtype=np.uint32), np.zeros(0, dtype=np.uint32)
+    token_hashes = np.fromiter((zlib.crc32(token.encode('utf-8')) for token in ids), dtype=np.uint64, count=len(ids))
+    unigrams = token_hashes[np.asarray(positions)]
+    bigrams = (unigrams[:-1] * np.uint64(0x9E3779B1) + unigrams[1:] * np.uint64(0x85EBCA77)) >> np.uint64(7)
+    indexes, counts = np.unique(np.concatenate([unigrams, bigrams]) % np.uint64(n_features), return_counts=True)
+    return indexes.astype(np.uint32), counts.astype(np.uint32)
+
+
+def pack_terms(terms):
+    """Compact bytes for one document's hash_terms (for SQLite storage)"""
+    indexes, counts = terms
+    return indexes.astype('<u4').tobytes() + np.minimum(counts, 0xFFFF).astype('<u2').tobytes()
+
+
+def unpack_terms(blob):
+    size = len(blob) // 6
+    return (np.frombuffer(blob, dtype='<u4', count=size).astype(np.uint32),
+            np.frombuffer(blob, dtype='<u2', count=size, offset=size * 4).astype(np.uint32))
+
+
+class TermMatrix:
+    """Hashed term counts of many documents, one CSR row per document"""
+
+    def __init__(self, terms, n_features=N_FEATURES):
+        terms = list(terms)
+        self.n_features = n_features
+        self.indptr = np.zeros(len(terms) + 1, dtype=np.int64)
+        self.indptr[1:] = np.cumsum([len(indexes) for indexes, _ in terms])
+        if terms:
+            self.indexes = np.concatenate([indexes for indexes, _ in terms]).astype(np.int64)
+            self.counts = np.concatenate([counts for _, counts in terms]).astype(np.float64)
+        else:
+            self.indexes = np.zeros(0, dtype=np.int64)
+            self.counts = np.zeros(0)
+
+    @classmethod
+    def from_texts(cls, texts, n_features=N_FEATURES):
+        return cls((hash_terms(text, n_features) for text in texts), n_features)
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    def row_ids(self):
+        """Document number of every stored term"""
+        return np.repeat(np.arange(len(self)), np.diff(self.indptr))
+
+    def document_frequencies(self):
+        return np.bincount(self.indexes, minlength=self.n_features)
+
+    def weights(self, idf):
+        """L2-normalized sublinear tf-idf weight of every stored term"""
+        values = (1 + np.log(self.counts)) * idf[self.indexes]
+        row_ids = self.row_ids()
+        norms = np.sqrt(np.bincount(row_ids, weights=values * values, minlength=len(self)))
+        return values / norms[row_ids] if values.size else values
+
+
+class SemanticPool:
+    """TF-IDF vectors of a document pool, laid out for fast scoring.
+
+    IDF is fitted on the pool. Term weights are kept as posting lists
+    grouped by hash bucket, so scoring a query reads only the postings of
+    the buckets it contains, not the whole pool. Build one per pool and
+    reuse it across queries.
+    """
+
+    def __init__(self, matrix):
+        self.size = len(matrix)
+        self.n_features = matrix.n_features
+        self.idf = np.log((1 + self.size) / (1 + matrix.document_frequencies())) + 1
+        weights = matrix.weights(self.idf)
+        order = np.argsort(matrix.indexes, kind='stable')
+        self._rows = matrix.row_ids()[order]
+        self._weights = weights[order]
+        self._starts = np.searchsorted(matrix.indexes[order], np.arange(self.n_features + 1))
+
+    def __len__(self):
+        return self.size
+
+    def scores(self, queries):
+        """(len(queries), len(pool)) cosine similarity in [0, 1] for a TermMatrix of queries"""
+        query_weights = queries.weights(self.idf)
+        out = np.zeros((len(queries), self.size))
+        for i in range(len(queries)):
+            start, end = queries.indptr[i], queries.indptr[i + 1]
+            terms = queries.indexes[start:end]
+            lengths = self._starts[terms + 1] - self._starts[terms]
+            present = lengths > 0
+            if not present.any():
+                continue
+            lengths = lengths[present]
+            # Positions of every posting of the query's buckets, concatenated
+            offsets = np.repeat(self._starts[terms[present]] - (np.cumsum(lengths) - lengths), lengths)
+            positions = np.arange(lengths.sum()) + offsets
+            contributions = self._weights[positions] * np.repeat(query_weights[start:end][present], lengths)
+            out[i] = np.bincount(self._rows[positions], weights=contributions, minlength=self.size)
+        return np.clip(out, 0.0, 1.0)
+
+
+def pair_similarity(idf, document, query):
+    """Cosine similarity (0-100, one decimal) of two hash_terms() results
+    weighted by an IDF fitted elsewhere, e.g. SemanticPool.idf of a large
+    pool: a pool of just the two documents has no meaningful IDF"""
+    matrix = TermMatrix([document, query], len(idf))
+    weights = matrix.weights(idf)
+    split = matrix.indptr[1]
+    _, ours, theirs = np.intersect1d(matrix.indexes[:split], matrix.indexes[split:], assume_unique=True,
+                                     return_indices=True)
+    return round(float(np.clip(weights[:split][ours] @ weights[split:][theirs], 0.0, 1.0)) * 100, 1)
+
+
+def similarity_scores(pool, queries):
+    """pool.scores(queries) as 0-100 scores with one decimal, the scale of ats_score"""
+    return np.round(pool.scores(queries) * 100, 1)
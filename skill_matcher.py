@@ -0,0 +1,185 @@
+"""Single-pass multi-pattern skill matcher (Aho-Corasick automaton)"""
+from collections import deque
+
+
+def _is_word_char(ch):
+    return ch.isalnum()
+
+
+def _lower_preserving_offsets(text):
+    """Lowercase text without changing its length, so offsets stay valid"""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # A few characters (e.g. 'İ') expand when lowercased; keep one char each
+    return ''.join(ch.lower()[0] for ch in text)
+
+
+def _outermost(spans):
+    """Sorted spans minus those inside another one (an alias within its
+    canonical name, e.g. "Kafka" in "Apache Kafka", is one mention)"""
+    kept = []
+    reach = -1
+    for start, end in sorted(spans, key=lambda span: (span[0], -span[1])):
+        if end > reach:
+            kept.append((start, end))
+            reach = end
+    return kept
+
+
+class SkillMatcher:
+    """Compiled matcher that finds every taxonomy skill in one linear scan.
+
+    The automaton is built once from a {category: [skills]} taxonomy. Matching
+    is case-insensitive and word-boundary aware: a skill that starts or ends
+    with a letter/digit only matches when it is not glued to another
+    letter/digit, so "Go" does not match inside "good" and "Java" does not
+    match inside "JavaScript".
+
+    aliases maps a canonical skill name to alternative spellings
+    ({"Kubernetes": ["K8s"]}); an alias match reports the canonical skill.
+    scan() counts a spelling found inside a longer spelling of the same
+    skill ("Kafka" in "Apache Kafka") once.
+    """
+
+    def __init__(self, skills_db, aliases=None):
+        self.skills_db = skills_db
+        self.categories = list(skills_db.keys())
+        aliases = aliases or {}
+
+        # Pattern table: lowercase pattern -> [(category, skill), ...]
+        self._patterns = []
+        self._owners = []
+        # Per-category (pattern_ids, skill) pairs in taxonomy order
+        self._category_index = {}
+        index = {}
+        for category, skills_list in skills_db.items():
+            self._category_index[category] = []
+            for skill in skills_list:
+                pattern_ids = []
+                for spelling in [skill] + list(aliases.get(skill, ())):
+                    key = spelling.lower().strip()
+                    if not key:
+                        continue
+                    if key not in index:
+                        index[key] = len(self._patterns)
+                        self._patterns.append(key)
+                        self._owners.append([])
+                    if (category, skill) not in self._owners[index[key]]:
+                        self._owners[index[key]].append((category, skill))
+                    pattern_ids.append(index[key])
+                if pattern_ids:
+                    self._category_index[category].append((tuple(pattern_ids), skill))
+
+        self._build()
+
+    # ------------------------------------------------------------------
+    # Compilation
+    # ------------------------------------------------------------------
+
+    def _build(self):
+        """Build the goto/fail/output tables and flatten them into a DFA"""
+        goto = [{}]
+        output = [[]]
+
+        for pattern_id, pattern in enumerate(self._patterns):
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    output.append([])
+                state = nxt
+            output[state].append(pattern_id)
+
+        fail = [0] * len(goto)
+        # delta[state] is the complete transition map over the pattern
+        # alphabet; characters outside the alphabet always lead back to root.
+        delta = [None] * len(goto)
+        delta[0] = dict(goto[0])
+
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            delta[state] = dict(delta[fail[state]])
+            for ch, child in goto[state].items():
+                fail[child] = delta[fail[state]].get(ch, 0) if state else 0
+                output[child] = output[child] + output[fail[child]]
+                delta[state][ch] = child
+                queue.append(child)
+
+        self._delta = delta
+        self._output = [tuple(out) for out in output]
+        self._lengths = [len(p) for p in self._patterns]
+        self._checks_start = [_is_word_char(p[0]) for p in self._patterns]
+        self._checks_end = [_is_word_char(p[-1]) for p in self._patterns]
+        self.state_count = len(goto)
+
+    # ------------------------------------------------------------------
+    # Matching
+    # ------------------------------------------------------------------
+
+    def iter_matches(self, text):
+        """Yield (pattern_id, start, end) for every boundary-valid match"""
+        lowered = _lower_preserving_offsets(text)
+        size = len(lowered)
+        delta = self._delta
+        output = self._output
+        lengths = self._lengths
+        checks_start = self._checks_start
+        checks_end = self._checks_end
+
+        state = 0
+        for i, ch in enumerate(lowered):
+            state = delta[state].get(ch, 0)
+            if not output[state]:
+                continue
+            end = i + 1
+            for pattern_id in output[state]:
+                start = end - lengths[pattern_id]
+                if checks_start[pattern_id] and start > 0 and lowered[start - 1].isalnum():
+                    continue
+                if checks_end[pattern_id] and end < size and lowered[end].isalnum():
+                    continue
+                yield pattern_id, start, end
+
+    def find_matches(self, text):
+        """Return every skill occurrence with its category and position"""
+        matches = []
+        for pattern_id, start, end in self.iter_matches(text):
+            for category, skill in self._owners[pattern_id]:
+                matches.append({'skill': skill, 'category': category, 'start': start, 'end': end})
+        return matches
+
+    def scan(self, text):
+        """Return found skills by category plus per-skill counts and positions"""
+        positions = {}
+        for pattern_id, start, end in self.iter_matches(text):
+            positions.setdefault(pattern_id, []).append((start, end))
+
+        found_skills = {}
+        counts = {}
+        skill_positions = {}
+        # Walk the taxonomy so each category keeps its original skill order
+        for category, entries in self._category_index.items():
+            found_skills[category] = []
+            for pattern_ids, skill in entries:
+                hits = [positions[p] for p in pattern_ids if p in positions]
+                if not hits:
+                    continue
+                found_skills[category].append(skill)
+                spans = hits[0] if len(hits) == 1 else _outermost(span for spans in hits for span in spans)
+                counts[skill] = len(spans)
+                skill_positions[skill] = spans
+
+        return {
+            'skills': found_skills,
+            'counts': counts,
+            'positions': skill_positions
+        }
+
+    def extract(self, text):
+        """Return {category: [skills]} in the same shape as the taxonomy"""
+        return self.scan(text)['skills']
@@ -0,0 +1,52 @@
+"""Worker startup cost: deferred heavy imports and the gunicorn preload warm-up
+
+app.py imports langchain and pdfplumber only when a prompt is first built
+or a PDF first parsed, and the Groq client is created on the first LLM
+call, so a worker that is forked or restarted is ready sooner. With
+PRELOAD_APP (see gunicorn.conf.py) the master instead imports the app and
+these modules once, compiles the taxonomy, and freezes the result so
+forked workers share it copy-on-write.
+"""
+import gc
+import importlib
+
+# What a request eventually needs that app.py no longer imports up front
+HEAVY_MODULES = (
+    'pdfplumber',
+    'langchain_core.messages',
+    'langchain_core.prompts',
+    'langchain_groq',
+)
+
+
+class LazyPrompt:
+    """A ChatPromptTemplate built on first format_messages(), so importing
+    the module that defines it does not import langchain"""
+
+    def __init__(self, messages):
+        self.messages = messages
+        self._template = None
+
+    def format_messages(self, **values):
+        if self._template is None:
+            from langchain_core.prompts import ChatPromptTemplate
+            self._template = ChatPromptTemplate.from_messages(self.messages)
+        return self._template.format_messages(**values)
+
+
+def preload(modules=HEAVY_MODULES):
+    """Import modules now (in the gunicorn master) rather than on first use in each worker"""
+    for name in modules:
+        importlib.import_module(name)
+
+
+def freeze_shared_state():
+    """Move every object allocated so far out of the collector's reach.
+
+    Called in the master right before workers fork: a collection in a
+    worker would otherwise write to the GC headers of inherited objects
+    (taxonomy, matcher tables, imported modules) and copy their pages.
+    """
+    gc.collect()
+    gc.freeze()
+    return gc.get_freeze_count()
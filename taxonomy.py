@@ -0,0 +1,184 @@
+"""Versioned, precompiled skill taxonomy that reloads when skills.json changes"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from types import MappingProxyType
+
+from ranking import SkillVocabulary
+from skill_matcher import SkillMatcher
+
+
+def normalize_skill(name):
+    """Lookup key for a skill or alias: lowercase, single-spaced"""
+    return re.sub(r'\s+', ' ', name).strip().lower()
+
+
+class CompiledTaxonomy:
+    """Immutable lookup structures built once per taxonomy version.
+
+    skills is a read-only {category: (skill, ...)} mapping in file order.
+    Each category has an id (its position) and each (category, skill) pair
+    a skill id (its SkillVocabulary column). lookup() resolves a skill name
+    or alias to its canonical (category, skill) pairs; matcher extracts
+    skills, aliases included, from free text.
+    """
+
+    def __init__(self, taxonomy, aliases=None, version=None):
+        aliases = aliases or {}
+        self.skills = MappingProxyType({
+            category: tuple(dict.fromkeys(skills_list)) for category, skills_list in taxonomy.items()
+        })
+        self.categories = tuple(self.skills.keys())
+        self.category_ids = MappingProxyType({category: i for i, category in enumerate(self.categories)})
+
+        canonical = {}
+        for category, skills_list in self.skills.items():
+            for skill in skills_list:
+                canonical.setdefault(normalize_skill(skill), []).append((category, skill))
+
+        lookup = {key: tuple(owners) for key, owners in canonical.items()}
+        for skill, spellings in aliases.items():
+            if normalize_skill(skill) not in canonical:
+                raise ValueError(f"Alias target {skill!r} is not in the taxonomy")
+            owners = lookup[normalize_skill(skill)]
+            for alias in spellings:
+                key = normalize_skill(alias)
+                if key in canonical:
+                    raise ValueError(f"Alias {alias!r} for {skill!r} is already a skill name")
+                if lookup.get(key, owners) != owners:
+                    raise ValueError(f"Alias {alias!r} is claimed by more than one skill")
+                lookup[key] = owners
+        self.lookup_table = MappingProxyType(lookup)
+        self.aliases = MappingProxyType({skill: tuple(spellings) for skill, spellings in aliases.items()})
+
+        self.vocabulary = SkillVocabulary(self.skills)
+        self.skill_ids = self.vocabulary.index
+        self.matcher = SkillMatcher(self.skills, aliases=self.aliases)
+        self.version = version or self.fingerprint(taxonomy, aliases)
+        self.skill_count = self.vocabulary.size
+        self.alias_count = sum(len(spellings) for spellings in self.aliases.values())
+
+    @staticmethod
+    def fingerprint(taxonomy, aliases):
+        raw = json.dumps([taxonomy, aliases], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:12]
+
+    def lookup(self, name):
+        """Canonical (category, skill) pairs for a skill name or alias"""
+        return self.lookup_table.get(normalize_skill(name), ())
+
+    def extract(self, text):
+        """{category: [skills]} found in text, canonical names only"""
+        return self.matcher.extract(text)
+
+    @classmethod
+    def from_files(cls, taxonomy_path, aliases_path=None):
+        with open(taxonomy_path, 'rb') as f:
+            taxonomy_bytes = f.read()
+        alias_bytes = b''
+        if aliases_path and os.path.exists(aliases_path):
+            with open(aliases_path, 'rb') as f:
+                alias_bytes = f.read()
+        digest = hashlib.sha256(taxonomy_bytes + b'\0' + alias_bytes).hexdigest()[:12]
+        return cls(json.loads(taxonomy_bytes), json.loads(alias_bytes) if alias_bytes else {}, version=digest)
+
+
+class TaxonomyStore:
+    """Holds the current CompiledTaxonomy and swaps in a new one when the
+    taxonomy or alias file changes.
+
+    current() stats the files at most once per check_interval seconds. A
+    changed file is compiled off to the side and published with a single
+    reference assignment, so readers see either the old or the new version,
+    never a mix. A file that fails to compile is reported and ignored. Each
+    process (e.g. every gunicorn worker) reloads on its own; no restart is
+    needed. on_reload callbacks receive (new, old) after the swap.
+    """
+
+    def __init__(self, taxonomy_path, aliases_path=None, check_interval=5.0):
+        self.taxonomy_path = taxonomy_path
+        self.aliases_path = aliases_path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._listeners = []
+        self._signature = self._stat()
+        self._compiled = CompiledTaxonomy.from_files(taxonomy_path, aliases_path)
+        self._next_check = time.monotonic() + check_interval
+        self.loaded_at = time.time()
+        self.reloads = 0
+        self.last_error = None
+
+    def _stat(self):
+        signature = []
+        for path in (self.taxonomy_path, self.aliases_path):
+            try:
+                st = os.stat(path) if path else None
+                signature.append((st.st_mtime_ns, st.st_size) if st else None)
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def on_reload(self, callback):
+        self._listeners.append(callback)
+        return callback
+
+    def current(self):
+        """The live CompiledTaxonomy (reloaded first if the files changed)"""
+        if self.check_interval > 0 and time.monotonic() >= self._next_check:
+            self.reload_if_changed()
+        return self._compiled
+
+    @property
+    def version(self):
+        return self.current().version
+
+    def reload_if_changed(self, force=False):
+        """Recompile if the files changed; returns True if a new version went live"""
+        with self._lock:
+            self._next_check = time.monotonic() + self.check_interval
+            signature = self._stat()
+            if signature == self._signature and not force:
+                return False
+            self._signature = signature
+            try:
+                compiled = CompiledTaxonomy.from_files(self.taxonomy_path, self.aliases_path)
+            except (OSError, ValueError) as e:
+                self.last_error = str(e)
+                print(f"Taxonomy reload failed, keeping version {self._compiled.version}: {e}")
+                return False
+            self.last_error = None
+            if compiled.version == self._compiled.version:
+                return False
+            previous, self._compiled = self._compiled, compiled
+            self.loaded_at = time.time()
+            self.reloads += 1
+
+        print(f"Taxonomy reloaded: {previous.version} -> {compiled.version}")
+        for callback in self._listeners:
+            try:
+                callback(compiled, previous)
+            except Exception as e:
+                print(f"Taxonomy reload hook error: {e}")
+        return True
+
+    def after_fork(self):
+        """In a forked child that only reads the taxonomy: a fresh lock, in
+        case another thread held this one at the fork, and no on_reload
+        callbacks, which act on state the parent process owns"""
+        self._lock = threading.Lock()
+        self._listeners = []
+
+    def stats(self):
+        compiled = self._compiled
+        return {
+            'version': compiled.version,
+            'categories': len(compiled.categories),
+            'skills': compiled.skill_count,
+            'aliases': compiled.alias_count,
+            'loaded_at': self.loaded_at,
+            'reloads': self.reloads,
+            'last_error': self.last_error
+        }
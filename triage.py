@@ -0,0 +1,31 @@
+"""Decide which batch candidates are worth a full LLM evaluation"""
+from ranking import top_k_rows
+
+FULL = 'full'
+SHORT = 'short'
+TEMPLATE = 'template'
+
+
+def assign_tiers(scores, min_score, top_n, mode):
+    """One analysis tier per candidate, from their deterministic ATS scores.
+
+    Candidates scoring at least min_score, or ranked in the batch's top_n,
+    get the full analysis. Everyone else gets `mode`: 'short' (a much
+    smaller prompt) or 'template' (no LLM call). mode 'off' sends every
+    candidate to the full analysis.
+    """
+    if mode not in (SHORT, TEMPLATE):
+        return [FULL] * len(scores)
+    leaders = set(top_k_rows(scores, top_n)) if top_n > 0 else set()
+    return [
+        FULL if score >= min_score or i in leaders else mode
+        for i, score in enumerate(scores)
+    ]
+
+
+def summarize_tiers(tiers):
+    """Counts per tier plus the LLM calls avoided by templating"""
+    counts = {tier: tiers.count(tier) for tier in (FULL, SHORT, TEMPLATE)}
+    counts['llm_calls'] = counts[FULL] + counts[SHORT]
+    counts['llm_calls_saved'] = counts[TEMPLATE]
+    return counts
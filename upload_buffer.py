@@ -0,0 +1,56 @@
+"""Hold uploaded files in memory instead of round-tripping through UPLOAD_FOLDER"""
+import os
+import shutil
+import tempfile
+
+from werkzeug.utils import secure_filename
+
+
+class UploadBuffer:
+    """One uploaded file's bytes, ready to hand to the parsers.
+
+    Uploads up to memory_limit bytes are kept as an in-memory bytes object
+    (picklable, so it can go straight to the parse process pool). Larger
+    uploads are spilled once to a private temp file and passed by path.
+    Call close() to drop any spilled file.
+    """
+
+    __slots__ = ('filename', 'data', 'path')
+
+    def __init__(self, filename, data=None, path=None):
+        self.filename = filename
+        self.data = data
+        self.path = path
+
+    @classmethod
+    def from_upload(cls, file, memory_limit):
+        """Read a werkzeug FileStorage without writing it to UPLOAD_FOLDER"""
+        filename = secure_filename(file.filename or '')
+        stream = file.stream
+        head = stream.read(memory_limit + 1)
+        if len(head) <= memory_limit:
+            return cls(filename, data=head)
+
+        fd, path = tempfile.mkstemp(prefix='resumeiq-', suffix=os.path.splitext(filename)[1])
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                out.write(head)
+                shutil.copyfileobj(stream, out)
+        except Exception:
+            os.remove(path)
+            raise
+        return cls(filename, path=path)
+
+    @property
+    def source(self):
+        """What parse_resume accepts: the bytes, or the spill file path"""
+        return self.data if self.data is not None else self.path
+
+    def close(self):
+        if self.path:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            self.path = None
+        self.data = None
\ No newline at end of file